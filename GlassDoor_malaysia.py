@@ -19,6 +19,10 @@ import sys
 import re
 import urllib.parse
 
+from job_sink import JsonlJobSink, load_jobs
+from job_key import job_key
+from phase_timer import PhaseTimer, DRIVER_START, NAVIGATION, WAIT_SCROLL, POPUPS, EXTRACTION, EXPORT
+
 # Configure logging
 import logging
 import sys
@@ -45,16 +49,70 @@ logger.addHandler(file_handler)
 logger.addHandler(console_handler)
 
 class GlassdoorScraper:
-    def __init__(self, chromedriver_path):
+    JOB_CARD_SELECTOR = 'li.JobsList_jobListItem__wjTHv[data-test="jobListing"]'
+    JOB_TITLE_SELECTOR = 'a.JobCard_jobTitle__GLyJ1[data-test="job-title"]'
+    
+    # Counts fetch/XHR requests still in flight. Resource timing entries only
+    # appear once a request completes, so a slow load-more request would
+    # otherwise look like an idle network.
+    REQUEST_TRACKER_SCRIPT = """
+        if (!window.__pendingRequests) {
+            window.__pendingRequests = {count: 0};
+            var pending = window.__pendingRequests;
+            if (window.fetch) {
+                var originalFetch = window.fetch;
+                window.fetch = function() {
+                    pending.count++;
+                    var done = function() { pending.count--; };
+                    var request = originalFetch.apply(this, arguments);
+                    request.then(done, done);
+                    return request;
+                };
+            }
+            var originalSend = XMLHttpRequest.prototype.send;
+            XMLHttpRequest.prototype.send = function() {
+                pending.count++;
+                this.addEventListener('loadend', function() { pending.count--; }, {once: true});
+                return originalSend.apply(this, arguments);
+            };
+        }
+    """
+    
+    def __init__(self, chromedriver_path=None, load_timeout=5, network_idle_time=0.5, browser_pool=None,
+                 lean_profile=None, sink=None, known_job_keys=None, stop_after_known=10, page_archive=None,
+                 timer=None, profiler=None):
         """
         Initialize Glassdoor Scraper
         
-        :param chromedriver_path: Path to ChromeDriver executable
+        :param chromedriver_path: Path to ChromeDriver executable, not needed with a browser pool
+        :param load_timeout: Upper bound in seconds for waiting on new jobs after a scroll or click
+        :param network_idle_time: Seconds without new network activity that count as the page being idle
+        :param browser_pool: Optional BrowserPool to lease warm browsers from
+        :param lean_profile: Optional LeanProfile for headless mode, request blocking and page byte reporting
+        :param sink: Optional JsonlJobSink; each batch of new cards is written to it instead of being kept in memory
+        :param known_job_keys: Optional set of job keys from previous runs, e.g. JobStore.known_keys();
+                               enables incremental mode
+        :param stop_after_known: In incremental mode, stop loading more jobs for a search after this many
+                                 consecutive known postings
+        :param page_archive: Optional PageArchive that stores each search's fully loaded results page
+                             for offline replay
+        :param timer: Optional PhaseTimer recording how long each crawl phase takes
+        :param profiler: Optional WebDriverProfiler that counts and times every WebDriver command
         """
         self.driver = None
+        self.browser_pool = browser_pool
+        self.lean_profile = lean_profile
+        self.sink = sink
+        self.page_archive = page_archive
+        self.timer = timer or PhaseTimer(enabled=False)
+        self.profiler = profiler
+        self.load_timeout = load_timeout
+        self.network_idle_time = network_idle_time
+        self.known_job_keys = known_job_keys
+        self.stop_after_known = stop_after_known
         try:
             # Validate ChromeDriver path
-            if not os.path.exists(chromedriver_path):
+            if not browser_pool and not (chromedriver_path and os.path.exists(chromedriver_path)):
                 raise FileNotFoundError(f"ChromeDriver not found at {chromedriver_path}")
             
             # Job titles to search
@@ -67,23 +125,43 @@ class GlassdoorScraper:
                 'product design manager'
             ]
             
-            # Setup Chrome options
-            chrome_options = uc.ChromeOptions()
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--disable-extensions")
-            
-            # Set ChromeDriver service
-            service = Service(chromedriver_path)
+            driver_start_time = time.perf_counter()
+            if browser_pool:
+                # Lease a warm browser instead of starting a new one
+                self.driver = browser_pool.acquire()
+            else:
+                # Setup Chrome options
+                chrome_options = uc.ChromeOptions()
+                chrome_options.add_argument("--no-sandbox")
+                chrome_options.add_argument("--disable-dev-shm-usage")
+                chrome_options.add_argument("--disable-gpu")
+                chrome_options.add_argument("--disable-extensions")
+                if lean_profile:
+                    lean_profile.apply_options(chrome_options)
+                
+                # Set ChromeDriver service
+                service = Service(chromedriver_path)
+                
+                # Initialize the driver
+                logger.info("Initializing ChromeDriver for Glassdoor...")
+                self.driver = uc.Chrome(
+                    service=service, 
+                    options=chrome_options,
+                    version_main=131
+                )
             
-            # Initialize the driver
-            logger.info("Initializing ChromeDriver for Glassdoor...")
-            self.driver = uc.Chrome(
-                service=service, 
-                options=chrome_options,
-                version_main=131
-            )
+            if lean_profile:
+                lean_profile.apply(self.driver)
+            if profiler:
+                profiler.attach(self.driver)
+            try:
+                # Install the request tracker before the page's own scripts run
+                self.driver.execute_cdp_cmd(
+                    'Page.addScriptToEvaluateOnNewDocument', {'source': self.REQUEST_TRACKER_SCRIPT}
+                )
+            except Exception as e:
+                logger.debug(f"Request tracker will be installed after page load: {e}")
+            self.timer.add(DRIVER_START, 'glassdoor', time.perf_counter() - driver_start_time)
             logger.info("ChromeDriver initialized successfully")
             
             # Prepare output directory
@@ -93,12 +171,24 @@ class GlassdoorScraper:
         except Exception as e:
             logger.error(f"Glassdoor Scraper Initialization Error: {e}")
             logger.error(traceback.format_exc())
+            self.close()
+            raise
+
+    def close(self):
+        """
+        Release the browser to the pool, or quit it when not pooled
+        """
+        try:
             if self.driver:
-                try:
+                if self.profiler:
+                    self.profiler.detach(self.driver)
+                if self.browser_pool:
+                    self.browser_pool.release(self.driver)
+                else:
                     self.driver.quit()
-                except Exception:
-                    pass
-            raise
+                self.driver = None
+        except Exception as e:
+            logger.error(f"Error closing driver: {e}")
 
     def manual_verification(self, job_title):
         """
@@ -190,6 +280,90 @@ class GlassdoorScraper:
             logger.error(f"Error sorting jobs: {e}")
             return False
 
+    def count_job_cards(self):
+        """
+        Count the job cards currently in the job list
+        
+        :return: Number of job cards
+        """
+        return self.driver.execute_script(
+            "return document.querySelectorAll(arguments[0]).length;", self.JOB_CARD_SELECTOR
+        )
+
+    def track_requests(self):
+        """
+        Start counting in-flight requests on the current page if not already counted
+        """
+        try:
+            self.driver.execute_script(self.REQUEST_TRACKER_SCRIPT)
+        except Exception as e:
+            logger.debug(f"Could not install request tracker: {e}")
+
+    def wait_for_jobs_loaded(self, previous_count, timeout=None):
+        """
+        Wait until the job list's child count changes or the network goes idle
+        
+        The network is treated as idle once the page has finished loading, no
+        fetch/XHR request is in flight and no new resource requests have
+        completed for network_idle_time seconds.
+        
+        :param previous_count: Job card count before the scroll or click
+        :param timeout: Optional upper bound in seconds, defaults to load_timeout
+        :return: Job card count when the wait ended
+        """
+        timeout = self.load_timeout if timeout is None else timeout
+        idle_state = {'resources': None, 'since': time.time()}
+        status_script = self.REQUEST_TRACKER_SCRIPT + """
+            if (!window.__jobLoadBufferResized) {
+                performance.setResourceTimingBufferSize(10000);
+                window.__jobLoadBufferResized = true;
+            }
+            return {
+                count: document.querySelectorAll(arguments[0]).length,
+                resources: performance.getEntriesByType('resource').length,
+                pending: window.__pendingRequests.count,
+                ready: document.readyState
+            };
+        """
+        
+        def jobs_loaded(driver):
+            status = driver.execute_script(status_script, self.JOB_CARD_SELECTOR)
+            
+            if status['count'] != previous_count:
+                return status
+            
+            now = time.time()
+            if (status['resources'] != idle_state['resources'] or status['pending'] > 0
+                    or status['ready'] != 'complete'):
+                idle_state['resources'] = status['resources']
+                idle_state['since'] = now
+                return False
+            
+            if now - idle_state['since'] >= self.network_idle_time:
+                return status
+            return False
+        
+        try:
+            status = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(jobs_loaded)
+            return status['count']
+        except TimeoutException:
+            return self.count_job_cards()
+
+    def click_show_more_jobs(self):
+        """
+        Click the last "Show more" button in the job list if there is one
+        
+        :return: Boolean indicating if a button was clicked
+        """
+        return self.driver.execute_script("""
+            var loadMoreButtons = document.querySelectorAll('button[data-test="load-more"]');
+            if (loadMoreButtons.length > 0) {
+                loadMoreButtons[loadMoreButtons.length - 1].click();
+                return true;
+            }
+            return false;
+        """)
+
     def scroll_and_load_jobs(self, max_attempts=10):
         """
         Advanced scrolling and job loading mechanism
@@ -197,13 +371,14 @@ class GlassdoorScraper:
         :param max_attempts: Maximum number of attempts to load more jobs
         :return: Number of new jobs loaded
         """
-        initial_job_count = len(self.driver.find_elements(By.CSS_SELECTOR, 'li.JobsList_jobListItem__wjTHv[data-test="jobListing"]'))
+        self.track_requests()
+        initial_job_count = self.count_job_cards()
         
         for attempt in range(max_attempts):
             try:
                 # Scroll to bottom
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+                current_job_count = self.wait_for_jobs_loaded(initial_job_count)
                 
                 # Try to click "Show more" button if exists
                 try:
@@ -211,24 +386,18 @@ class GlassdoorScraper:
                         EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-test="load-more"]'))
                     )
                     load_more_button.click()
-                    time.sleep(2)
+                    current_job_count = self.wait_for_jobs_loaded(current_job_count)
                 except Exception:
                     pass
                 
                 # Try JavaScript click if regular click fails
                 try:
-                    self.driver.execute_script("""
-                        var loadMoreButtons = document.querySelectorAll('button[data-test="load-more"]');
-                        if (loadMoreButtons.length > 0) {
-                            loadMoreButtons[loadMoreButtons.length - 1].click();
-                        }
-                    """)
-                    time.sleep(2)
+                    if self.click_show_more_jobs():
+                        current_job_count = self.wait_for_jobs_loaded(current_job_count)
                 except Exception:
                     pass
                 
                 # Check if new jobs were loaded
-                current_job_count = len(self.driver.find_elements(By.CSS_SELECTOR, 'li.JobsList_jobListItem__wjTHv[data-test="jobListing"]'))
                 
                 if current_job_count > initial_job_count:
                     logger.info(f"Loaded more jobs: {current_job_count - initial_job_count} new jobs")
@@ -289,8 +458,13 @@ class GlassdoorScraper:
                             except Exception as js_err:
                                 logger.warning(f"Could not close popup with selector {selector}: {js_err}")
                         
-                        # Short wait after closing
-                        time.sleep(1)
+                        # Wait for the popup to go away instead of a fixed pause
+                        try:
+                            WebDriverWait(self.driver, self.load_timeout, poll_frequency=0.1).until(
+                                EC.invisibility_of_element(button)
+                            )
+                        except TimeoutException:
+                            logger.debug(f"Popup still visible after closing with selector: {selector}")
                     
                     except Exception as button_err:
                         logger.warning(f"Error processing close button: {button_err}")
@@ -335,7 +509,8 @@ class GlassdoorScraper:
         :param max_attempts: Maximum number of scroll attempts
         :return: Number of new jobs loaded
         """
-        initial_job_count = len(self.driver.find_elements(By.CSS_SELECTOR, 'li.JobsList_jobListItem__wjTHv[data-test="jobListing"]'))
+        self.track_requests()
+        initial_job_count = self.count_job_cards()
         
         # Different scrolling strategies
         scroll_strategies = [
@@ -354,16 +529,18 @@ class GlassdoorScraper:
         
         new_jobs_loaded = 0
         for attempt in range(max_attempts):
+            current_job_count = initial_job_count
+            
             # Try each scrolling strategy
             for strategy in scroll_strategies:
                 try:
                     strategy()
-                    time.sleep(2)  # Wait for potential dynamic loading
+                    # Return as soon as new jobs arrive or the network goes idle
+                    current_job_count = self.wait_for_jobs_loaded(current_job_count)
                 except Exception as e:
                     logger.debug(f"Scroll strategy failed: {e}")
             
             # Check for new jobs
-            current_job_count = len(self.driver.find_elements(By.CSS_SELECTOR, 'li.JobsList_jobListItem__wjTHv[data-test="jobListing"]'))
             
             if current_job_count > initial_job_count:
                 new_jobs_loaded = current_job_count - initial_job_count
@@ -374,18 +551,86 @@ class GlassdoorScraper:
                 try:
                     show_more_button = self.driver.find_element(By.CSS_SELECTOR, 'button[data-test="load-more"]')
                     show_more_button.click()
-                    time.sleep(2)
+                    self.wait_for_jobs_loaded(current_job_count)
                 except Exception:
                     # No more jobs to load
                     break
         
         return new_jobs_loaded
 
+    def get_new_job_cards(self, cursor):
+        """
+        Fetch only the job cards added after the given card index
+        
+        :param cursor: Number of job cards already processed for this search
+        :return: Tuple of (new job card elements, total job cards on the page)
+        """
+        result = self.driver.execute_script("""
+            var cards = document.querySelectorAll(arguments[0]);
+            return {total: cards.length, cards: Array.prototype.slice.call(cards, arguments[1])};
+        """, self.JOB_CARD_SELECTOR, cursor)
+        
+        return result['cards'], result['total']
+
+    def extract_job_card(self, card, search_keyword, title_elem=None, job_url=None):
+        """
+        Extract the details of one rendered job card
+        
+        :param card: Job card element
+        :param search_keyword: Job title being searched
+        :param title_elem: Optional title link already located by the caller
+        :param job_url: Optional URL already read from the title link
+        :return: Job dictionary
+        """
+        if title_elem is None:
+            title_elem = card.find_element(By.CSS_SELECTOR, self.JOB_TITLE_SELECTOR)
+        if job_url is None:
+            job_url = title_elem.get_attribute('href')
+        job_title_text = title_elem.text.strip()
+        
+        # Extract company name
+        try:
+            company_name = card.find_element(By.CSS_SELECTOR, 'span.EmployerProfile_compactEmployerName__9MGcV').text.strip()
+        except Exception:
+            company_name = "N/A"
+        
+        # Always set location to Malaysia
+        location = "Malaysia"
+        
+        # Check for Easy Apply
+        try:
+            easy_apply_element = card.find_element(By.CSS_SELECTOR, '.JobCard_easyApplyTag__5vlo5')
+            easy_apply = 'Yes'
+        except:
+            easy_apply = 'No'
+        
+        # Create job dictionary
+        job_info = {
+            'Platform': 'Glassdoor',
+            'Job Title': job_title_text,
+            'Company': company_name,
+            'Location': location,
+            'url': job_url,
+            'Search Keyword': search_keyword,
+            'source': 'Glassdoor',
+            'Easy Apply': easy_apply,
+            'Salary': 'N/A'
+        }
+        
+        # Add salary extraction if available
+        try:
+            salary = self.extract_salary(card)
+            job_info['Salary'] = salary
+        except Exception as salary_err:
+            logger.warning(f"Could not extract salary: {salary_err}")
+        
+        return job_info
+
     def scrape_jobs(self):
         """
         Scrape job listings from Glassdoor for multiple job titles in Malaysia
         
-        :return: List of job dictionaries with title, URL, and other details
+        :return: List of job dictionaries with title, URL, and other details (empty when streaming to a sink)
         """
         # Comprehensive URLs for Malaysia job searches
         job_search_urls = {
@@ -410,36 +655,41 @@ class GlassdoorScraper:
         }
 
         all_jobs = []
+        jobs_scraped = 0
         job_summary = {}  # To track job counts per search
-        unique_job_urls = set()
+        unique_job_keys = set()
 
         for job_title, urls in job_search_urls.items():
             for search_url in urls:
                 try:
                     # Navigate to search URL
-                    self.driver.get(search_url)
+                    with self.timer.span(NAVIGATION, 'glassdoor', job_title):
+                        self.driver.get(search_url)
                     
                     # Close any popups first
-                    popup_attempts = 0
-                    while True:
-                        popups_closed = self.close_popups()
-                        if popups_closed == 0:
-                            break
-                        popup_attempts += 1
-                        if popup_attempts > 5:
-                            # If automatic closing fails multiple times, ask for manual intervention
-                            if not self.manual_popup_handler(job_title):
-                                logger.warning(f"Skipping {job_title} due to persistent popup")
+                    with self.timer.span(POPUPS, 'glassdoor', job_title):
+                        popup_attempts = 0
+                        while True:
+                            popups_closed = self.close_popups()
+                            if popups_closed == 0:
                                 break
+                            popup_attempts += 1
+                            if popup_attempts > 5:
+                                # If automatic closing fails multiple times, ask for manual intervention
+                                if not self.manual_popup_handler(job_title):
+                                    logger.warning(f"Skipping {job_title} due to persistent popup")
+                                    break
                     
                     # Sort jobs by most recent first
-                    if not self.sort_jobs('recent'):
-                        logger.warning(f"Could not sort jobs by most recent for {job_title}")
+                    with self.timer.span(NAVIGATION, 'glassdoor', job_title):
+                        if not self.sort_jobs('recent'):
+                            logger.warning(f"Could not sort jobs by most recent for {job_title}")
                     
                     # Wait for job listings to load
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, 'li.JobsList_jobListItem__wjTHv[data-test="jobListing"]'))
-                    )
+                    with self.timer.span(WAIT_SCROLL, 'glassdoor', job_title):
+                        WebDriverWait(self.driver, 10).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, 'li.JobsList_jobListItem__wjTHv[data-test="jobListing"]'))
+                        )
                     
                     # Try to extract total job count
                     try:
@@ -454,91 +704,110 @@ class GlassdoorScraper:
                     max_scroll_attempts = 50  # Increased from 20
                     current_scroll_attempt = 0
                     
+                    # Index of the first job card not yet processed for this search
+                    card_cursor = 0
+                    
+                    # Incremental mode: results are sorted by most recent, so a run of
+                    # postings seen in earlier runs means the rest are known as well
+                    consecutive_known = 0
+                    reached_known_jobs = False
+                    
                     while current_scroll_attempt < max_scroll_attempts:
+                        # Each load-more batch counts as one page
+                        batch = current_scroll_attempt + 1
+                        
                         # Enhanced scrolling method
-                        loaded_jobs = self.scroll_and_load_comprehensive(max_attempts=3)
+                        with self.timer.span(WAIT_SCROLL, 'glassdoor', job_title, batch):
+                            loaded_jobs = self.scroll_and_load_comprehensive(max_attempts=3)
                         
-                        # Find all job cards after scrolling
-                        job_cards = self.driver.find_elements(By.CSS_SELECTOR, 'li.JobsList_jobListItem__wjTHv[data-test="jobListing"]')
+                        # The card loop below is timed as one extraction span
+                        extraction_start_time = time.perf_counter()
+                        
+                        # Find only the job cards loaded since the last pass
+                        job_cards, total_cards = self.get_new_job_cards(card_cursor)
+                        
+                        # The list was re-rendered with fewer cards, so start over;
+                        # already collected jobs are still skipped by URL below
+                        if total_cards < card_cursor:
+                            logger.info("Job list was re-rendered, rescanning all cards")
+                            card_cursor = 0
+                            job_cards, total_cards = self.get_new_job_cards(card_cursor)
+                        
+                        card_cursor = total_cards
                         
                         # Track scraped jobs in this iteration
                         scraped_jobs_this_iteration = 0
+                        page_jobs = []
                         
                         for card in job_cards:
                             try:
-                                # Extract job title
-                                title_elem = card.find_element(By.CSS_SELECTOR, 'a.JobCard_jobTitle__GLyJ1[data-test="job-title"]')
-                                job_title_text = title_elem.text.strip()
-                                
-                                # Extract job URL
+                                # Locate the title link first; its URL decides whether the card is new
+                                title_elem = card.find_element(By.CSS_SELECTOR, self.JOB_TITLE_SELECTOR)
                                 job_url = title_elem.get_attribute('href')
                                 
-                                # Skip duplicate jobs
-                                if job_url in unique_job_urls:
+                                # Skip duplicate jobs, compared by listing id rather than the session-specific URL
+                                key = job_key(job_url, 'glassdoor')
+                                if key in unique_job_keys:
                                     continue
-                                unique_job_urls.add(job_url)
-                                
-                                # Extract company name
-                                try:
-                                    company_name = card.find_element(By.CSS_SELECTOR, 'span.EmployerProfile_compactEmployerName__9MGcV').text.strip()
-                                except Exception:
-                                    company_name = "N/A"
+                                unique_job_keys.add(key)
                                 
-                                # Always set location to Malaysia
-                                location = "Malaysia"
+                                if self.known_job_keys is not None:
+                                    if key in self.known_job_keys:
+                                        consecutive_known += 1
+                                        if consecutive_known >= self.stop_after_known:
+                                            reached_known_jobs = True
+                                    else:
+                                        consecutive_known = 0
                                 
-                                # Check for Easy Apply
-                                try:
-                                    easy_apply_element = card.find_element(By.CSS_SELECTOR, '.JobCard_easyApplyTag__5vlo5')
-                                    easy_apply = 'Yes'
-                                except:
-                                    easy_apply = 'No'
-                                
-                                # Create job dictionary
-                                job_info = {
-                                    'Platform': 'Glassdoor',
-                                    'Job Title': job_title_text,
-                                    'Company': company_name,
-                                    'Location': location,
-                                    'url': job_url,
-                                    'Search Keyword': job_title,
-                                    'source': 'Glassdoor',
-                                    'Easy Apply': easy_apply,
-                                    'Salary': 'N/A'
-                                }
-                                
-                                # Add salary extraction if available
-                                try:
-                                    salary = self.extract_salary(card)
-                                    job_info['Salary'] = salary
-                                except Exception as salary_err:
-                                    logger.warning(f"Could not extract salary: {salary_err}")
-                                
-                                all_jobs.append(job_info)
+                                job_info = self.extract_job_card(card, job_title, title_elem, job_url)
+                                page_jobs.append(job_info)
                                 scraped_jobs_this_iteration += 1
                             
                             except Exception as card_err:
                                 logger.warning(f"Error processing job card: {card_err}")
                         
+                        self.timer.add(EXTRACTION, 'glassdoor', time.perf_counter() - extraction_start_time,
+                                       job_title, batch)
+                        
+                        # Stream the batch out, or keep it in memory when there is no sink
+                        if self.sink:
+                            self.sink.write_page(page_jobs)
+                        else:
+                            all_jobs.extend(page_jobs)
+                        jobs_scraped += len(page_jobs)
+                        
                         # Update scraping progress
-                        logger.info(f"Scraped {len(all_jobs)} total jobs, {scraped_jobs_this_iteration} in this iteration")
+                        logger.info(f"Scraped {jobs_scraped} total jobs, {scraped_jobs_this_iteration} in this iteration")
                         
                         # Break if no new jobs were loaded
                         if scraped_jobs_this_iteration == 0 and loaded_jobs == 0:
                             break
                         
+                        if reached_known_jobs:
+                            logger.info(f"Reached {self.stop_after_known} consecutive known jobs for '{job_title}', "
+                                        f"stopping after {current_scroll_attempt + 1} batches")
+                            break
+                        
                         current_scroll_attempt += 1
                     
-                    # Verify job count
-                    self.verify_job_count(total_job_count, len(all_jobs))
+                    if self.lean_profile:
+                        self.lean_profile.record_page_bytes(self.driver, 'Glassdoor', job_title)
+                    
+                    # Cards are loaded into one list, so the final page holds every batch
+                    if self.page_archive:
+                        self.page_archive.record_page(self.driver, 'glassdoor', job_title)
+                    
+                    # Verify job count; an incremental stop scrapes fewer on purpose
+                    if not reached_known_jobs:
+                        self.verify_job_count(total_job_count, jobs_scraped)
                     
                     # Store job summary
                     job_summary[job_title] = {
                         'Total Jobs Found': total_job_count,
-                        'Jobs Scraped': len(all_jobs)
+                        'Jobs Scraped': jobs_scraped
                     }
                     
-                    logger.info(f"Scraped {len(all_jobs)} jobs for '{job_title}' in Malaysia")
+                    logger.info(f"Scraped {jobs_scraped} jobs for '{job_title}' in Malaysia")
                 
                 except Exception as e:
                     logger.error(f"Error scraping jobs for '{job_title}' in Malaysia: {e}")
@@ -551,8 +820,9 @@ class GlassdoorScraper:
         for title, summary in job_summary.items():
             logger.info(f"{title}: {summary['Jobs Scraped']} of {summary['Total Jobs Found']} jobs scraped")
         
-        # Export jobs to Excel
-        self.export_to_excel(all_jobs)
+        # Export jobs to Excel; with a sink the export is built from its file afterwards
+        if not self.sink:
+            self.export_to_excel(all_jobs)
         
         return all_jobs
 
@@ -571,14 +841,12 @@ class GlassdoorScraper:
                     if salary_element:
                         salary_text = salary_element.text.strip()
                         
-                        # Clean and standardize salary text
-                        salary_text = salary_text.replace('(Employer est.)', '').strip()
+                        # Drop the estimate label but keep the whole range, e.g. 'MYR 5K - 8K';
+                        # salary_normalizer parses it into numeric columns later
+                        salary_text = re.sub(r'\((?:Employer|Glassdoor) est\.\)', '', salary_text).strip()
                         
-                        # Extract numeric value
-                        salary_match = re.search(r'(MYR)?\s*(\d+(?:K)?)', salary_text)
-                        if salary_match:
-                            salary = salary_match.group(2)
-                            return f"{salary_match.group(1) or 'MYR'} {salary}"
+                        if salary_text[:1].isdigit():
+                            salary_text = f"MYR {salary_text}"
                         
                         return salary_text
                 except Exception as e:
@@ -678,7 +946,7 @@ class GlassdoorScraper:
         try:
             if self.driver:
                 logger.info("Attempting to close Glassdoor Browser...")
-                self.driver.quit()
+                self.close()
                 logger.info("Glassdoor Browser closed successfully")
         except Exception as e:
             logger.error(f"Error closing browser: {e}")
@@ -689,11 +957,24 @@ def main():
     CHROMEDRIVER_PATH = r'C:\Users\numan\Downloads\chromedriver-win64\chromedriver-win64\chromedriver.exe'
     
     scraper = None
+    sink = None
+    # Time each crawl phase for the run metrics
+    timer = PhaseTimer()
     try:
+        # Stream jobs to disk as each batch is extracted
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        sink = JsonlJobSink(os.path.join('glassdoor_output', f'glassdoor_jobs_{timestamp}.jsonl.gz'))
+        
         # Initialize and run Glassdoor scraper
-        scraper = GlassdoorScraper(CHROMEDRIVER_PATH)
-        jobs = scraper.scrape_jobs()
-        scraper.save_results(jobs)
+        scraper = GlassdoorScraper(CHROMEDRIVER_PATH, sink=sink, timer=timer)
+        scraper.scrape_jobs()
+        sink.close()
+        
+        # Build the Excel exports from the streamed file
+        jobs = load_jobs(sink.path)
+        with timer.span(EXPORT, 'glassdoor'):
+            scraper.export_to_excel(jobs)
+            scraper.save_results(jobs)
     
     except Exception as e:
         logger.error(f"Glassdoor Scraping Error: {e}")
@@ -702,11 +983,11 @@ def main():
     
     finally:
         # Ensure driver is closed even if an exception occurs
-        if scraper and scraper.driver:
-            try:
-                scraper.driver.quit()
-            except Exception:
-                pass
+        if scraper:
+            scraper.close()
+        if sink:
+            sink.close()
+        timer.write(name='glassdoor')
 
 if __name__ == "__main__":
     main()
@@ -5,6 +5,8 @@ import traceback
 import json
 import random
 import urllib.parse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.keys import Keys
 
 import undetected_chromedriver as uc
@@ -15,15 +17,65 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
 from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+
+from job_sink import JsonlJobSink, read_jobs
+from excel_export import export_jobs_excel
+from phase_timer import PhaseTimer, DRIVER_START, NAVIGATION, WAIT_SCROLL, EXTRACTION, EXPORT
 
 class JobStreetScraper:
-    def __init__(self, chromedriver_path):
+    JOB_CARD_SELECTOR = 'div.snwpn00[data-search-sol-meta]'
+    
+    # Reads every job card on the page in a single execute_script call.
+    # Cards missing a required field are returned with ok=false so the
+    # caller can retry them through the per-element path.
+    EXTRACT_CARDS_SCRIPT = """
+        var cards = document.querySelectorAll(arguments[0]);
+        var results = [];
+        function text(card, selector) {
+            var elem = card.querySelector(selector);
+            return elem ? elem.innerText.trim() : null;
+        }
+        for (var i = 0; i < cards.length; i++) {
+            var card = cards[i];
+            try {
+                var titleElem = card.querySelector('a[data-automation="jobTitle"]');
+                var meta = null;
+                try {
+                    meta = JSON.parse(card.getAttribute('data-search-sol-meta'));
+                } catch (metaError) {
+                    meta = null;
+                }
+                var job = {
+                    index: i,
+                    title: titleElem ? titleElem.innerText.trim() : null,
+                    url: titleElem ? titleElem.href : null,
+                    location: text(card, 'a[data-automation="jobLocation"]'),
+                    salary: text(card, 'span[data-automation="jobSalary"]'),
+                    posted_date: text(card, 'span[data-automation="jobListingDate"]'),
+                    meta: meta
+                };
+                job.ok = job.title !== null && job.location !== null && job.posted_date !== null;
+                results.push(job);
+            } catch (cardError) {
+                results.push({index: i, ok: false});
+            }
+        }
+        return JSON.stringify(results);
+    """
+    
+    def __init__(self, chromedriver_path=None, use_script_extraction=True, browser_pool=None, lean_profile=None,
+                 sink=None, page_archive=None, timer=None, profiler=None):
         """
         Initialize JobStreet Scraper
         
-        :param chromedriver_path: Path to ChromeDriver executable
+        :param chromedriver_path: Path to ChromeDriver executable, not needed with a browser pool
+        :param use_script_extraction: Extract each page with one in-page script instead of per-element calls
+        :param browser_pool: Optional BrowserPool to lease warm browsers from
+        :param lean_profile: Optional LeanProfile for headless mode, request blocking and page byte reporting
+        :param sink: Optional JsonlJobSink; each page is written to it instead of being kept in memory
+        :param page_archive: Optional PageArchive that stores every results page for offline replay
+        :param timer: Optional PhaseTimer recording how long each crawl phase takes
+        :param profiler: Optional WebDriverProfiler that counts and times every WebDriver command
         """
         # Configure logging
         logging.basicConfig(
@@ -36,25 +88,23 @@ class JobStreetScraper:
         )
         
         try:
+            self.browser_pool = browser_pool
+            self.lean_profile = lean_profile
+            self.sink = sink
+            self.page_archive = page_archive
+            self.timer = timer or PhaseTimer(enabled=False)
+            self.profiler = profiler
+            
             # Validate ChromeDriver path
-            if not os.path.exists(chromedriver_path):
+            if not browser_pool and not (chromedriver_path and os.path.exists(chromedriver_path)):
                 raise FileNotFoundError(f"ChromeDriver not found at {chromedriver_path}")
             
-            # Set up Chrome options
-            chrome_options = uc.ChromeOptions()
-            chrome_options.add_argument('--start-maximized')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--no-sandbox')
+            self.chromedriver_path = chromedriver_path
             
             # Initialize WebDriver
-            self.driver = uc.Chrome(
-                driver_executable_path=chromedriver_path, 
-                options=chrome_options
-            )
+            self.driver = self.create_driver()
             
-            # Implicit wait
-            self.driver.implicitly_wait(10)
+            self.use_script_extraction = use_script_extraction
             
             # Job titles and their corresponding URLs
             self.job_searches = [
@@ -76,6 +126,55 @@ class JobStreetScraper:
             logging.error(f"Initialization error: {e}")
             raise
 
+    def create_driver(self):
+        """
+        Start a new Chrome instance configured for JobStreet
+        
+        :return: Selenium WebDriver instance
+        """
+        with self.timer.span(DRIVER_START, 'jobstreet'):
+            if self.browser_pool:
+                driver = self.browser_pool.acquire()
+            else:
+                # Set up Chrome options
+                chrome_options = uc.ChromeOptions()
+                if not (self.lean_profile and self.lean_profile.headless):
+                    chrome_options.add_argument('--start-maximized')
+                chrome_options.add_argument('--disable-extensions')
+                chrome_options.add_argument('--disable-gpu')
+                chrome_options.add_argument('--no-sandbox')
+                if self.lean_profile:
+                    self.lean_profile.apply_options(chrome_options)
+                
+                driver = uc.Chrome(
+                    driver_executable_path=self.chromedriver_path, 
+                    options=chrome_options
+                )
+            
+            if self.lean_profile:
+                self.lean_profile.apply(driver)
+            
+            # Implicit wait
+            driver.implicitly_wait(10)
+            
+            if self.profiler:
+                self.profiler.attach(driver)
+        
+        return driver
+
+    def release_driver(self, driver):
+        """
+        Return a driver to the browser pool, or quit it when not pooled
+        
+        :param driver: Selenium WebDriver instance from create_driver
+        """
+        if self.profiler:
+            self.profiler.detach(driver)
+        if self.browser_pool:
+            self.browser_pool.release(driver)
+        else:
+            driver.quit()
+
     def scroll_and_wait(self, driver):
         """
         Quick scroll to load content
@@ -89,6 +188,127 @@ class JobStreetScraper:
         except Exception as e:
             logging.warning(f"Quick scroll error: {e}")
 
+    def extract_job_card(self, card, search_keyword):
+        """
+        Extract a single job card through individual WebDriver calls
+        
+        :param card: WebElement for the job card
+        :param search_keyword: Keyword used for search
+        :return: Job dictionary, or None if the card could not be read
+        """
+        try:
+            # Job Title
+            job_title_elem = card.find_element(By.CSS_SELECTOR, 'a[data-automation="jobTitle"]')
+            job_title = job_title_elem.text.strip()
+            job_url = job_title_elem.get_attribute('href')
+            
+            # Location
+            location_elem = card.find_element(By.CSS_SELECTOR, 'a[data-automation="jobLocation"]')
+            location = location_elem.text.strip()
+            
+            # Salary
+            try:
+                salary_elem = card.find_element(By.CSS_SELECTOR, 'span[data-automation="jobSalary"]')
+                salary = salary_elem.text.strip()
+            except:
+                salary = 'Not specified'
+            
+            # Posted Date
+            posted_date_elem = card.find_element(By.CSS_SELECTOR, 'span[data-automation="jobListingDate"]')
+            posted_date = posted_date_elem.text.strip()
+            
+            # Search metadata payload
+            try:
+                search_meta = json.loads(card.get_attribute('data-search-sol-meta'))
+            except Exception:
+                search_meta = None
+            
+            return {
+                'Platform': 'JobStreet',
+                'Job Title': job_title,
+                'Location': location,
+                'URL': job_url,
+                'Search Keyword': search_keyword,
+                'Salary': salary,
+                'Posted Date': posted_date,
+                'Search Meta': search_meta
+            }
+        
+        except Exception as e:
+            logging.warning(f"Error extracting job: {e}")
+            return None
+
+    def extract_page_jobs_by_element(self, driver, search_keyword):
+        """
+        Extract all job cards on the current page one element at a time
+        
+        :param driver: Selenium WebDriver instance
+        :param search_keyword: Keyword used for search
+        :return: List of job dictionaries, or None if the page has no job cards
+        """
+        job_cards = driver.find_elements(By.CSS_SELECTOR, self.JOB_CARD_SELECTOR)
+        
+        if not job_cards:
+            return None
+        
+        jobs = []
+        for card in job_cards:
+            job = self.extract_job_card(card, search_keyword)
+            if job:
+                jobs.append(job)
+        
+        return jobs
+
+    def extract_page_jobs(self, driver, search_keyword):
+        """
+        Extract all job cards on the current page with a single in-page script
+        
+        Cards the script could not read are retried through extract_job_card.
+        
+        :param driver: Selenium WebDriver instance
+        :param search_keyword: Keyword used for search
+        :return: List of job dictionaries, or None if the page has no job cards
+        """
+        try:
+            raw_cards = json.loads(driver.execute_script(self.EXTRACT_CARDS_SCRIPT, self.JOB_CARD_SELECTOR))
+        except Exception as e:
+            logging.warning(f"Script extraction failed, falling back to per-element extraction: {e}")
+            return self.extract_page_jobs_by_element(driver, search_keyword)
+        
+        if not raw_cards:
+            return None
+        
+        jobs_by_index = {}
+        failed_indexes = []
+        for raw in raw_cards:
+            if not raw.get('ok'):
+                failed_indexes.append(raw['index'])
+                continue
+            
+            jobs_by_index[raw['index']] = {
+                'Platform': 'JobStreet',
+                'Job Title': raw['title'],
+                'Location': raw['location'],
+                'URL': raw['url'],
+                'Search Keyword': search_keyword,
+                'Salary': raw['salary'] or 'Not specified',
+                'Posted Date': raw['posted_date'],
+                'Search Meta': raw['meta']
+            }
+        
+        # Fall back to per-element extraction only for the cards the script missed
+        if failed_indexes:
+            logging.info(f"Falling back to per-element extraction for {len(failed_indexes)} cards")
+            job_cards = driver.find_elements(By.CSS_SELECTOR, self.JOB_CARD_SELECTOR)
+            for index in failed_indexes:
+                if index < len(job_cards):
+                    job = self.extract_job_card(job_cards[index], search_keyword)
+                    if job:
+                        jobs_by_index[index] = job
+        
+        # Keep jobs in page order
+        return [jobs_by_index[index] for index in sorted(jobs_by_index)]
+
     def scrape_jobstreet_jobs_with_pagination(self, driver, search_keyword, max_pages=None):
         """
         Scrape job listings with dynamic pagination support
@@ -96,68 +316,46 @@ class JobStreetScraper:
         :param driver: Selenium WebDriver instance
         :param search_keyword: Keyword used for search
         :param max_pages: Optional maximum number of pages to scrape (None means all pages)
-        :return: List of all job listings
+        :return: List of all job listings (empty when streaming to a sink)
         """
         all_jobs = []
+        jobs_scraped = 0
         current_page = 1
         
         while True:
             try:
-                # Quick page load wait
-                time.sleep(1)
+                with self.timer.span(WAIT_SCROLL, 'jobstreet', search_keyword, current_page):
+                    # Quick page load wait
+                    time.sleep(1)
+                    
+                    # Quick scroll
+                    self.scroll_and_wait(driver)
                 
-                # Quick scroll
-                self.scroll_and_wait(driver)
+                if self.page_archive:
+                    self.page_archive.record_page(driver, 'jobstreet', search_keyword, current_page)
                 
-                # Find job cards directly
-                job_cards = driver.find_elements(By.CSS_SELECTOR, 'div.snwpn00[data-search-sol-meta]')
+                # Extract every card on the page in one browser round trip
+                with self.timer.span(EXTRACTION, 'jobstreet', search_keyword, current_page):
+                    if self.use_script_extraction:
+                        jobs = self.extract_page_jobs(driver, search_keyword)
+                    else:
+                        jobs = self.extract_page_jobs_by_element(driver, search_keyword)
                 
-                if not job_cards:
+                if jobs is None:
                     logging.info("No more job cards found")
                     break
                 
-                # Scrape current page jobs
-                jobs = []
-                for card in job_cards:
-                    try:
-                        # Job Title
-                        job_title_elem = card.find_element(By.CSS_SELECTOR, 'a[data-automation="jobTitle"]')
-                        job_title = job_title_elem.text.strip()
-                        job_url = job_title_elem.get_attribute('href')
-                        
-                        # Location
-                        location_elem = card.find_element(By.CSS_SELECTOR, 'a[data-automation="jobLocation"]')
-                        location = location_elem.text.strip()
-                        
-                        # Salary
-                        try:
-                            salary_elem = card.find_element(By.CSS_SELECTOR, 'span[data-automation="jobSalary"]')
-                            salary = salary_elem.text.strip()
-                        except:
-                            salary = 'Not specified'
-                        
-                        # Posted Date
-                        posted_date_elem = card.find_element(By.CSS_SELECTOR, 'span[data-automation="jobListingDate"]')
-                        posted_date = posted_date_elem.text.strip()
-                        
-                        job_entry = {
-                            'Platform': 'JobStreet',
-                            'Job Title': job_title,
-                            'Location': location,
-                            'URL': job_url,
-                            'Search Keyword': search_keyword,
-                            'Salary': salary,
-                            'Posted Date': posted_date
-                        }
-                        
-                        jobs.append(job_entry)
-                    
-                    except Exception as e:
-                        logging.warning(f"Error extracting job: {e}")
-                
-                all_jobs.extend(jobs)
+                # Stream the page out, or keep it in memory when there is no sink
+                if self.sink:
+                    self.sink.write_page(jobs)
+                else:
+                    all_jobs.extend(jobs)
+                jobs_scraped += len(jobs)
                 logging.info(f"Page {current_page}: Extracted {len(jobs)} jobs")
                 
+                if self.lean_profile:
+                    self.lean_profile.record_page_bytes(driver, 'JobStreet', f"{search_keyword} page {current_page}")
+                
                 # Find next page button
                 try:
                     next_page_button = driver.find_element(By.CSS_SELECTOR, 'a[aria-label="Next"]')
@@ -172,9 +370,11 @@ class JobStreetScraper:
                         logging.info(f"Reached maximum specified pages: {max_pages}")
                         break
                     
-                    next_page_button.click()
+                    with self.timer.span(NAVIGATION, 'jobstreet', search_keyword, current_page + 1):
+                        next_page_button.click()
                     current_page += 1
-                    time.sleep(0.5)  # Minimal wait
+                    with self.timer.span(WAIT_SCROLL, 'jobstreet', search_keyword, current_page):
+                        time.sleep(0.5)  # Minimal wait
                 
                 except:
                     logging.info("No more pages to navigate")
@@ -184,7 +384,7 @@ class JobStreetScraper:
                 logging.error(f"Page {current_page} error: {e}")
                 break
         
-        logging.info(f"Total jobs scraped: {len(all_jobs)} across {current_page} pages")
+        logging.info(f"Total jobs scraped: {jobs_scraped} across {current_page} pages")
         return all_jobs
 
     def scrape_jobs(self):
@@ -199,67 +399,152 @@ class JobStreetScraper:
             
             try:
                 logging.info(f"Scraping: {job_title}")
-                self.driver.get(search_url)
-                time.sleep(1)  # Minimal page load wait
+                with self.timer.span(NAVIGATION, 'jobstreet', job_title, 1):
+                    self.driver.get(search_url)
+                with self.timer.span(WAIT_SCROLL, 'jobstreet', job_title, 1):
+                    time.sleep(1)  # Minimal page load wait
                 
                 # Remove max_pages parameter to scrape all pages
                 jobs = self.scrape_jobstreet_jobs_with_pagination(self.driver, job_title)
                 all_jobs.extend(jobs)
                 
-                logging.info(f"Found {len(jobs)} jobs for {job_title}")
+                if not self.sink:
+                    logging.info(f"Found {len(jobs)} jobs for {job_title}")
             
             except Exception as e:
                 logging.error(f"Scraping error for {job_title}: {e}")
         
         return all_jobs
 
-    def save_results_excel(self, jobs):
+    def scrape_jobs_parallel(self, workers=4):
         """
-        Save job results to Excel with specified columns
+        Scrape job listings for all job titles on a pool of independent browsers
+        
+        Each worker thread owns its own Chrome instance; the first worker takes
+        over self.driver instead of leaving it idle. A failed search only loses
+        its own results, and a worker whose browser failed quits it right away
+        and starts a fresh one for its next search.
+        
+        :param workers: Number of Chrome instances to run at once, capped at the browser pool size
+        :return: List of all job listings, in the order of self.job_searches
         """
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Job Listings"
-        
-        # Simplified headers
-        headers = [
-            'Platform', 'Job Title', 'Location', 
-            'URL', 'Search Keyword', 'Salary', 
-            'Posted Date'
-        ]
-        
-        # Header styling
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
-        
-        # Populate data
-        for row, job in enumerate(jobs, 2):
-            ws.cell(row=row, column=1, value=job.get('Platform', 'N/A'))
-            ws.cell(row=row, column=2, value=job.get('Job Title', 'N/A'))
-            ws.cell(row=row, column=3, value=job.get('Location', 'N/A'))
-            ws.cell(row=row, column=4, value=job.get('URL', 'N/A'))
-            ws.cell(row=row, column=5, value=job.get('Search Keyword', 'N/A'))
-            ws.cell(row=row, column=6, value=job.get('Salary', 'N/A'))
-            ws.cell(row=row, column=7, value=job.get('Posted Date', 'N/A'))
-        
-        # Auto-adjust column widths
-        for col in ws.columns:
-            max_length = 0
-            column = col[0].column_letter
-            for cell in col:
+        if self.browser_pool and workers > self.browser_pool.size:
+            # Extra workers would wait on the pool for a browser that never comes back
+            logging.info(f"Limiting workers to the browser pool size of {self.browser_pool.size}")
+            workers = self.browser_pool.size
+        
+        worker_state = threading.local()
+        # Browsers started here and released at the end; self.driver stays with close()
+        drivers = []
+        spare_drivers = [self.driver] if self.driver else []
+        drivers_lock = threading.Lock()
+        # undetected_chromedriver patches the driver binary on start, so launch one at a time.
+        # A browser pool patches once up front and can start browsers concurrently.
+        driver_start_lock = threading.Lock()
+        
+        def get_worker_driver():
+            if getattr(worker_state, 'driver', None) is not None:
                 try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(cell.value)
-                except:
-                    pass
-            adjusted_width = (max_length + 2)
-            ws.column_dimensions[column].width = adjusted_width
+                    worker_state.driver.execute_script("return 1;")
+                except Exception:
+                    # The browser died during the previous search
+                    discard_worker_driver()
+            if getattr(worker_state, 'driver', None) is None:
+                with drivers_lock:
+                    driver = spare_drivers.pop() if spare_drivers else None
+                if driver is None:
+                    if self.browser_pool:
+                        driver = self.create_driver()
+                    else:
+                        with driver_start_lock:
+                            driver = self.create_driver()
+                    with drivers_lock:
+                        if self.driver is None:
+                            # Replaces a broken self.driver
+                            self.driver = driver
+                        else:
+                            drivers.append(driver)
+                worker_state.driver = driver
+            return worker_state.driver
+        
+        def discard_worker_driver():
+            driver = getattr(worker_state, 'driver', None)
+            worker_state.driver = None
+            if driver is None:
+                return
+            with drivers_lock:
+                if driver is self.driver:
+                    self.driver = None
+                elif driver in drivers:
+                    drivers.remove(driver)
+            try:
+                self.release_driver(driver)
+            except Exception as e:
+                logging.error(f"Error closing broken worker driver: {e}")
         
-        # Save the workbook
+        def scrape_search(job_search):
+            job_title = job_search['title']
+            
+            try:
+                driver = get_worker_driver()
+                logging.info(f"Scraping: {job_title}")
+                with self.timer.span(NAVIGATION, 'jobstreet', job_title, 1):
+                    driver.get(job_search['url'])
+                with self.timer.span(WAIT_SCROLL, 'jobstreet', job_title, 1):
+                    time.sleep(1)  # Minimal page load wait
+                
+                jobs = self.scrape_jobstreet_jobs_with_pagination(driver, job_title)
+                if not self.sink:
+                    logging.info(f"Found {len(jobs)} jobs for {job_title}")
+                return jobs
+            
+            except Exception as e:
+                logging.error(f"Scraping error for {job_title}: {e}")
+                # Do not reuse a browser that may be in a broken state
+                discard_worker_driver()
+                return []
+        
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # map keeps results in search order regardless of completion order
+                results = list(executor.map(scrape_search, self.job_searches))
+        finally:
+            if self.driver is None and drivers:
+                # Keep a working browser on the scraper after a broken self.driver was dropped
+                self.driver = drivers.pop()
+            for driver in drivers:
+                try:
+                    self.release_driver(driver)
+                except Exception as e:
+                    logging.error(f"Error closing worker driver: {e}")
+        
+        all_jobs = []
+        for jobs in results:
+            all_jobs.extend(jobs)
+        
+        return all_jobs
+
+    # Excel headers and the job dictionary keys they are read from
+    EXCEL_COLUMNS = [
+        ('Platform', 'Platform'),
+        ('Job Title', 'Job Title'),
+        ('Location', 'Location'),
+        ('URL', 'URL'),
+        ('Search Keyword', 'Search Keyword'),
+        ('Salary', 'Salary'),
+        ('Posted Date', 'Posted Date')
+    ]
+
+    def save_results_excel(self, jobs):
+        """
+        Save job results to Excel with specified columns
+        
+        :param jobs: Iterable of job dictionaries, e.g. a list or job_sink.read_jobs()
+        :return: Path to the Excel file
+        """
         excel_filename = f'jobstreet_jobs_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-        wb.save(excel_filename)
+        with self.timer.span(EXPORT, 'jobstreet'):
+            export_jobs_excel(jobs, excel_filename, self.EXCEL_COLUMNS, header_fill="DDDDDD", default='N/A')
         logging.info(f"Job results saved to {excel_filename}")
         
         return excel_filename
@@ -270,7 +555,8 @@ class JobStreetScraper:
         """
         try:
             if self.driver:
-                self.driver.quit()
+                self.release_driver(self.driver)
+                self.driver = None
         except Exception as e:
             logging.error(f"Error closing driver: {e}")
 
@@ -279,22 +565,31 @@ def main():
         # Path to ChromeDriver (update this to your actual path)
         chromedriver_path = r"C:\Users\numan\Downloads\chromedriver-win64\chromedriver-win64\chromedriver.exe"
         
+        # Stream jobs to disk as each page is extracted
+        sink = JsonlJobSink(f'jobstreet_jobs_{datetime.now().strftime("%Y%m%d_%H%M%S")}.jsonl.gz')
+        
+        # Time each crawl phase for the run metrics
+        timer = PhaseTimer()
+        
         # Initialize scraper
-        scraper = JobStreetScraper(chromedriver_path)
+        scraper = JobStreetScraper(chromedriver_path, sink=sink, timer=timer)
         
         try:
             # Scrape jobs
-            jobs = scraper.scrape_jobs()
+            scraper.scrape_jobs()
+            sink.close()
             
-            # Save results to Excel
-            if jobs:
-                scraper.save_results_excel(jobs)
+            # Stream the saved jobs straight into the Excel export
+            if sink.jobs_written:
+                scraper.save_results_excel(read_jobs(sink.path))
             else:
                 logging.warning("No jobs found.")
         
         finally:
             # Ensure driver is closed
             scraper.close()
+            sink.close()
+            timer.write(name='jobstreet')
     
     except Exception as e:
         logging.error(f"Scraping failed: {e}")
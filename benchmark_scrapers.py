@@ -0,0 +1,277 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime, timezone
+
+from page_archive import PageArchive, ReplayServer
+from phase_timer import percentile
+from webdriver_profiler import WebDriverProfiler
+
+# Metrics where a higher value is better; the rest are better when lower
+HIGHER_IS_BETTER = ('pages_per_sec', 'cards_per_sec')
+LOWER_IS_BETTER = ('webdriver_calls_per_card', 'p50_page_seconds', 'p95_page_seconds')
+
+class ScraperBenchmark:
+    # Benchmark target -> archived platform whose pages it extracts
+    TARGETS = {
+        'indeed': 'indeed',
+        'indeed_http': 'indeed',
+        'jobstreet': 'jobstreet',
+        'jobstreet_by_element': 'jobstreet',
+        'glassdoor': 'glassdoor',
+        'hiredly': 'hiredly'
+    }
+
+    def __init__(self, archive_dir='page_archive', targets=None, repeat=3, chromedriver_path=None):
+        """
+        Time each scraper's extraction code on archived results pages
+
+        Pages recorded with --archive-dir are served by a ReplayServer to one
+        headless Chrome. Every page is loaded once and its extraction is
+        timed repeat times, so navigation and the scrapers' fixed sleeps are
+        left out and only the extraction hot path is measured.
+
+        :param archive_dir: PageArchive directory holding the saved pages
+        :param targets: Benchmark targets to run, keys of TARGETS (default: all)
+        :param repeat: Timed extraction runs per page
+        :param chromedriver_path: Optional ChromeDriver executable
+        """
+        self.archive = PageArchive(archive_dir)
+        self.targets = targets or list(self.TARGETS)
+        self.repeat = repeat
+        self.chromedriver_path = chromedriver_path
+
+    def extract(self, target, scraper, driver, entry):
+        """
+        Run one target's extraction on the loaded page
+
+        :return: Number of jobs extracted
+        """
+        keyword = entry.get('keyword') or ''
+
+        if target == 'indeed_http':
+            jobs = scraper.parse_results_html(self.archive.read(entry), keyword, entry['url'])
+        elif target == 'indeed':
+            jobs = scraper.extract_job_details(keyword)
+        elif target == 'jobstreet':
+            jobs = scraper.extract_page_jobs(driver, keyword)
+        elif target == 'jobstreet_by_element':
+            jobs = scraper.extract_page_jobs_by_element(driver, keyword)
+        elif target == 'glassdoor':
+            cards, _ = scraper.get_new_job_cards(0)
+            jobs = []
+            for card in cards:
+                try:
+                    jobs.append(scraper.extract_job_card(card, keyword))
+                except Exception as card_err:
+                    logging.warning(f"Error processing job card: {card_err}")
+        else:
+            cards = scraper.find_job_cards()
+            jobs = scraper.extract_job_cards(cards, keyword) if cards else []
+
+        return len(jobs or [])
+
+    def open_scraper(self, target, pool):
+        """
+        Create the scraper of a target on a pooled browser
+
+        :return: Tuple of (scraper, driver, cleanup callable)
+        """
+        if target == 'indeed_http':
+            from indeed_malaysia import IndeedScraper
+            scraper = IndeedScraper(use_http=True)
+            return scraper, None, scraper.close
+        if target == 'indeed':
+            from indeed_malaysia import IndeedScraper
+            scraper = IndeedScraper(browser_pool=pool)
+            return scraper, scraper.driver, scraper.close
+        if target.startswith('jobstreet'):
+            from JobStreet_malaysia import JobStreetScraper
+            scraper = JobStreetScraper(browser_pool=pool)
+            return scraper, scraper.driver, scraper.close
+        if target == 'glassdoor':
+            from GlassDoor_malaysia import GlassdoorScraper
+            scraper = GlassdoorScraper(browser_pool=pool)
+            return scraper, scraper.driver, scraper.close
+        from hiredly_malaysia import HireldyScraper
+        scraper = HireldyScraper(browser_pool=pool)
+        return scraper, scraper.driver, scraper.close
+
+    def run_target(self, target, pool):
+        """
+        Benchmark one target over all archived pages of its platform
+
+        :return: Dictionary of metrics
+        """
+        entries = list(self.archive.entries([self.TARGETS[target]]))
+        if not entries:
+            logging.warning(f"No archived pages for {target}")
+            return None
+
+        scraper, driver, cleanup = self.open_scraper(target, pool)
+        profiler = WebDriverProfiler()
+        page_times = []
+        cards = 0
+        webdriver_calls = 0
+        try:
+            if driver is not None:
+                profiler.attach(driver)
+            for entry in entries:
+                if driver is not None:
+                    driver.get(entry['url'])
+                for _ in range(self.repeat):
+                    # Only extraction commands count, not the page load
+                    calls_before = profiler.calls
+                    start_time = time.perf_counter()
+                    cards += self.extract(target, scraper, driver, entry)
+                    page_times.append(time.perf_counter() - start_time)
+                    webdriver_calls += profiler.calls - calls_before
+        finally:
+            profiler.detach()
+            cleanup()
+
+        total_seconds = sum(page_times)
+        result = {
+            'pages': len(page_times),
+            'cards': cards,
+            'total_seconds': round(total_seconds, 4),
+            'pages_per_sec': round(len(page_times) / total_seconds, 3) if total_seconds else None,
+            'cards_per_sec': round(cards / total_seconds, 3) if total_seconds else None,
+            'webdriver_calls': webdriver_calls,
+            'webdriver_calls_per_card': round(webdriver_calls / cards, 3) if cards else None,
+            'p50_page_seconds': round(percentile(page_times, 0.5), 4),
+            'p95_page_seconds': round(percentile(page_times, 0.95), 4),
+            # Page loads are included here; they are one call per page
+            'top_call_sites': profiler.report(top=5)['call_sites']
+        }
+        logging.info(f"{target}: {result}")
+        return result
+
+    def run(self):
+        """
+        Benchmark every selected target
+
+        :return: Report dictionary with one metrics entry per target
+        """
+        from browser_pool import BrowserPool
+        from lean_profile import LeanProfile
+
+        platforms = sorted({self.TARGETS[target] for target in self.targets})
+        server = ReplayServer(self.archive, platforms=platforms).start()
+        pool = BrowserPool(
+            size=1,
+            chromedriver_path=self.chromedriver_path,
+            options_factory=lambda: server.setup_options(BrowserPool.default_options()),
+            lean_profile=LeanProfile(headless=True, block_trackers=False),
+            driver_setup=server.setup_driver
+        )
+
+        results = {}
+        errors = {}
+        try:
+            for target in self.targets:
+                try:
+                    result = self.run_target(target, pool)
+                except Exception as e:
+                    logging.error(f"Benchmark of {target} failed: {e}")
+                    errors[target] = str(e)
+                    continue
+                if result:
+                    results[target] = result
+                else:
+                    errors[target] = 'no archived pages'
+        finally:
+            pool.close()
+            server.close()
+
+        return {
+            'created_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'archive': self.archive.archive_dir,
+            'repeat': self.repeat,
+            'targets': list(self.targets),
+            'results': results,
+            'errors': errors
+        }
+
+def compare_to_baseline(report, baseline, tolerance=0.15):
+    """
+    List the metrics of a report that are worse than the baseline
+
+    :param report: Report from ScraperBenchmark.run()
+    :param baseline: Earlier report to compare against
+    :param tolerance: Allowed relative slowdown before a metric counts as a regression
+    :return: List of regression descriptions, empty when nothing regressed
+    """
+    regressions = []
+    # Targets left out with --targets are not compared
+    selected = report.get('targets', list(report['results']))
+    for target, base in baseline.get('results', {}).items():
+        if target not in selected:
+            continue
+        current = report['results'].get(target)
+        if current is None:
+            # A target that crashed or found no pages must not pass as 'no regressions'
+            error = report.get('errors', {}).get(target, 'no result')
+            regressions.append(f"{target}: in the baseline but missing from this run ({error})")
+            continue
+
+        # Same archive, same code path: a different card count means extraction broke
+        if base.get('cards') != current.get('cards') and base.get('pages') == current.get('pages'):
+            regressions.append(f"{target}: extracted {current.get('cards')} cards, baseline {base.get('cards')}")
+
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            old, new = base.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > tolerance:
+                regressions.append(f"{target}: {metric} {new} vs baseline {old} ({change:+.0%} worse)")
+
+    return regressions
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
+
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers' extraction code on archived results pages")
+    parser.add_argument('--archive', default='page_archive', help="Archive recorded with run_all_scrapers.py --archive-dir")
+    parser.add_argument('--targets', nargs='+', choices=list(ScraperBenchmark.TARGETS), default=None,
+                        help="Targets to benchmark (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed extraction runs per page")
+    parser.add_argument('--chromedriver', default=None, help="Path to ChromeDriver executable")
+    parser.add_argument('--output-dir', default='benchmark_results', help="Directory for the JSON report")
+    parser.add_argument('--baseline', default='benchmark_baseline.json', help="Baseline report to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="Relative slowdown allowed before a metric counts as a regression")
+    args = parser.parse_args()
+
+    report = ScraperBenchmark(args.archive, args.targets, args.repeat, args.chromedriver).run()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    report_path = os.path.join(args.output_dir, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    logging.info(f"Benchmark report saved to {report_path}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        logging.info(f"Baseline saved to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare_to_baseline(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            logging.error(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        logging.info("No regressions against the baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import os
+import re
+import time
+import shutil
+import hashlib
+import logging
+import threading
+import subprocess
+from contextlib import contextmanager
+
+import undetected_chromedriver as uc
+
+def chrome_major_version():
+    """
+    Major version of the installed Chrome, read from 'chrome --version'
+
+    :return: Version number, or None when Chrome is not found or does not report it (e.g. on Windows)
+    """
+    try:
+        chrome = uc.find_chrome_executable()
+        if not chrome:
+            return None
+        output = subprocess.run([chrome, '--version'], capture_output=True, text=True, timeout=10).stdout
+        match = re.search(r'(\d+)\.\d+', output)
+        return int(match.group(1)) if match else None
+    except Exception as e:
+        logging.warning(f"Could not read the Chrome version: {e}")
+        return None
+
+class BrowserPool:
+    def __init__(self, size=2, chromedriver_path=None, version_main=None,
+                 options_factory=None, cache_dir='chromedriver_cache', lean_profile=None, driver_setup=None):
+        """
+        Pool of warm Chrome instances shared by the scrapers
+
+        The chromedriver binary is patched by undetected_chromedriver once and
+        cached on disk, so later launches (in this run and in later runs) skip
+        the patch step. The cached file is named after a digest of the given
+        binary, or after the Chrome major version it was downloaded for, so a
+        driver or browser upgrade patches a new one. Launched browsers are kept open and handed out again
+        after their state is reset.
+
+        :param size: Maximum number of browsers the pool keeps open
+        :param chromedriver_path: Optional ChromeDriver executable to patch, otherwise one is downloaded
+        :param version_main: Optional Chrome major version to match when downloading ChromeDriver
+        :param options_factory: Optional callable returning fresh uc.ChromeOptions for each launch
+        :param cache_dir: Directory holding the patched ChromeDriver binary
+        :param lean_profile: Optional LeanProfile applied to every browser the pool launches
+        :param driver_setup: Optional callable run on every newly launched driver, e.g. ReplayServer.setup_driver
+        """
+        self.size = size
+        self.chromedriver_path = chromedriver_path
+        self.version_main = version_main
+        self.options_factory = options_factory or self.default_options
+        self.cache_dir = cache_dir
+        self.lean_profile = lean_profile
+        self.driver_setup = driver_setup
+
+        self._patched_path = None
+        self._idle = []
+        self._leased = set()
+        self._condition = threading.Condition()
+        self._patch_lock = threading.Lock()
+
+        # Timing samples in seconds
+        self.cold_start_times = []
+        self.warm_lease_times = []
+
+    @staticmethod
+    def default_options():
+        """
+        Chrome options shared by the scrapers
+        """
+        chrome_options = uc.ChromeOptions()
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-extensions")
+        return chrome_options
+
+    def cache_key(self):
+        """
+        Key of the patched binary in the cache directory
+
+        :return: Digest of the given ChromeDriver, the Chrome major version to download for,
+                 or None when neither is known
+        """
+        if self.chromedriver_path:
+            digest = hashlib.sha256()
+            with open(self.chromedriver_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            return digest.hexdigest()[:16]
+
+        version_main = self.version_main or chrome_major_version()
+        return f'v{version_main}' if version_main else None
+
+    def patched_driver_path(self):
+        """
+        Return the path of the patched ChromeDriver, patching it on first use
+
+        :return: Path to a ChromeDriver binary already patched by undetected_chromedriver
+        """
+        with self._patch_lock:
+            if self._patched_path:
+                return self._patched_path
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            key = self.cache_key()
+            extension = '.exe' if os.name == 'nt' else ''
+            cached_path = os.path.join(self.cache_dir, f'chromedriver_{key or "unversioned"}{extension}')
+
+            # Without a key the cached binary may not match this Chrome, so it is never reused
+            if key is None or not os.path.exists(cached_path):
+                start_time = time.time()
+                # Patch under a temporary name so a concurrent run never picks up a partial file
+                temp_path = os.path.join(self.cache_dir, f'chromedriver_{os.getpid()}.tmp{extension}')
+                if self.chromedriver_path:
+                    # Patch a copy so the original binary stays untouched
+                    shutil.copy2(self.chromedriver_path, temp_path)
+                    uc.Patcher(executable_path=temp_path).auto()
+                else:
+                    version_main = int(key[1:]) if key else 0
+                    patcher = uc.Patcher(version_main=version_main)
+                    patcher.auto()
+                    shutil.copy2(patcher.executable_path, temp_path)
+                os.replace(temp_path, cached_path)
+                logging.info(f"Patched ChromeDriver cached at {cached_path} in {time.time() - start_time:.2f}s")
+
+            self._patched_path = cached_path
+            return self._patched_path
+
+    def start_browser(self):
+        """
+        Cold-start a new Chrome instance
+
+        :return: Selenium WebDriver instance
+        """
+        start_time = time.time()
+        chrome_options = self.options_factory()
+        if self.lean_profile:
+            self.lean_profile.apply_options(chrome_options)
+        
+        driver = uc.Chrome(
+            driver_executable_path=self.patched_driver_path(),
+            options=chrome_options,
+            version_main=self.version_main
+        )
+        if self.lean_profile:
+            self.lean_profile.apply(driver)
+        if self.driver_setup:
+            self.driver_setup(driver)
+        elapsed = time.time() - start_time
+        self.cold_start_times.append(elapsed)
+        logging.info(f"Cold-started browser in {elapsed:.2f}s")
+        return driver
+
+    def warm_up(self, count=None):
+        """
+        Launch browsers ahead of time so the first leases are warm
+
+        :param count: Number of browsers to have idle, defaults to the pool size
+        """
+        count = min(count or self.size, self.size)
+        while True:
+            with self._condition:
+                if len(self._idle) + len(self._leased) >= count:
+                    return
+            driver = self.start_browser()
+            with self._condition:
+                self._idle.append(driver)
+                self._condition.notify()
+
+    def acquire(self, timeout=120):
+        """
+        Lease a browser, reusing a warm one when available
+
+        A caller that already holds every browser of the pool would otherwise
+        wait forever, so the wait is bounded and raises instead.
+
+        :param timeout: Seconds to wait for a browser when the pool is exhausted, None to wait forever
+        :return: Selenium WebDriver instance
+        :raises TimeoutError: If no browser was released within the timeout
+        """
+        start_time = time.time()
+        with self._condition:
+            while True:
+                while self._idle:
+                    driver = self._idle.pop()
+                    if self.is_alive(driver):
+                        self._leased.add(driver)
+                        elapsed = time.time() - start_time
+                        self.warm_lease_times.append(elapsed)
+                        logging.info(f"Leased warm browser in {elapsed:.3f}s")
+                        return driver
+                    self.quit_driver(driver)
+
+                if len(self._leased) < self.size:
+                    # Reserve the slot while the browser starts outside the lock
+                    break
+
+                remaining = None if timeout is None else timeout - (time.time() - start_time)
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No browser available in the pool after {timeout}s")
+                self._condition.wait(remaining)
+
+            placeholder = object()
+            self._leased.add(placeholder)
+
+        try:
+            driver = self.start_browser()
+        except Exception:
+            with self._condition:
+                self._leased.discard(placeholder)
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._leased.discard(placeholder)
+            self._leased.add(driver)
+        return driver
+
+    def release(self, driver):
+        """
+        Reset a leased browser and return it to the pool
+
+        :param driver: Selenium WebDriver instance obtained from acquire
+        """
+        healthy = self.is_alive(driver) and self.reset_driver(driver)
+        with self._condition:
+            self._leased.discard(driver)
+            if healthy:
+                self._idle.append(driver)
+            self._condition.notify()
+
+        if not healthy:
+            logging.warning("Dropping browser that could not be reset")
+            self.quit_driver(driver)
+
+    @contextmanager
+    def lease(self, timeout=120):
+        """
+        Context manager that leases a browser and releases it on exit
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def reset_driver(self, driver):
+        """
+        Clear cookies, storage, extra windows and timeouts left by the previous lease
+
+        :param driver: Selenium WebDriver instance
+        :return: Boolean indicating if the browser is clean and reusable
+        """
+        try:
+            # Close any extra windows and tabs
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                # Pages such as about:blank have no storage
+                pass
+
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            driver.implicitly_wait(0)
+            driver.get('about:blank')
+            return True
+
+        except Exception as e:
+            logging.warning(f"Could not reset browser: {e}")
+            return False
+
+    @staticmethod
+    def is_alive(driver):
+        """
+        Check if the browser still responds
+        """
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def quit_driver(driver):
+        """
+        Quit a browser, logging instead of raising on failure
+        """
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.error(f"Error closing pooled browser: {e}")
+
+    def stats(self):
+        """
+        Summarize cold-start and warm-lease timings
+
+        :return: Dictionary of counts and average seconds
+        """
+        def average(samples):
+            return round(sum(samples) / len(samples), 3) if samples else None
+
+        return {
+            'cold_starts': len(self.cold_start_times),
+            'avg_cold_start_seconds': average(self.cold_start_times),
+            'warm_leases': len(self.warm_lease_times),
+            'avg_warm_lease_seconds': average(self.warm_lease_times)
+        }
+
+    def close(self):
+        """
+        Quit every browser in the pool and log timing statistics
+        """
+        with self._condition:
+            drivers = self._idle + [driver for driver in self._leased if hasattr(driver, 'quit')]
+            self._idle = []
+            self._leased = set()
+
+        for driver in drivers:
+            self.quit_driver(driver)
+
+        logging.info(f"Browser pool stats: {self.stats()}")
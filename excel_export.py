@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import logging
+import tempfile
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+class StreamingExcelExporter:
+    def __init__(self, path, headers, sheet_title="Job Listings", header_fill=None, max_width=None):
+        """
+        Write-only Excel exporter that keeps memory bounded for large exports
+
+        Column widths are tracked while rows are added. openpyxl's write-only
+        mode writes column widths before the first row, so rows are spooled to
+        a temporary file first and replayed into the workbook on close().
+
+        :param path: Output .xlsx file
+        :param headers: Column headers, in order
+        :param sheet_title: Name of the worksheet
+        :param header_fill: Optional hex colour for the header background, e.g. "DDDDDD"
+        :param max_width: Optional upper limit for column widths
+        """
+        self.path = path
+        self.headers = list(headers)
+        self.sheet_title = sheet_title
+        self.header_fill = header_fill
+        self.max_width = max_width
+
+        self.rows_written = 0
+        self.widths = [len(str(header)) for header in self.headers]
+        self.start_time = time.time()
+
+        self._spool = tempfile.TemporaryFile(mode='w+', encoding='utf-8', suffix='.jsonl')
+
+    def write_row(self, values):
+        """
+        Add one row, updating the column widths
+
+        :param values: Cell values in header order
+        """
+        widths = self.widths
+        for i, value in enumerate(values):
+            if value is not None:
+                length = len(str(value))
+                if length > widths[i]:
+                    widths[i] = length
+
+        self._spool.write(json.dumps(values, ensure_ascii=False, default=str) + '\n')
+        self.rows_written += 1
+
+    def write_rows(self, rows):
+        """
+        Add several rows
+
+        :param rows: Iterable of value lists in header order
+        """
+        for values in rows:
+            self.write_row(values)
+
+    def close(self):
+        """
+        Build the workbook from the spooled rows and save it
+
+        :return: Path to the Excel file
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title=self.sheet_title)
+
+        # Widths must be set before the first row is appended
+        for i, width in enumerate(self.widths, 1):
+            width += 2
+            if self.max_width:
+                width = min(width, self.max_width)
+            ws.column_dimensions[get_column_letter(i)].width = width
+
+        header_font = Font(bold=True)
+        fill = None
+        if self.header_fill:
+            fill = PatternFill(start_color=self.header_fill, end_color=self.header_fill, fill_type="solid")
+
+        header_row = []
+        for header in self.headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = header_font
+            if fill:
+                cell.fill = fill
+            header_row.append(cell)
+        ws.append(header_row)
+
+        self._spool.seek(0)
+        for line in self._spool:
+            ws.append(json.loads(line))
+        self._spool.close()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        wb.save(self.path)
+
+        elapsed = time.time() - self.start_time
+        rate = self.rows_written / elapsed if elapsed > 0 else float(self.rows_written)
+        logging.info(f"Wrote {self.rows_written} rows to {self.path} in {elapsed:.1f}s ({rate:.0f} rows/sec)")
+        return self.path
+
+    def discard(self):
+        """
+        Drop the spooled rows without writing a workbook
+        """
+        if not self._spool.closed:
+            self._spool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+def export_jobs_excel(jobs, path, columns, sheet_title="Job Listings", header_fill=None, default=None):
+    """
+    Stream job dictionaries into a write-only Excel file
+
+    :param jobs: Iterable of job dictionaries, e.g. a list or job_sink.read_jobs()
+    :param path: Output .xlsx file
+    :param columns: List of (header, job dictionary key) pairs
+    :param sheet_title: Name of the worksheet
+    :param header_fill: Optional hex colour for the header background
+    :param default: Value written when a job lacks a key
+    :return: Path to the Excel file
+    """
+    keys = [key for _, key in columns]
+    with StreamingExcelExporter(path, [header for header, _ in columns], sheet_title, header_fill) as exporter:
+        for job in jobs:
+            exporter.write_row([job.get(key, default) for key in keys])
+    return path
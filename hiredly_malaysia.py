@@ -11,12 +11,14 @@ import logging
 import os
 import json
 import traceback
-import openpyxl
-from openpyxl.styles import Font, Alignment, Border, Side
 import random
 import requests
 from fake_useragent import UserAgent
 
+from job_sink import JsonlJobSink, read_jobs
+from excel_export import export_jobs_excel
+from phase_timer import PhaseTimer, DRIVER_START, NAVIGATION, WAIT_SCROLL, EXTRACTION, EXPORT
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, 
@@ -27,16 +29,150 @@ logging.basicConfig(
     ]
 )
 
+class SelectorCache:
+    def __init__(self, cache_path):
+        """
+        Remember which CSS selector matched for each field and persist it between runs
+        
+        :param cache_path: Path to the JSON file holding the remembered selectors
+        """
+        self.cache_path = cache_path
+        self.selectors = {}
+        self.dirty = False
+        
+        try:
+            if os.path.exists(cache_path):
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    self.selectors = json.load(f)
+                logging.info(f"Loaded {len(self.selectors)} remembered selectors from {cache_path}")
+        except Exception as e:
+            logging.warning(f"Could not load selector cache {cache_path}: {e}")
+            self.selectors = {}
+
+    def get(self, field, default=None):
+        """
+        Return the remembered selector for a field
+        """
+        return self.selectors.get(field, default)
+
+    def ordered(self, field, selectors):
+        """
+        Return the selectors for a field with the remembered one first
+        
+        :param field: Field name, e.g. 'title' or 'job_card'
+        :param selectors: Candidate selectors in their default order
+        :return: List of selectors
+        """
+        remembered = self.selectors.get(field)
+        if remembered in selectors:
+            return [remembered] + [selector for selector in selectors if selector != remembered]
+        return list(selectors)
+
+    def remember(self, field, selector):
+        """
+        Record the selector that matched for a field
+        """
+        if self.selectors.get(field) != selector:
+            logging.info(f"Learned selector for {field}: {selector}")
+            self.selectors[field] = selector
+            self.dirty = True
+
+    def forget(self, field):
+        """
+        Drop the remembered selector for a field, e.g. after it matched the wrong elements
+        """
+        if self.selectors.pop(field, None) is not None:
+            logging.info(f"Forgot selector for {field}")
+            self.dirty = True
+
+    def save(self):
+        """
+        Write the remembered selectors to disk if they changed
+        """
+        if not self.dirty:
+            return
+        
+        try:
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self.selectors, f, indent=2)
+            self.dirty = False
+            logging.info(f"Selector cache saved to {self.cache_path}")
+        except Exception as e:
+            logging.warning(f"Could not save selector cache {self.cache_path}: {e}")
+
 class HireldyScraper:
-    def __init__(self, chromedriver_path):
+    # Selectors tried, in order, to locate job cards on a results page
+    JOB_CARD_SELECTORS = [
+        "div[data-testid='job-card']",
+        "div.job-card",
+        "div.MuiPaper-root",  # Fallback Material UI selector
+        "div[class*='job-card']",
+        "div[data-job-id]",
+        "div[class*='JobCard']",
+        "div[class*='job-listing']",
+        "div[data-cy='job-card']"
+    ]
+    
+    # Selectors tried, in order, for each field of a job card
+    FIELD_SELECTORS = {
+        'url': ["a[data-testid='job-card-link']", "a.job-card-link", "a[href*='/jobs/']"],
+        'title': ["h3[data-testid='job-card-title']", "h3.job-title"],
+        'company': ["p[data-testid='job-card-company']", "p.company-name"],
+        'location': ["p[data-testid='job-card-location']", "p.job-location"],
+        'salary': ["p[data-testid='job-card-salary']", "p.job-salary"],
+        'job_type': ["p[data-testid='job-card-type']", "p.job-type"],
+        'posted_date': ["p[data-testid='job-card-posted-date']", "p.job-posted-date"]
+    }
+    
+    # Page text that marks a finished page without job cards
+    EMPTY_STATE_PHRASES = [
+        "no jobs found",
+        "no results found",
+        "couldn't find any jobs",
+        "no matching jobs"
+    ]
+    
+    # Page text that marks a bot check or block page
+    BLOCKED_STATE_PHRASES = [
+        "captcha",
+        "verify you are human",
+        "unusual traffic",
+        "access denied"
+    ]
+    
+    def __init__(self, chromedriver_path=None, ready_floor=1.0, ready_ceiling=15.0,
+                 selector_cache_path=None, cached_selector_timeout=2, browser_pool=None, lean_profile=None,
+                 sink=None, page_archive=None, timer=None, profiler=None):
         """
         Initialize Hiredly Scraper
         
-        :param chromedriver_path: Path to ChromeDriver executable
+        :param chromedriver_path: Path to ChromeDriver executable, not needed with a browser pool
+        :param ready_floor: Minimum seconds to stay on a results page before extracting
+        :param ready_ceiling: Maximum seconds to wait for a results page to become ready
+        :param selector_cache_path: Optional path of the selector cache, defaults to the output directory
+        :param cached_selector_timeout: Seconds to wait for a remembered job card selector before re-learning
+        :param browser_pool: Optional BrowserPool to lease warm browsers from
+        :param lean_profile: Optional LeanProfile for headless mode, request blocking and page byte reporting
+        :param sink: Optional JsonlJobSink; each page is written to it instead of being kept in self.jobs
+        :param page_archive: Optional PageArchive that stores every results page for offline replay
+        :param timer: Optional PhaseTimer recording how long each crawl phase takes
+        :param profiler: Optional WebDriverProfiler that counts and times every WebDriver command
         """
+        self.ready_floor = ready_floor
+        self.ready_ceiling = ready_ceiling
+        self.ready_times = []
+        self.cached_selector_timeout = cached_selector_timeout
+        self.implicit_wait = 10
+        self.browser_pool = browser_pool
+        self.lean_profile = lean_profile
+        self.sink = sink
+        self.page_archive = page_archive
+        self.timer = timer or PhaseTimer(enabled=False)
+        self.profiler = profiler
+        
         try:
             # Validate ChromeDriver path
-            if not os.path.exists(chromedriver_path):
+            if not browser_pool and not (chromedriver_path and os.path.exists(chromedriver_path)):
                 raise FileNotFoundError(f"ChromeDriver not found at {chromedriver_path}")
             
             # Job titles and their corresponding URLs
@@ -67,46 +203,61 @@ class HireldyScraper:
                 }
             ]
             
-            # Setup Chrome options with advanced configurations
-            chrome_options = uc.ChromeOptions()
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--allow-running-insecure-content')
-            chrome_options.add_argument('--ignore-certificate-errors')
-            
-            # Use fake user agent
-            ua = UserAgent()
-            user_agent = ua.random
-            chrome_options.add_argument(f'user-agent={user_agent}')
-            
-            # Randomize window size to appear more human-like
-            window_sizes = [
-                (1366, 768),
-                (1920, 1080),
-                (1600, 900),
-                (1440, 900)
-            ]
-            size = random.choice(window_sizes)
-            chrome_options.add_argument(f'--window-size={size[0]},{size[1]}')
+            driver_start_time = time.perf_counter()
+            if browser_pool:
+                # Lease a warm browser instead of starting a new one
+                logging.info("Leasing pooled browser for Hiredly...")
+                self.driver = browser_pool.acquire()
+            else:
+                # Setup Chrome options with advanced configurations
+                chrome_options = uc.ChromeOptions()
+                chrome_options.add_argument("--no-sandbox")
+                chrome_options.add_argument("--disable-dev-shm-usage")
+                chrome_options.add_argument("--disable-gpu")
+                chrome_options.add_argument("--disable-extensions")
+                chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+                chrome_options.add_argument('--disable-web-security')
+                chrome_options.add_argument('--allow-running-insecure-content')
+                chrome_options.add_argument('--ignore-certificate-errors')
+                
+                # Use fake user agent
+                ua = UserAgent()
+                user_agent = ua.random
+                chrome_options.add_argument(f'user-agent={user_agent}')
+                
+                # Randomize window size to appear more human-like
+                window_sizes = [
+                    (1366, 768),
+                    (1920, 1080),
+                    (1600, 900),
+                    (1440, 900)
+                ]
+                size = random.choice(window_sizes)
+                if not (lean_profile and lean_profile.headless):
+                    chrome_options.add_argument(f'--window-size={size[0]},{size[1]}')
+                if lean_profile:
+                    lean_profile.apply_options(chrome_options)
+                
+                # Set ChromeDriver service
+                service = Service(chromedriver_path)
+                
+                # Initialize the driver with advanced undetected mode
+                logging.info("Initializing ChromeDriver for Hiredly...")
+                self.driver = uc.Chrome(
+                    service=service, 
+                    options=chrome_options,
+                    enable_cdp_events=True
+                )
             
-            # Set ChromeDriver service
-            service = Service(chromedriver_path)
-            
-            # Initialize the driver with advanced undetected mode
-            logging.info("Initializing ChromeDriver for Hiredly...")
-            self.driver = uc.Chrome(
-                service=service, 
-                options=chrome_options,
-                enable_cdp_events=True
-            )
+            if lean_profile:
+                lean_profile.apply(self.driver)
             
             # Advanced page load settings
             self.driver.set_page_load_timeout(45)
-            self.driver.implicitly_wait(10)
+            self.driver.implicitly_wait(self.implicit_wait)
+            if profiler:
+                profiler.attach(self.driver)
+            self.timer.add(DRIVER_START, 'hiredly', time.perf_counter() - driver_start_time)
             
             logging.info("ChromeDriver initialized successfully")
             
@@ -114,12 +265,80 @@ class HireldyScraper:
             self.output_dir = 'hiredly_output'
             os.makedirs(self.output_dir, exist_ok=True)
             self.jobs = []
+            
+            # Job card selector that found cards on the current search
+            self.job_card_selector = None
+            
+            # Remembered selectors from previous runs
+            self.selector_cache = SelectorCache(
+                selector_cache_path or os.path.join(self.output_dir, 'selector_cache.json')
+            )
         
         except Exception as e:
             logging.error(f"Hiredly Scraper Initialization Error: {e}")
             logging.error(traceback.format_exc())
             raise
 
+    def wait_for_page_ready(self, floor=None, ceiling=None):
+        """
+        Wait until job cards are rendered or the page settles in an empty or blocked state
+        
+        Cards only count as rendered once an element matching a job card
+        selector contains a job link.
+        
+        :param floor: Minimum seconds to wait, defaults to ready_floor
+        :param ceiling: Maximum seconds to wait, defaults to ready_ceiling
+        :return: Tuple of (state, matching job card selector, seconds until ready) where
+                 state is 'cards', 'empty', 'blocked' or 'timeout'
+        """
+        floor = self.ready_floor if floor is None else floor
+        ceiling = self.ready_ceiling if ceiling is None else ceiling
+        start_time = time.time()
+        
+        def page_ready(driver):
+            status = driver.execute_script("""
+                if (document.readyState !== 'complete') {
+                    return null;
+                }
+                // A generic selector such as div.MuiPaper-root also matches the app
+                // shell, so a selector only counts once a match holds a job link
+                var selectors = arguments[0];
+                for (var i = 0; i < selectors.length; i++) {
+                    var matches = document.querySelectorAll(selectors[i]);
+                    for (var k = 0; k < matches.length; k++) {
+                        if (matches[k].querySelector(arguments[3])) {
+                            return {state: 'cards', selector: selectors[i]};
+                        }
+                    }
+                }
+                var text = document.body ? document.body.innerText.toLowerCase() : '';
+                var phraseSets = {blocked: arguments[1], empty: arguments[2]};
+                for (var state in phraseSets) {
+                    for (var j = 0; j < phraseSets[state].length; j++) {
+                        if (text.indexOf(phraseSets[state][j]) !== -1) {
+                            return {state: state, selector: null};
+                        }
+                    }
+                }
+                return null;
+            """, self.JOB_CARD_SELECTORS, self.BLOCKED_STATE_PHRASES, self.EMPTY_STATE_PHRASES,
+               ', '.join(self.FIELD_SELECTORS['url']))
+            return status or False
+        
+        try:
+            status = WebDriverWait(self.driver, ceiling, poll_frequency=0.25).until(page_ready)
+            state, selector = status['state'], status['selector']
+        except TimeoutException:
+            state, selector = 'timeout', None
+        
+        time_to_ready = time.time() - start_time
+        
+        # Respect the floor even when the page was ready sooner
+        if time_to_ready < floor:
+            time.sleep(floor - time_to_ready)
+        
+        return state, selector, time_to_ready
+
     def scrape_jobs(self):
         for search in self.job_searches:
             try:
@@ -127,28 +346,38 @@ class HireldyScraper:
                 
                 # Advanced navigation with retry mechanism
                 max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        self.driver.get(search['url'])
-                        break
-                    except Exception as nav_e:
-                        if attempt == max_retries - 1:
-                            raise
-                        logging.warning(f"Navigation attempt {attempt + 1} failed: {nav_e}")
-                        time.sleep(random.uniform(2, 5))
-                
-                # Advanced page load wait with multiple techniques
-                time.sleep(random.uniform(7, 12))  # Random wait
+                with self.timer.span(NAVIGATION, 'hiredly', search['title'], 1):
+                    for attempt in range(max_retries):
+                        try:
+                            self.driver.get(search['url'])
+                            break
+                        except Exception as nav_e:
+                            if attempt == max_retries - 1:
+                                raise
+                            logging.warning(f"Navigation attempt {attempt + 1} failed: {nav_e}")
+                            time.sleep(random.uniform(2, 5))
                 
-                # Scroll to simulate human interaction
-                self.driver.execute_script("window.scrollBy(0, window.innerHeight);")
-                time.sleep(random.uniform(1, 3))
-                self.driver.execute_script("window.scrollBy(0, -window.innerHeight);")
+                with self.timer.span(WAIT_SCROLL, 'hiredly', search['title'], 1):
+                    # Wait until cards render or the page settles in an empty/blocked state
+                    ready_state, ready_selector, time_to_ready = self.wait_for_page_ready()
+                    self.ready_times.append({
+                        'search': search['title'],
+                        'state': ready_state,
+                        'seconds': round(time_to_ready, 2)
+                    })
+                    logging.info(f"Page ready for {search['title']}: state={ready_state} after {time_to_ready:.2f}s")
+                    
+                    # Scroll to simulate human interaction
+                    self.driver.execute_script("window.scrollBy(0, window.innerHeight);")
+                    self.driver.execute_script("window.scrollBy(0, -window.innerHeight);")
                 
-                # Take screenshot for debugging
-                screenshot_path = os.path.join(self.output_dir, f"{search['title']}_page.png")
-                self.driver.save_screenshot(screenshot_path)
-                logging.info(f"Screenshot saved to {screenshot_path}")
+                if self.lean_profile:
+                    self.lean_profile.record_page_bytes(self.driver, 'Hiredly', search['title'])
+                else:
+                    # Take screenshot for debugging
+                    screenshot_path = os.path.join(self.output_dir, f"{search['title']}_page.png")
+                    self.driver.save_screenshot(screenshot_path)
+                    logging.info(f"Screenshot saved to {screenshot_path}")
                 
                 # Check if page loaded correctly
                 current_url = self.driver.current_url
@@ -158,37 +387,27 @@ class HireldyScraper:
                 page_source = self.driver.page_source
                 logging.info(f"Page source length: {len(page_source)} characters")
                 
+                if self.page_archive:
+                    self.page_archive.record(page_source, current_url, 'hiredly', search['title'], 1)
+                
                 # Check for potential blocking or captcha
                 if "captcha" in page_source.lower() or "robot" in page_source.lower():
                     logging.error("Potential CAPTCHA or bot detection detected!")
                 
-                # Try multiple selectors with more detailed logging
-                job_card_selectors = [
-                    "div[data-testid='job-card']",
-                    "div.job-card",
-                    "div.MuiPaper-root",  # Fallback Material UI selector
-                    "div[class*='job-card']",
-                    "div[data-job-id]",
-                    "div[class*='JobCard']",
-                    "div[class*='job-listing']",
-                    "div[data-cy='job-card']"
-                ]
-                
-                job_cards = None
-                for selector in job_card_selectors:
-                    try:
-                        # Wait for elements with explicit wait
-                        job_cards = WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                        )
-                        logging.info(f"Selector '{selector}' found {len(job_cards)} elements")
-                        if job_cards:
-                            break
-                    except Exception as sel_e:
-                        logging.warning(f"Selector {selector} failed: {sel_e}")
+                if ready_state == 'cards':
+                    with self.timer.span(EXTRACTION, 'hiredly', search['title'], 1):
+                        job_cards = self.find_job_cards(ready_selector)
+                        jobs = self.extract_job_cards(job_cards, search['title']) if job_cards else []
+                    self.confirm_job_card_selector(jobs)
+                else:
+                    # An empty, blocked or timed out page has no cards for the selectors to wait on
+                    job_cards = []
                 
                 if not job_cards:
-                    logging.error("No job cards found. Saving detailed page source for investigation.")
+                    logging.error(
+                        f"No job cards found (page state: {ready_state}). "
+                        f"Saving detailed page source for investigation."
+                    )
                     page_source_path = os.path.join(self.output_dir, f"{search['title']}_page_source.html")
                     with open(page_source_path, 'w', encoding='utf-8') as f:
                         f.write(page_source)
@@ -204,34 +423,7 @@ class HireldyScraper:
                 
                 logging.info(f"Found {len(job_cards)} job cards")
                 
-                # Extract job details
-                for card in job_cards:
-                    try:
-                        # Try multiple ways to extract job details
-                        job_url = self.extract_job_url(card)
-                        title = self.extract_text(card, ["h3[data-testid='job-card-title']", "h3.job-title"])
-                        company = self.extract_text(card, ["p[data-testid='job-card-company']", "p.company-name"])
-                        location = self.extract_text(card, ["p[data-testid='job-card-location']", "p.job-location"])
-                        salary = self.extract_text(card, ["p[data-testid='job-card-salary']", "p.job-salary"], default="Not specified")
-                        job_type = self.extract_text(card, ["p[data-testid='job-card-type']", "p.job-type"], default="Not specified")
-                        posted_date = self.extract_text(card, ["p[data-testid='job-card-posted-date']", "p.job-posted-date"], default="Not specified")
-                        
-                        job_data = {
-                            'Platform': 'Hiredly',
-                            'Job Title Searched': search['title'],
-                            'Job Title': title,
-                            'Company': company,
-                            'Location': location,
-                            'Salary Range': salary,
-                            'Job Type': job_type,
-                            'Posted Date': posted_date,
-                            'Job URL': job_url
-                        }
-                        
-                        self.jobs.append(job_data)
-                    
-                    except Exception as card_e:
-                        logging.error(f"Error processing job card: {card_e}")
+                self.collect_jobs(jobs)
                 
                 # Pagination handling
                 self.handle_pagination(search['title'])
@@ -240,34 +432,149 @@ class HireldyScraper:
                 logging.error(f"Error during job search for {search['title']}: {search_e}")
                 logging.error(traceback.format_exc())
         
+        # Persist any newly learned selectors for the next run
+        self.selector_cache.save()
+        
+        # Report observed time-to-ready so the floor and ceiling can be tuned
+        for ready in self.ready_times:
+            logging.info(f"Time to ready for {ready['search']}: {ready['seconds']}s ({ready['state']})")
+        
         return self.jobs
 
-    def extract_job_url(self, card):
-        url_selectors = [
-            "a[data-testid='job-card-link']",
-            "a.job-card-link",
-            "a[href*='/jobs/']"
-        ]
+    def collect_jobs(self, jobs):
+        """
+        Stream a page of jobs to the sink, or keep them in self.jobs when there is no sink
         
-        for selector in url_selectors:
+        :param jobs: List of job dictionaries from one page
+        """
+        if self.sink:
+            self.sink.write_page(jobs)
+        else:
+            self.jobs.extend(jobs)
+
+    def find_job_cards(self, ready_selector=None):
+        """
+        Locate job cards, trying the remembered selector first with a short timeout
+        
+        :param ready_selector: Selector the readiness check already saw matching
+        :return: List of job card elements, or None if no selector matched
+        """
+        self.job_card_selector = None
+        job_card_selectors = self.selector_cache.ordered('job_card', self.JOB_CARD_SELECTORS)
+        if ready_selector:
+            job_card_selectors.remove(ready_selector)
+            job_card_selectors.insert(0, ready_selector)
+        
+        for index, selector in enumerate(job_card_selectors):
+            # Only the first candidate is expected to match, so it gets a short timeout
+            timeout = self.cached_selector_timeout if index == 0 else 10
+            try:
+                # Wait for elements with explicit wait
+                job_cards = WebDriverWait(self.driver, timeout).until(
+                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
+                )
+                logging.info(f"Selector '{selector}' found {len(job_cards)} elements")
+                if job_cards:
+                    # Cached by confirm_job_card_selector once the cards yield real jobs
+                    self.job_card_selector = selector
+                    return job_cards
+            except Exception as sel_e:
+                logging.warning(f"Selector {selector} failed: {sel_e}")
+        
+        return None
+
+    def confirm_job_card_selector(self, jobs):
+        """
+        Remember the job card selector once its cards yielded a job with a title and URL
+        
+        A selector whose cards yielded no such job matched the wrong elements,
+        so it is dropped from the cache instead.
+        
+        :param jobs: Jobs extracted from the cards found by find_job_cards
+        """
+        if not self.job_card_selector:
+            return
+        
+        if any(job['Job Title'] != 'Not specified' and str(job['Job URL']).startswith('http') for job in jobs):
+            self.selector_cache.remember('job_card', self.job_card_selector)
+        elif self.selector_cache.get('job_card') == self.job_card_selector:
+            logging.warning(f"Selector '{self.job_card_selector}' matched no real job cards")
+            self.selector_cache.forget('job_card')
+
+    def extract_job_cards(self, job_cards, search_title):
+        """
+        Extract job details from a list of rendered job cards
+        
+        :param job_cards: Job card elements
+        :param search_title: Job title being searched
+        :return: List of job dictionaries
+        """
+        jobs = []
+        
+        # Cards are already rendered, so missing fields should fail fast
+        self.driver.implicitly_wait(0)
+        try:
+            for card in job_cards:
+                try:
+                    # Try multiple ways to extract job details
+                    job_data = {
+                        'Platform': 'Hiredly',
+                        'Job Title Searched': search_title,
+                        'Job Title': self.extract_text(card, self.FIELD_SELECTORS['title'], field='title'),
+                        'Company': self.extract_text(card, self.FIELD_SELECTORS['company'], field='company'),
+                        'Location': self.extract_text(card, self.FIELD_SELECTORS['location'], field='location'),
+                        'Salary Range': self.extract_text(card, self.FIELD_SELECTORS['salary'], field='salary'),
+                        'Job Type': self.extract_text(card, self.FIELD_SELECTORS['job_type'], field='job_type'),
+                        'Posted Date': self.extract_text(card, self.FIELD_SELECTORS['posted_date'], field='posted_date'),
+                        'Job URL': self.extract_job_url(card)
+                    }
+                    
+                    jobs.append(job_data)
+                
+                except Exception as card_e:
+                    logging.error(f"Error processing job card: {card_e}")
+        finally:
+            self.driver.implicitly_wait(self.implicit_wait)
+        
+        return jobs
+
+    def extract_job_url(self, card):
+        for selector in self.selector_cache.ordered('url', self.FIELD_SELECTORS['url']):
             try:
                 job_link = card.find_element(By.CSS_SELECTOR, selector)
+                self.selector_cache.remember('url', selector)
                 return job_link.get_attribute('href')
             except Exception:
                 continue
         
         return "URL not found"
 
-    def extract_text(self, card, selectors, default="Not specified"):
+    def extract_text(self, card, selectors, default="Not specified", field=None):
+        if field:
+            selectors = self.selector_cache.ordered(field, selectors)
+        
         for selector in selectors:
             try:
                 element = card.find_element(By.CSS_SELECTOR, selector)
+                if field:
+                    self.selector_cache.remember(field, selector)
                 return element.text.strip()
             except Exception:
                 continue
         
         return default
 
+    def first_job_link(self):
+        """
+        URL of the first job link on the page, used to tell when pagination replaced the cards
+        
+        :return: Link URL, or None when there is no job link
+        """
+        return self.driver.execute_script(
+            "var link = document.querySelector(arguments[0]); return link ? link.href : null;",
+            ', '.join(self.FIELD_SELECTORS['url'])
+        )
+
     def handle_pagination(self, search_title):
         try:
             # Try multiple pagination selectors
@@ -295,34 +602,40 @@ class HireldyScraper:
                         logging.info(f"No more pages for {search_title}")
                         break
                     
-                    next_button.click()
+                    previous_link = self.first_job_link()
+                    with self.timer.span(NAVIGATION, 'hiredly', search_title, current_page + 1):
+                        next_button.click()
                     current_page += 1
                     
-                    # Wait for page to load
-                    time.sleep(3)
+                    # The previous page's cards stay rendered until the new ones replace them,
+                    # so wait for the first job link to change before checking readiness
+                    with self.timer.span(WAIT_SCROLL, 'hiredly', search_title, current_page):
+                        try:
+                            WebDriverWait(self.driver, self.ready_ceiling, poll_frequency=0.25).until(
+                                lambda driver: self.first_job_link() != previous_link
+                            )
+                        except TimeoutException:
+                            logging.warning(f"Page {current_page} of {search_title} still shows the previous jobs")
+                        ready_state, _, time_to_ready = self.wait_for_page_ready()
+                    logging.info(f"Page {current_page} ready for {search_title}: state={ready_state} "
+                                 f"after {time_to_ready:.2f}s")
+                    
+                    if ready_state != 'cards':
+                        logging.warning(f"No job cards on page {current_page} of {search_title}")
+                        break
                     
-                    # Rescan job cards
-                    job_cards = self.driver.find_elements(By.CSS_SELECTOR, "div[data-testid='job-card']")
+                    if self.page_archive:
+                        self.page_archive.record_page(self.driver, 'hiredly', search_title, current_page)
                     
-                    # Extract jobs from this page
-                    for card in job_cards:
-                        try:
-                            job_url = self.extract_job_url(card)
-                            title = self.extract_text(card, ["h3[data-testid='job-card-title']", "h3.job-title"])
-                            company = self.extract_text(card, ["p[data-testid='job-card-company']", "p.company-name"])
-                            
-                            job_data = {
-                                'Platform': 'Hiredly',
-                                'Job Title Searched': search_title,
-                                'Job Title': title,
-                                'Company': company,
-                                'Job URL': job_url
-                            }
-                            
-                            self.jobs.append(job_data)
+                    with self.timer.span(EXTRACTION, 'hiredly', search_title, current_page):
+                        # Rescan job cards with the selector that matched on the first page
+                        job_cards = self.driver.find_elements(
+                            By.CSS_SELECTOR, self.job_card_selector or "div[data-testid='job-card']"
+                        )
                         
-                        except Exception as card_e:
-                            logging.error(f"Error processing job card on page {current_page}: {card_e}")
+                        # Extract jobs from this page
+                        jobs = self.extract_job_cards(job_cards, search_title)
+                    self.collect_jobs(jobs)
                 
                 except Exception as page_e:
                     logging.error(f"Error navigating to page {current_page}: {page_e}")
@@ -331,64 +644,34 @@ class HireldyScraper:
         except Exception as pagination_e:
             logging.error(f"Pagination error for {search_title}: {pagination_e}")
 
+    # Excel headers and the job dictionary keys they are read from
+    EXCEL_COLUMNS = [
+        ('Platform', 'Platform'),
+        ('Job Title Searched', 'Job Title Searched'),
+        ('Job Title', 'Job Title'),
+        ('Company', 'Company'),
+        ('Location', 'Location'),
+        ('Salary Range', 'Salary Range'),
+        ('Job Type', 'Job Type'),
+        ('Posted Date', 'Posted Date'),
+        ('Job URL', 'Job URL')
+    ]
+
     def save_results_excel(self, jobs):
         """
         Save scraped job listings to Excel
         
-        :param jobs: List of job dictionaries
+        :param jobs: Iterable of job dictionaries, e.g. a list or job_sink.read_jobs()
         """
         try:
             # Create timestamp for unique filename
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             output_file = os.path.join(self.output_dir, f'hiredly_jobs_{timestamp}.xlsx')
             
-            # Create a new workbook
-            wb = openpyxl.Workbook(write_only=False)
-            ws = wb.active
-            ws.title = "Job Listings"
-            
-            # Define headers
-            headers = [
-                'Platform', 'Job Title Searched', 'Job Title', 
-                'Company', 'Location', 'Salary Range', 'Job Type', 
-                'Posted Date', 'Job URL'
-            ]
-            
-            # Write headers with styling
-            header_font = Font(bold=True)
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = header_font
-            
-            # Write job data
-            for row, job in enumerate(jobs, 2):
-                ws.cell(row=row, column=1, value=job['Platform'])
-                ws.cell(row=row, column=2, value=job['Job Title Searched'])
-                ws.cell(row=row, column=3, value=job['Job Title'])
-                ws.cell(row=row, column=4, value=job['Company'])
-                ws.cell(row=row, column=5, value=job['Location'])
-                ws.cell(row=row, column=6, value=job['Salary Range'])
-                ws.cell(row=row, column=7, value=job['Job Type'])
-                ws.cell(row=row, column=8, value=job['Posted Date'])
-                ws.cell(row=row, column=9, value=job['Job URL'])
-            
-            # Auto-adjust column widths
-            for col in ws.columns:
-                max_length = 0
-                column = col[0].column_letter
-                for cell in col:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(cell.value)
-                    except:
-                        pass
-                adjusted_width = (max_length + 2)
-                ws.column_dimensions[column].width = adjusted_width
-            
-            # Save the workbook
-            wb.save(output_file)
+            # Stream rows into a write-only workbook
+            with self.timer.span(EXPORT, 'hiredly'):
+                export_jobs_excel(jobs, output_file, self.EXCEL_COLUMNS)
             
-            logging.info(f"Total jobs found: {len(jobs)}")
             logging.info(f"Results saved to {output_file}")
             
             # Attempt to open the file
@@ -404,14 +687,34 @@ class HireldyScraper:
             logging.error(traceback.format_exc())
             return None
 
+    def close(self):
+        """
+        Release the browser to the pool, or quit it when not pooled
+        """
+        try:
+            if getattr(self, 'driver', None):
+                if self.profiler:
+                    self.profiler.detach(self.driver)
+                if self.browser_pool:
+                    self.browser_pool.release(self.driver)
+                else:
+                    self.driver.quit()
+                self.driver = None
+        except Exception as e:
+            logging.error(f"Error closing driver: {e}")
+
     def __del__(self):
         """Close browser on object destruction"""
         try:
-            if hasattr(self, 'driver'):
-                # Add explicit wait before quitting
-                self.driver.close()
-                time.sleep(1)
-                self.driver.quit()
+            if getattr(self, 'driver', None):
+                if self.browser_pool:
+                    self.close()
+                else:
+                    # Add explicit wait before quitting
+                    self.driver.close()
+                    time.sleep(1)
+                    self.driver.quit()
+                    self.driver = None
                 logging.info("Hiredly Browser closed successfully")
         except Exception as e:
             logging.error(f"Error closing browser: {e}")
@@ -433,11 +736,20 @@ def main():
         return
     
     scraper = None
+    sink = None
+    # Time each crawl phase for the run metrics
+    timer = PhaseTimer()
     try:
+        # Stream jobs to disk as each page is extracted
+        sink = JsonlJobSink(os.path.join('hiredly_output', f'hiredly_jobs_{time.strftime("%Y%m%d_%H%M%S")}.jsonl.gz'))
+        
         # Initialize and run Hiredly scraper
-        scraper = HireldyScraper(CHROMEDRIVER_PATH)
-        jobs = scraper.scrape_jobs()
-        excel_file = scraper.save_results_excel(jobs)
+        scraper = HireldyScraper(CHROMEDRIVER_PATH, sink=sink, timer=timer)
+        scraper.scrape_jobs()
+        sink.close()
+        
+        # Stream the saved jobs straight into the Excel export
+        excel_file = scraper.save_results_excel(read_jobs(sink.path))
         
         if excel_file:
             print(f"Jobs saved to {excel_file}")
@@ -449,11 +761,11 @@ def main():
     
     finally:
         # Ensure driver is closed even if an exception occurs
-        if scraper and hasattr(scraper, 'driver'):
-            try:
-                scraper.driver.quit()
-            except Exception as close_err:
-                logging.error(f"Error in final driver cleanup: {close_err}")
+        if scraper:
+            scraper.close()
+        if sink:
+            sink.close()
+        timer.write(name='hiredly')
 
 if __name__ == "__main__":
     main()
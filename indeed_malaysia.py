@@ -23,6 +23,10 @@ import requests
 from fake_useragent import UserAgent
 import tls_client
 
+from job_sink import JsonlJobSink, load_jobs
+from job_key import job_key
+from phase_timer import PhaseTimer, DRIVER_START, NAVIGATION, WAIT_SCROLL, POPUPS, EXTRACTION, EXPORT
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.DEBUG)
@@ -45,15 +49,34 @@ logger.addHandler(file_handler)
 logger.addHandler(console_handler)
 
 class IndeedScraper:
-    def __init__(self, chromedriver_path=None, existing_browser_port=None):
+    def __init__(self, chromedriver_path=None, existing_browser_port=None, use_http=False, http_max_pages=5,
+                 browser_pool=None, lean_profile=None, sink=None, page_archive=None, timer=None,
+                 profiler=None):
         """
         Initialize Indeed Scraper with option to use existing browser session
         
         :param chromedriver_path: Optional path to ChromeDriver executable
         :param existing_browser_port: Port of an existing Chrome browser debugging session
+        :param use_http: Fetch result pages through the HTTP clients and only start the browser as a fallback
+        :param http_max_pages: Maximum number of result pages to fetch per search in HTTP mode
+        :param browser_pool: Optional BrowserPool to lease warm browsers from
+        :param lean_profile: Optional LeanProfile for headless mode, request blocking and page byte reporting
+        :param sink: Optional JsonlJobSink; each search's jobs are written to it instead of being kept in memory
+        :param page_archive: Optional PageArchive that stores every results page for offline replay
+        :param timer: Optional PhaseTimer recording how long each crawl phase takes
+        :param profiler: Optional WebDriverProfiler that counts and times every WebDriver command
         """
         self.driver = None
         self.ua = UserAgent()
+        self.existing_browser_port = existing_browser_port
+        self.use_http = use_http
+        self.http_max_pages = http_max_pages
+        self.browser_pool = browser_pool
+        self.lean_profile = lean_profile
+        self.sink = sink
+        self.page_archive = page_archive
+        self.timer = timer or PhaseTimer(enabled=False)
+        self.profiler = profiler
         
         try:
             # Initialize TLS client for advanced request handling
@@ -99,43 +122,9 @@ class IndeedScraper:
                 }
             ]
             
-            # Attach to existing browser or create new session
-            if existing_browser_port:
-                # Connect to existing Chrome browser session
-                logger.info(f"Connecting to existing Chrome browser on port {existing_browser_port}")
-                chrome_options = uc.ChromeOptions()
-                chrome_options.debugger_address = f'127.0.0.1:{existing_browser_port}'
-                self.driver = uc.Chrome(options=chrome_options)
-            else:
-                # Setup Chrome options with advanced bot evasion
-                chrome_options = uc.ChromeOptions()
-                chrome_options.add_argument("--start-maximized")
-                chrome_options.add_argument(f"user-agent={self.ua.random}")
-                chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-                chrome_options.add_experimental_option('useAutomationExtension', False)
-                
-                # Initialize the driver with retry mechanism
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        logger.info(f"Initializing ChromeDriver (Attempt {attempt + 1}/{max_retries})...")
-                        self.driver = uc.Chrome(options=chrome_options)
-                        
-                        # Additional browser fingerprint randomization
-                        self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-                            "source": """
-                            Object.defineProperty(navigator, 'webdriver', {
-                                get: () => undefined
-                            })
-                            """
-                        })
-                        
-                        break  # Success, exit retry loop
-                    except Exception as init_error:
-                        logger.warning(f"ChromeDriver initialization failed: {init_error}")
-                        if attempt == max_retries - 1:
-                            raise
-                        time.sleep(2)  # Wait before retry
+            # In HTTP mode the browser is only started when a search needs the fallback
+            if not self.use_http:
+                self.init_driver()
             
             # Prepare output directory
             self.output_dir = 'indeed_output'
@@ -144,12 +133,92 @@ class IndeedScraper:
         except Exception as e:
             logger.error(f"Indeed Scraper Initialization Error: {e}")
             logger.error(traceback.format_exc())
+            self.close()
+            raise
+
+    def close(self):
+        """
+        Release the browser to the pool, or quit it when not pooled
+        """
+        try:
             if self.driver:
-                try:
+                if self.profiler:
+                    self.profiler.detach(self.driver)
+                if self.browser_pool:
+                    self.browser_pool.release(self.driver)
+                else:
                     self.driver.quit()
-                except Exception:
-                    pass
-            raise
+                self.driver = None
+        except Exception as e:
+            logger.error(f"Error closing driver: {e}")
+
+    def init_driver(self):
+        """
+        Start a new Chrome session, lease one from the browser pool or attach to an existing one
+        """
+        driver_start_time = time.perf_counter()
+        if self.browser_pool:
+            # Hand back a dead pooled browser before leasing a replacement
+            if self.driver:
+                if self.profiler:
+                    self.profiler.detach(self.driver)
+                self.browser_pool.release(self.driver)
+            self.driver = self.browser_pool.acquire()
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                "source": """
+                Object.defineProperty(navigator, 'webdriver', {
+                    get: () => undefined
+                })
+                """
+            })
+        
+        # Attach to existing browser or create new session
+        elif self.existing_browser_port:
+            # Connect to existing Chrome browser session
+            logger.info(f"Connecting to existing Chrome browser on port {self.existing_browser_port}")
+            chrome_options = uc.ChromeOptions()
+            chrome_options.debugger_address = f'127.0.0.1:{self.existing_browser_port}'
+            self.driver = uc.Chrome(options=chrome_options)
+        else:
+            # Setup Chrome options with advanced bot evasion
+            chrome_options = uc.ChromeOptions()
+            if not (self.lean_profile and self.lean_profile.headless):
+                chrome_options.add_argument("--start-maximized")
+            chrome_options.add_argument(f"user-agent={self.ua.random}")
+            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            chrome_options.add_experimental_option('useAutomationExtension', False)
+            if self.lean_profile:
+                self.lean_profile.apply_options(chrome_options)
+            
+            # Initialize the driver with retry mechanism
+            max_retries = 3
+            for attempt in range(max_retries):
+                try:
+                    logger.info(f"Initializing ChromeDriver (Attempt {attempt + 1}/{max_retries})...")
+                    self.driver = uc.Chrome(options=chrome_options)
+                    
+                    # Additional browser fingerprint randomization
+                    self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                        "source": """
+                        Object.defineProperty(navigator, 'webdriver', {
+                            get: () => undefined
+                        })
+                        """
+                    })
+                    
+                    break  # Success, exit retry loop
+                except Exception as init_error:
+                    logger.warning(f"ChromeDriver initialization failed: {init_error}")
+                    if attempt == max_retries - 1:
+                        raise
+                    time.sleep(2)  # Wait before retry
+        
+        # Request blocking also works on an attached or pooled browser
+        if self.lean_profile:
+            self.lean_profile.apply(self.driver)
+        if self.profiler:
+            self.profiler.attach(self.driver)
+        self.timer.add(DRIVER_START, 'indeed', time.perf_counter() - driver_start_time)
 
     def cloudflare_bypass(self, url):
         """
@@ -286,16 +355,19 @@ class IndeedScraper:
             # Reinitialize driver if it's no longer active
             if not self.is_driver_active():
                 logger.warning("Driver is not active. Reinitializing...")
-                self.__init__()
+                self.init_driver()
             
             # Navigate to the search URL
             logger.info(f"Navigating to {search_url}")
-            self.driver.get(search_url)
+            with self.timer.span(NAVIGATION, 'indeed', job_title, 1):
+                self.driver.get(search_url)
             
             # Extended wait for page load and potential challenges
-            time.sleep(10)
+            with self.timer.span(WAIT_SCROLL, 'indeed', job_title, 1):
+                time.sleep(10)
             
             # Create a detailed human verification popup
+            verification_start_time = time.perf_counter()
             root = tk.Tk()
             root.title("Human Verification Required")
             root.geometry("700x600")
@@ -372,6 +444,7 @@ class IndeedScraper:
             
             # Keep the window open and wait for user action
             root.mainloop()
+            self.timer.add(POPUPS, 'indeed', time.perf_counter() - verification_start_time, job_title, 1)
             
             # If verification is not complete, return False
             if not verification_complete:
@@ -380,17 +453,18 @@ class IndeedScraper:
             
             # Additional human-like interactions
             try:
-                # Scroll page
-                self.driver.execute_script("window.scrollBy(0, 250);")
-                time.sleep(1)
-                self.driver.execute_script("window.scrollBy(0, -100);")
-                time.sleep(1)
-                
-                # Hover over some elements
-                job_cards = self.driver.find_elements(By.CSS_SELECTOR, 'div.job_seen_beacon')
-                if job_cards:
-                    webdriver.ActionChains(self.driver).move_to_element(job_cards[0]).perform()
+                with self.timer.span(WAIT_SCROLL, 'indeed', job_title, 1):
+                    # Scroll page
+                    self.driver.execute_script("window.scrollBy(0, 250);")
+                    time.sleep(1)
+                    self.driver.execute_script("window.scrollBy(0, -100);")
                     time.sleep(1)
+                    
+                    # Hover over some elements
+                    job_cards = self.driver.find_elements(By.CSS_SELECTOR, 'div.job_seen_beacon')
+                    if job_cards:
+                        webdriver.ActionChains(self.driver).move_to_element(job_cards[0]).perform()
+                        time.sleep(1)
             except Exception as interaction_error:
                 logger.warning(f"Additional human interaction error: {interaction_error}")
             
@@ -474,6 +548,13 @@ class IndeedScraper:
                     location_elem = card.find_element(By.CSS_SELECTOR, 'div.companyLocation')
                     link_elem = card.find_element(By.CSS_SELECTOR, 'h2.jobTitle a')
                     
+                    # Link to the job by its key instead of the tracking redirect in href
+                    jk = link_elem.get_attribute('data-jk')
+                    if jk:
+                        link = urllib.parse.urljoin(self.driver.current_url, f"/viewjob?jk={jk}")
+                    else:
+                        link = link_elem.get_attribute('href')
+                    
                     # Try to extract salary (not always present)
                     try:
                         salary_elem = card.find_element(By.CSS_SELECTOR, 'div.metadata.salary-info-container')
@@ -488,7 +569,7 @@ class IndeedScraper:
                         'company_name': company_elem.text.strip(),
                         'location': location_elem.text.strip(),
                         'salary_range': salary,
-                        'link': link_elem.get_attribute('href'),
+                        'link': link,
                         'search_keywords': job_title
                         
                         }
@@ -503,11 +584,113 @@ class IndeedScraper:
         
         return jobs
 
+    def parse_results_html(self, html, job_title, page_url):
+        """
+        Parse job cards from the job card data embedded in an Indeed results page
+        
+        :param html: Raw HTML of the results page
+        :param job_title: Job title being searched (for keyword tracking)
+        :param page_url: URL the page was fetched from, used to resolve job links
+        :return: List of job dictionaries, or None if the page is not a results page
+        """
+        marker = re.search(r'window\.mosaic\.providerData\["mosaic-provider-jobcards"\]\s*=\s*', html)
+        if not marker:
+            return None
+        
+        try:
+            provider_data, _ = json.JSONDecoder().raw_decode(html, marker.end())
+            results = provider_data['metaData']['mosaicProviderJobCardsModel']['results']
+        except (ValueError, KeyError, TypeError) as parse_error:
+            logger.warning(f"Could not parse job card data: {parse_error}")
+            return None
+        
+        jobs = []
+        for result in results:
+            try:
+                salary_snippet = result.get('salarySnippet') or {}
+                # The job key gives a stable link; result['link'] is a tracking redirect
+                link = f"/viewjob?jk={result['jobkey']}" if result.get('jobkey') else result['link']
+                
+                job = {
+                    'platform': 'Indeed Malaysia',
+                    'job_title': (result.get('displayTitle') or result.get('title') or '').strip(),
+                    'company_name': (result.get('company') or '').strip(),
+                    'location': (result.get('formattedLocation') or '').strip(),
+                    'salary_range': salary_snippet.get('text') or 'Not specified',
+                    'link': urllib.parse.urljoin(page_url, link),
+                    'search_keywords': job_title
+                }
+                
+                jobs.append(job)
+            
+            except Exception as detail_error:
+                logger.warning(f"Could not extract job details: {detail_error}")
+        
+        return jobs
+
+    def scrape_search_http(self, job_title, search_url):
+        """
+        Scrape a search through the HTTP clients without a browser
+        
+        :param job_title: Job title being searched
+        :param search_url: URL of the first results page
+        :return: List of jobs, or None if a usable results page could not be fetched
+        """
+        jobs = []
+        seen_keys = set()
+        
+        split_url = urllib.parse.urlsplit(search_url)
+        query = urllib.parse.parse_qs(split_url.query)
+        # vjk only preselects a job in the side panel
+        query.pop('vjk', None)
+        
+        for page in range(self.http_max_pages):
+            query['start'] = [str(page * 10)]
+            page_url = urllib.parse.urlunsplit(
+                split_url._replace(query=urllib.parse.urlencode(query, doseq=True))
+            )
+            
+            with self.timer.span(NAVIGATION, 'indeed', job_title, page + 1):
+                response = self.cloudflare_bypass(page_url)
+            if response is not None and self.page_archive:
+                self.page_archive.record(response.text, page_url, 'indeed', job_title, page + 1)
+            with self.timer.span(EXTRACTION, 'indeed', job_title, page + 1):
+                page_jobs = self.parse_results_html(response.text, job_title, page_url) if response is not None else None
+            
+            if page_jobs is None:
+                # Only the first page decides whether the browser is needed
+                if page == 0:
+                    return None
+                logger.warning(f"Page {page + 1} for {job_title} was not a usable results page")
+                break
+            
+            new_jobs = [job for job in page_jobs if job_key(job['link'], 'indeed') not in seen_keys]
+            if not new_jobs:
+                break
+            
+            seen_keys.update(job_key(job['link'], 'indeed') for job in new_jobs)
+            jobs.extend(new_jobs)
+            logger.info(f"Page {page + 1}: Fetched {len(new_jobs)} jobs for {job_title} over HTTP")
+        
+        return jobs
+
+    def collect_jobs(self, all_jobs, jobs):
+        """
+        Stream a search's jobs to the sink, or keep them in all_jobs when there is no sink
+        
+        :param all_jobs: In-memory job list of the current run
+        :param jobs: Jobs extracted for one search
+        """
+        if self.sink:
+            self.sink.write_page(jobs)
+        else:
+            all_jobs.extend(jobs)
+
     def scrape_job_listings(self):
         """
         Main scraping method for Indeed job listings
         
-        :return: List of all scraped jobs
+        :return: List of all scraped jobs (empty when streaming to a sink)
         """
         all_jobs = []
         
@@ -516,18 +699,36 @@ class IndeedScraper:
             search_url = job_search['url']
             
             try:
+                # Try the browser-free path first and only fall back to Chrome when needed
+                if self.use_http:
+                    jobs = self.scrape_search_http(job_title, search_url)
+                    if jobs is not None:
+                        self.collect_jobs(all_jobs, jobs)
+                        logger.info(f"Scraped {len(jobs)} jobs for {job_title}")
+                        continue
+                    
+                    logger.warning(f"No usable results page over HTTP for {job_title}, falling back to browser")
+                
                 # Manual verification with option to proceed or skip
                 if not self.manual_verification(job_title, search_url):
                     logger.warning(f"Skipping {job_title} as per user request")
                     continue
                 
                 # Scroll and load jobs
-                self.scroll_and_load_jobs()
+                with self.timer.span(WAIT_SCROLL, 'indeed', job_title, 1):
+                    self.scroll_and_load_jobs()
+                
+                if self.lean_profile:
+                    self.lean_profile.record_page_bytes(self.driver, 'Indeed', job_title)
+                
+                if self.page_archive:
+                    self.page_archive.record_page(self.driver, 'indeed', job_title)
                 
                 # Extract job details
-                jobs = self.extract_job_details(job_title)
+                with self.timer.span(EXTRACTION, 'indeed', job_title, 1):
+                    jobs = self.extract_job_details(job_title)
                 
-                all_jobs.extend(jobs)
+                self.collect_jobs(all_jobs, jobs)
                 logger.info(f"Scraped {len(jobs)} jobs for {job_title}")
             
             except Exception as e:
@@ -567,7 +768,8 @@ class IndeedScraper:
             # Save to Excel
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = os.path.join(self.output_dir, f'indeed_jobs_{timestamp}.xlsx')
-            df.to_excel(filename, index=False)
+            with self.timer.span(EXPORT, 'indeed'):
+                df.to_excel(filename, index=False)
             logger.info(f"Jobs saved to {filename}")
             return filename
         
@@ -583,15 +785,23 @@ def main():
     # Default port for Chrome remote debugging (you can change this)
     existing_browser_port = 9222
     
+    # Stream jobs to disk as each search is extracted
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    sink = JsonlJobSink(os.path.join('indeed_output', f'indeed_jobs_{timestamp}.jsonl.gz'))
+    
+    # Time each crawl phase for the run metrics
+    timer = PhaseTimer()
+    
     # Create scraper instance with existing browser session
-    scraper = IndeedScraper(existing_browser_port=existing_browser_port)
+    scraper = IndeedScraper(existing_browser_port=existing_browser_port, sink=sink, timer=timer)
     
     try:
         # Scrape job listings
-        all_jobs = scraper.scrape_job_listings()
+        scraper.scrape_job_listings()
+        sink.close()
         
-        # Save to Excel
-        output_file = scraper.save_to_excel(all_jobs)
+        # Build the Excel export from the streamed file
+        output_file = scraper.save_to_excel(load_jobs(sink.path))
         
         logger.info(f"Scraping completed. Jobs saved to {output_file}")
     
@@ -600,8 +810,9 @@ def main():
     
     finally:
         # Close the browser
-        if scraper.driver:
-            scraper.driver.quit()
+        scraper.close()
+        sink.close()
+        timer.write(name='indeed')
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,415 @@
+import re
+import time
+import logging
+
+import numpy as np
+
+# Legal-form and filler words that differ between platforms for the same employer
+COMPANY_NOISE = re.compile(
+    r'\b(sdn|bhd|berhad|pte|ltd|limited|inc|plc|llc|corp|corporation|co|company|group|malaysia|m)\b'
+)
+NON_ALPHANUMERIC = re.compile(r'[^0-9a-z]+')
+MISSING_VALUES = {'', 'n/a', 'na', 'none', 'nan', 'unknown', 'not specified'}
+
+def normalize_text(value, company=False):
+    """
+    Lowercase, strip punctuation and collapse whitespace
+
+    :param value: Raw title, company or location
+    :param company: Also drop legal-form words such as 'Sdn Bhd'
+    :return: Normalized string, empty for missing values
+    """
+    if value is None:
+        return ''
+    text = str(value).strip().lower()
+    if text in MISSING_VALUES:
+        return ''
+    text = NON_ALPHANUMERIC.sub(' ', text)
+    if company:
+        text = COMPANY_NOISE.sub(' ', text)
+    return ' '.join(text.split())
+
+def normalize_values(values, company=False):
+    """
+    normalize_text over a column, once per distinct value since scrape histories repeat them
+
+    :param values: Raw titles, companies or locations
+    :param company: Also drop legal-form words such as 'Sdn Bhd'
+    :return: List of normalized strings
+    """
+    normalized = {}
+    result = []
+    for value in values:
+        if value not in normalized:
+            normalized[value] = normalize_text(value, company)
+        result.append(normalized[value])
+    return result
+
+def shingle_set(text):
+    """
+    Character 3-grams of a normalized text, the same shingles the MinHash signatures use
+    """
+    text = text.ljust(3)
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def jaccard(first, second):
+    """
+    Exact Jaccard similarity of two shingle sets
+    """
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+class MinHashDeduplicator:
+    # Chunk of rows hashed at once, bounds the temporary arrays
+    CHUNK_ROWS = 100000
+    # Representatives remembered per LSH bucket when splitting components
+    BUCKET_REPRESENTATIVES = 8
+
+    def __init__(self, title_threshold=0.8, company_threshold=0.5, num_perm=32, seed=1):
+        """
+        Near-duplicate grouping of job postings with MinHash and LSH banding
+
+        Title and company are each reduced to the character 3-grams of their
+        normalized text and summarized by num_perm MinHash values. Every LSH
+        band hashes a slice of both signatures, so postings only become
+        candidates when title and company collide together. A candidate pair
+        is linked when the estimated Jaccard similarity of the titles and of
+        the companies reach their thresholds. Work grows with the number of
+        rows, not with the number of row pairs.
+
+        Linked postings are then grouped around a representative: each one
+        joins the first earlier representative whose exact title and company
+        similarity reach the thresholds, or starts a group of its own. Chains
+        of pairwise matches therefore cannot pull a 'Senior' and an 'Intern'
+        variant of a title into one cluster.
+
+        Postings without a company name are never merged, since a shared
+        title alone does not identify a vacancy. Repeated scrapes of the same
+        title and company are hashed and grouped once.
+
+        :param title_threshold: Jaccard similarity the titles must reach; seniority variants
+                                such as 'Senior Software Engineer' stay below the default
+        :param company_threshold: Jaccard similarity the companies must reach; lower since
+                                  platforms spell employer names differently
+        :param num_perm: Number of MinHash values per field
+        :param seed: Random seed for the hash functions, fixed so cluster ids are reproducible
+        """
+        self.title_threshold = title_threshold
+        self.company_threshold = company_threshold
+        self.num_perm = num_perm
+        # A band collides with probability about (title similarity * company similarity) ** rows
+        self.bands, self.rows_per_band = self.choose_bands(title_threshold * company_threshold, num_perm)
+
+        rng = np.random.default_rng(seed)
+        # Random linear permutations of the 32-bit shingle hashes
+        self.multipliers = rng.integers(0, 2 ** 31, size=num_perm, dtype=np.uint32) * np.uint32(2) + np.uint32(1)
+        self.offsets = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint32)
+
+    @staticmethod
+    def choose_bands(threshold, num_perm):
+        """
+        Pick the LSH band layout whose collision threshold is closest to the given similarity
+
+        :return: Tuple of (bands, rows per band)
+        """
+        best = None
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            distance = abs((1 / bands) ** (1 / rows) - threshold)
+            if best is None or distance < best[0]:
+                best = (distance, bands, rows)
+        return best[1], best[2]
+
+    @staticmethod
+    def shingles(texts):
+        """
+        Hashed character 3-grams of every text, computed over one concatenated buffer
+
+        :param texts: List of normalized strings
+        :return: Tuple of (3-gram hashes as uint32, start offset of each text's hashes)
+        """
+        encoded = [text.encode('utf-8').ljust(3) for text in texts]
+        lengths = np.fromiter((len(text) for text in encoded), dtype=np.int64, count=len(encoded))
+        buffer = np.frombuffer(b''.join(encoded) + b'\0\0', dtype=np.uint8).astype(np.uint32)
+
+        codes = (buffer[:-2] << np.uint32(16)) | (buffer[1:-1] << np.uint32(8)) | buffer[2:]
+
+        # Drop 3-grams that run across the end of a text
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        position = np.arange(codes.size) - np.repeat(starts, lengths)
+        codes = codes[position <= np.repeat(lengths - 3, lengths)]
+
+        # Spread the 24-bit codes over 32 bits (murmur3 finalizer)
+        codes ^= codes >> np.uint32(16)
+        codes *= np.uint32(0x85EBCA6B)
+        codes ^= codes >> np.uint32(13)
+        codes *= np.uint32(0xC2B2AE35)
+        codes ^= codes >> np.uint32(16)
+
+        counts = lengths - 2
+        return codes, np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    def signatures(self, texts):
+        """
+        MinHash signatures of the texts
+
+        :param texts: List of normalized strings
+        :return: uint32 array of shape (len(texts), num_perm)
+        """
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for chunk_start in range(0, len(texts), self.CHUNK_ROWS):
+            chunk = texts[chunk_start:chunk_start + self.CHUNK_ROWS]
+            codes, starts = self.shingles(chunk)
+            hashed = np.empty_like(codes)
+            for k in range(self.num_perm):
+                np.multiply(codes, self.multipliers[k], out=hashed)
+                hashed += self.offsets[k]
+                signatures[chunk_start:chunk_start + len(chunk), k] = np.minimum.reduceat(hashed, starts)
+        return signatures
+
+    def band_keys(self, title_signatures, company_signatures, mergeable):
+        """
+        LSH bucket key of every posting in every band
+
+        :param title_signatures: MinHash signatures of the titles
+        :param company_signatures: MinHash signatures of the companies
+        :param mergeable: Boolean mask of postings that may be merged at all
+        :return: uint64 array of shape (postings, bands)
+        """
+        count = len(title_signatures)
+        # Unmergeable rows get a key of their own so they never share a bucket
+        own_keys = np.arange(count, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+
+        keys = np.zeros((count, self.bands), dtype=np.uint64)
+        for band in range(self.bands):
+            band_columns = slice(band * self.rows_per_band, (band + 1) * self.rows_per_band)
+            band_keys = keys[:, band]
+            for signatures in (title_signatures, company_signatures):
+                for column in signatures[:, band_columns].T:
+                    band_keys ^= column
+                    band_keys *= np.uint64(0x100000001B3)
+            band_keys[~mergeable] = own_keys[~mergeable]
+        return keys
+
+    def candidate_edges(self, keys, title_signatures, company_signatures):
+        """
+        Link postings that share an LSH band bucket and are similar enough
+
+        :param keys: Bucket keys from band_keys
+        :param title_signatures: MinHash signatures of the titles
+        :param company_signatures: MinHash signatures of the companies
+        :return: Tuple of two index arrays, one edge per position
+        """
+        count = len(keys)
+        sources = []
+        targets = []
+        for band in range(self.bands):
+            order = np.argsort(keys[:, band], kind='stable')
+            sorted_keys = keys[order, band]
+            bucket_start = np.ones(count, dtype=bool)
+            bucket_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+
+            # Star edges from every bucket member to the bucket's first member
+            first = order[np.maximum.accumulate(np.where(bucket_start, np.arange(count), 0))]
+            linked = first != order
+            if not linked.any():
+                continue
+            # Stable sort keeps row order, so the first member is the bucket's lowest row
+            sources.append(order[linked])
+            targets.append(first[linked])
+
+        if not sources:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        # The same pair usually collides in several bands; verify it once
+        pairs = np.unique(np.concatenate(sources).astype(np.int64) * count + np.concatenate(targets))
+        u, v = pairs // count, pairs % count
+
+        # Only a prefilter; groups are confirmed on exact similarity in split_components
+        keep = self.estimated_match(title_signatures[u], company_signatures[u],
+                                    title_signatures[v], company_signatures[v])
+        return u[keep], v[keep]
+
+    def estimated_match(self, title_signatures, company_signatures, other_titles, other_companies):
+        """
+        Whether the MinHash estimates of title and company similarity reach the thresholds
+
+        :return: Boolean array, one value per signature row
+        """
+        return (
+            ((title_signatures == other_titles).mean(axis=1) >= self.title_threshold) &
+            ((company_signatures == other_companies).mean(axis=1) >= self.company_threshold)
+        )
+
+    @staticmethod
+    def connected_components(count, sources, targets):
+        """
+        Label connected components by min-label propagation with pointer jumping
+
+        :return: Array with the smallest row index of each row's component
+        """
+        labels = np.arange(count)
+        while True:
+            previous = labels.copy()
+            np.minimum.at(labels, sources, labels[targets])
+            np.minimum.at(labels, targets, labels[sources])
+            labels = labels[labels]
+            if np.array_equal(labels, previous):
+                return labels
+
+    def split_components(self, labels, keys, title_signatures, company_signatures, titles, companies):
+        """
+        Regroup each connected component around representatives that every member matches
+
+        Members are taken in row order; each joins the first representative of
+        its component whose exact title and company similarity reach the
+        thresholds, otherwise it becomes a representative itself. Only
+        representatives sharing an LSH bucket with the member are compared,
+        the same pairs the banding would have found, and each bucket keeps at
+        most BUCKET_REPRESENTATIVES of them so one employer with thousands of
+        related titles stays linear. A full bucket can split a group, never
+        merge one.
+
+        :param labels: Component label per row from connected_components
+        :param keys: Bucket keys from band_keys
+        :param title_signatures: MinHash signatures of the titles
+        :param company_signatures: MinHash signatures of the companies
+        :param titles: List of normalized titles
+        :param companies: List of normalized companies
+        :return: Array with the representative row of each row
+        """
+        representatives = np.arange(len(labels))
+        members = np.flatnonzero(np.bincount(labels, minlength=len(labels))[labels] > 1)
+        if not members.size:
+            return representatives
+
+        # Shingles per distinct string; titles repeat across employers and vice versa
+        title_shingles = {}
+        company_shingles = {}
+
+        def fields(row):
+            title = titles[row]
+            company = companies[row]
+            if title not in title_shingles:
+                title_shingles[title] = shingle_set(title)
+            if company not in company_shingles:
+                company_shingles[company] = shingle_set(company)
+            return title_shingles[title], company_shingles[company]
+
+        buckets = [{} for _ in range(self.bands)]
+        for row, row_labels, row_keys in zip(members.tolist(), labels[members].tolist(), keys[members].tolist()):
+            candidates = set()
+            for band, key in enumerate(row_keys):
+                candidates.update(buckets[band].get(key, ()))
+            candidates = sorted(leader for leader in candidates if labels[leader] == row_labels)
+
+            if candidates:
+                leaders = np.array(candidates)
+                leaders = leaders[self.estimated_match(
+                    title_signatures[leaders], company_signatures[leaders],
+                    title_signatures[row], company_signatures[row]
+                )]
+                title, company = fields(row)
+                for leader in leaders.tolist():
+                    leader_title, leader_company = fields(leader)
+                    if (jaccard(title, leader_title) >= self.title_threshold and
+                            jaccard(company, leader_company) >= self.company_threshold):
+                        representatives[row] = leader
+                        break
+
+            if representatives[row] == row:
+                for band, key in enumerate(row_keys):
+                    bucket = buckets[band].setdefault(key, [])
+                    if len(bucket) < self.BUCKET_REPRESENTATIVES:
+                        bucket.append(row)
+        return representatives
+
+    def cluster(self, titles, companies):
+        """
+        Group near-duplicate postings
+
+        :param titles: List of normalized titles
+        :param companies: List of normalized companies (optionally with location), same length
+        :return: Dense cluster id per posting, numbered in order of first appearance
+        """
+        if not titles:
+            return np.empty(0, dtype=np.int64)
+
+        start_time = time.time()
+        # Repeated scrapes of a posting cluster together anyway; work on each distinct pair once.
+        # Rows without a company keep a key of their own, they are never merged
+        distinct = {}
+        codes = np.fromiter(
+            (distinct.setdefault(f'{title}\0{company}' if company else row, len(distinct))
+             for row, (title, company) in enumerate(zip(titles, companies))),
+            dtype=np.int64, count=len(titles)
+        )
+        _, first_rows = np.unique(codes, return_index=True)
+        distinct_titles = [titles[row] for row in first_rows]
+        distinct_companies = [companies[row] for row in first_rows]
+
+        title_signatures = self.signatures(distinct_titles)
+        company_signatures = self.signatures(distinct_companies)
+        mergeable = np.fromiter((bool(company) for company in distinct_companies), dtype=bool,
+                                count=len(distinct_companies))
+
+        keys = self.band_keys(title_signatures, company_signatures, mergeable)
+        sources, targets = self.candidate_edges(keys, title_signatures, company_signatures)
+        labels = self.connected_components(len(distinct_titles), sources, targets)
+        labels = self.split_components(labels, keys, title_signatures, company_signatures,
+                                       distinct_titles, distinct_companies)
+
+        # Representatives are the first row of each cluster, so unique order is appearance order
+        _, cluster_ids = np.unique(labels, return_inverse=True)
+        cluster_ids = cluster_ids[codes]
+        logging.info(
+            f"Clustered {len(titles)} postings ({len(distinct_titles)} distinct) into "
+            f"{cluster_ids.max() + 1} groups in {time.time() - start_time:.1f}s"
+        )
+        return cluster_ids
+
+def cluster_ids(titles, companies, locations=None, title_threshold=0.8, company_threshold=0.5, num_perm=32,
+                seed=1):
+    """
+    Cluster id per posting, shared by near-duplicate postings across platforms
+
+    :param titles: Job titles
+    :param companies: Company names, same length as titles
+    :param locations: Optional locations, compared together with the company;
+                      leave out when platforms report them at different granularity
+    :param title_threshold: Jaccard similarity the titles must reach
+    :param company_threshold: Jaccard similarity the companies must reach
+    :param num_perm: Number of MinHash values per field
+    :param seed: Random seed for the hash functions
+    :return: numpy array of cluster ids
+    """
+    titles = normalize_values(titles)
+    companies = normalize_values(companies, company=True)
+    if locations is not None:
+        companies = [
+            f"{company} {location}".strip() if company else ''
+            for company, location in zip(companies, normalize_values(locations))
+        ]
+
+    deduplicator = MinHashDeduplicator(title_threshold, company_threshold, num_perm, seed)
+    return deduplicator.cluster(titles, companies)
+
+def add_cluster_ids(df, title_column='title', company_column='company', location_column=None,
+                    column='cluster_id', **kwargs):
+    """
+    Add a cluster id column to a jobs DataFrame
+
+    :param df: pandas DataFrame of postings
+    :param title_column: Column holding job titles
+    :param company_column: Column holding company names
+    :param location_column: Optional column holding locations
+    :param column: Name of the new column
+    :param kwargs: Passed on to cluster_ids
+    :return: The same DataFrame
+    """
+    locations = df[location_column].tolist() if location_column else None
+    df[column] = cluster_ids(df[title_column].tolist(), df[company_column].tolist(), locations, **kwargs)
+    return df
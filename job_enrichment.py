@@ -0,0 +1,371 @@
+import re
+import json
+import time
+import random
+import asyncio
+import urllib.parse
+import logging
+import argparse
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+
+import aiohttp
+
+from job_record import JobColumns, JobRecord
+from job_sink import JsonlJobSink, read_jobs
+
+JSON_LD_PATTERN = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL
+)
+META_DESCRIPTION_PATTERN = re.compile(
+    r'<meta[^>]+(?:name|property)=["\'](?:og:)?description["\'][^>]+content=["\']([^"\']*)["\']', re.IGNORECASE
+)
+
+# Description headings that start the requirements block, and headings that end it
+REQUIREMENTS_HEADING = re.compile(
+    r'^(?:job\s+)?(?:requirements?|qualifications?|what you(?:\'ll)? need|what we(?:\'re| are) looking for|'
+    r'who you are|skills(?: and experience)?|experience)\b.{0,40}$', re.IGNORECASE
+)
+OTHER_HEADING = re.compile(
+    r'^(?:job\s+)?(?:responsibilit\w*|duties|what you(?:\'ll)? do|benefits?|perks|about (?:us|the \w+)|'
+    r'why join\b.*|what we offer|how to apply|the role|job description)\b.{0,40}$', re.IGNORECASE
+)
+
+# schema.org unitText values mapped onto the salary_normalizer periods
+SALARY_PERIODS = {'HOUR': 'hourly', 'DAY': 'daily', 'WEEK': 'weekly', 'MONTH': 'monthly', 'YEAR': 'yearly'}
+
+# Retried statuses; anything else that is not 200 fails at once
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+DETAIL_FIELDS = ['job_key', 'url', 'status', 'error', 'fetched_at', 'company', 'description', 'requirements',
+                 'employment_type', 'date_posted', 'valid_through', 'salary_min', 'salary_max',
+                 'salary_currency', 'salary_period', 'industry', 'address']
+
+class _TextExtractor(HTMLParser):
+    BLOCK_TAGS = {'p', 'div', 'br', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr', 'section'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+        if tag == 'li':
+            self.parts.append('- ')
+
+    def handle_endtag(self, tag):
+        if tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+def html_to_text(markup):
+    """
+    Plain text of an HTML fragment, one line per block element and '- ' before list items
+    """
+    if not markup:
+        return None
+    extractor = _TextExtractor()
+    extractor.feed(markup)
+    lines = (re.sub(r'[ \t\xa0]+', ' ', line).strip() for line in ''.join(extractor.parts).splitlines())
+    return '\n'.join(line for line in lines if line and line != '-') or None
+
+def extract_requirements(description):
+    """
+    Lines under a requirements or qualifications heading of a plain-text description
+
+    :param description: Output of html_to_text
+    :return: Requirements text, or None when the description has no such section
+    """
+    if not description:
+        return None
+    lines = description.splitlines()
+    for index, line in enumerate(lines):
+        if REQUIREMENTS_HEADING.match(line.strip(' :-*')):
+            block = []
+            for following in lines[index + 1:]:
+                if OTHER_HEADING.match(following.strip(' :-*')):
+                    break
+                block.append(following)
+            if block:
+                return '\n'.join(block)
+    return None
+
+def _job_postings(html):
+    """
+    JobPosting objects from the page's JSON-LD blocks
+    """
+    postings = []
+    for block in JSON_LD_PATTERN.findall(html):
+        try:
+            data = json.loads(block.strip())
+        except ValueError:
+            continue
+        items = data if isinstance(data, list) else data.get('@graph', [data]) if isinstance(data, dict) else []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            types = item.get('@type')
+            if types == 'JobPosting' or (isinstance(types, list) and 'JobPosting' in types):
+                postings.append(item)
+    return postings
+
+def _first(value):
+    return value[0] if isinstance(value, list) and value else value
+
+def parse_job_detail(html):
+    """
+    Parse the description fields of a job detail page
+
+    All four platforms embed a schema.org JobPosting as JSON-LD; the meta
+    description is used when a page has none.
+
+    :param html: Raw HTML of the detail page
+    :return: Dictionary with the parsed DETAIL_FIELDS, missing ones left out
+    """
+    postings = _job_postings(html)
+    if not postings:
+        match = META_DESCRIPTION_PATTERN.search(html)
+        description = html_to_text(match.group(1)) if match else None
+        return {'description': description, 'requirements': extract_requirements(description)}
+
+    posting = postings[0]
+    description = html_to_text(posting.get('description'))
+    detail = {
+        'description': description,
+        'requirements': html_to_text(posting.get('qualifications')) or extract_requirements(description),
+        'employment_type': ', '.join(posting['employmentType']) if isinstance(posting.get('employmentType'), list)
+                           else posting.get('employmentType'),
+        'date_posted': posting.get('datePosted'),
+        'valid_through': posting.get('validThrough'),
+        'industry': _first(posting.get('industry'))
+    }
+
+    organization = _first(posting.get('hiringOrganization'))
+    if isinstance(organization, dict):
+        detail['company'] = organization.get('name')
+
+    location = _first(posting.get('jobLocation'))
+    address = location.get('address') if isinstance(location, dict) else None
+    if isinstance(address, dict):
+        parts = []
+        for key in ('addressLocality', 'addressRegion', 'addressCountry'):
+            part = _first(address.get(key))
+            # addressCountry may be a Country object
+            part = part.get('name') if isinstance(part, dict) else part
+            if part:
+                parts.append(str(part))
+        detail['address'] = ', '.join(parts) or None
+
+    salary = posting.get('baseSalary')
+    if isinstance(salary, dict):
+        value = salary.get('value')
+        detail['salary_currency'] = salary.get('currency')
+        if isinstance(value, dict):
+            detail['salary_min'] = value.get('minValue', value.get('value'))
+            detail['salary_max'] = value.get('maxValue', value.get('value'))
+            detail['salary_period'] = SALARY_PERIODS.get(str(value.get('unitText', '')).upper())
+        elif value is not None:
+            detail['salary_min'] = detail['salary_max'] = value
+
+    return detail
+
+class JobEnricher:
+    DEFAULT_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                      'Chrome/131.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5'
+    }
+
+    def __init__(self, per_host=4, max_connections=32, timeout=20, retries=3, backoff=1.0, sink=None,
+                 headers=None):
+        """
+        Fetch job detail pages concurrently and parse their description fields
+
+        All requests share one aiohttp session, so connections are kept alive
+        and reused. Semaphores cap the requests in flight per host and in
+        total, and a request only starts once it holds a slot, so its timeout
+        never includes time spent queueing behind other requests. Failed
+        requests are retried with exponential backoff and jitter, honouring
+        Retry-After. Each distinct job is fetched once.
+
+        :param per_host: Maximum concurrent requests to one host
+        :param max_connections: Maximum concurrent requests overall
+        :param timeout: Seconds allowed per request, counted from when it starts
+        :param retries: Retries after the first attempt for timeouts, connection errors and RETRY_STATUSES
+        :param backoff: Base delay in seconds, doubled on every retry
+        :param sink: Optional JsonlJobSink; details are written to it in batches instead of being returned
+        :param headers: Optional request headers, defaults to DEFAULT_HEADERS
+        """
+        self.per_host = per_host
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.sink = sink
+        self.headers = headers or self.DEFAULT_HEADERS
+
+        self.stats = {'fetched': 0, 'failed': 0, 'retries': 0}
+        self._slots = None
+        self._host_slots = {}
+
+    def request_slot(self, url):
+        """
+        Semaphore limiting the concurrent requests to the host of a URL
+        """
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        return self._host_slots[host]
+
+    async def fetch(self, session, url):
+        """
+        Fetch one page with retries
+
+        :return: Tuple of (HTTP status or None, HTML or None, error message or None)
+        """
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            try:
+                # Slots are held for the request only, not for the backoff sleep
+                async with self.request_slot(url), self._slots:
+                    async with session.get(url) as response:
+                        if response.status == 200:
+                            return response.status, await response.text(errors='replace'), None
+                        if response.status not in RETRY_STATUSES or attempt == self.retries:
+                            return response.status, None, f"HTTP {response.status}"
+                        retry_after = response.headers.get('Retry-After', '')
+                        if retry_after.isdigit():
+                            delay = max(delay, int(retry_after))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    return None, None, f"{type(e).__name__}: {e}"
+
+            self.stats['retries'] += 1
+            await asyncio.sleep(delay)
+
+    async def enrich_job(self, session, key, url):
+        """
+        Fetch and parse the detail page of one job
+
+        :param session: Shared aiohttp.ClientSession
+        :param key: Job key of the posting
+        :param url: Job URL
+        :return: Detail dictionary with DETAIL_FIELDS
+        """
+        detail = dict.fromkeys(DETAIL_FIELDS)
+        detail['job_key'] = key
+        detail['url'] = url
+
+        status, html, error = await self.fetch(session, url)
+        detail['status'] = status
+        detail['error'] = error
+        detail['fetched_at'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        if html is not None:
+            try:
+                detail.update(parse_job_detail(html))
+            except Exception as e:
+                detail['error'] = f"Parse error: {e}"
+
+        self.stats['failed' if detail['error'] else 'fetched'] += 1
+        return detail
+
+    @staticmethod
+    def unique_urls(jobs):
+        """
+        Job keys and fetchable URLs, one per job key
+
+        :param jobs: JobColumns, JobRecords or scraper job dictionaries
+        :return: List of (job key, URL) tuples
+        """
+        if isinstance(jobs, JobColumns):
+            pairs = zip(jobs.columns['job_key'], jobs.columns['url'])
+        else:
+            records = (job if isinstance(job, JobRecord) else JobRecord.from_job_dict(job) for job in jobs)
+            pairs = ((record.job_key, record.url) for record in records)
+
+        seen = set()
+        urls = []
+        for key, url in pairs:
+            if not url or not str(url).startswith(('http://', 'https://')):
+                continue
+            if (key or url) not in seen:
+                seen.add(key or url)
+                urls.append((key, url))
+        return urls
+
+    async def enrich_async(self, jobs, batch_size=100):
+        """
+        Enrich jobs from any scraper
+
+        :param jobs: JobColumns, JobRecords or scraper job dictionaries
+        :param batch_size: Details written to the sink at a time
+        :return: List of detail dictionaries (empty when writing to a sink)
+        """
+        start_time = time.time()
+        urls = self.unique_urls(jobs)
+        logging.info(f"Enriching {len(urls)} jobs, {self.per_host} requests per host")
+
+        # Semaphores belong to the running event loop, so they are created per call
+        self._slots = asyncio.Semaphore(self.max_connections)
+        self._host_slots = {}
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host,
+                                         ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        details = []
+        batch = []
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers) as session:
+            tasks = [asyncio.ensure_future(self.enrich_job(session, key, url)) for key, url in urls]
+            for done, task in enumerate(asyncio.as_completed(tasks), 1):
+                detail = await task
+                if self.sink:
+                    batch.append(detail)
+                    if len(batch) >= batch_size:
+                        self.sink.write_page(batch)
+                        batch = []
+                else:
+                    details.append(detail)
+
+                if done % 500 == 0:
+                    logging.info(f"Enriched {done}/{len(urls)} jobs in {time.time() - start_time:.1f}s")
+
+        if self.sink and batch:
+            self.sink.write_page(batch)
+
+        elapsed = time.time() - start_time
+        logging.info(
+            f"Enriched {len(urls)} jobs in {elapsed:.1f}s ({len(urls) / elapsed if elapsed else 0:.1f}/s): "
+            f"{self.stats['fetched']} fetched, {self.stats['failed']} failed, {self.stats['retries']} retries"
+        )
+        return details
+
+    def enrich(self, jobs):
+        """
+        Blocking wrapper around enrich_async
+        """
+        return asyncio.run(self.enrich_async(jobs))
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
+
+    parser = argparse.ArgumentParser(description="Fetch job detail pages and parse their descriptions")
+    parser.add_argument('inputs', nargs='+', help="JSON Lines job files written by the scrapers")
+    parser.add_argument('--output', default=f"job_details_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz")
+    parser.add_argument('--per-host', type=int, default=4, help="Concurrent requests per host")
+    parser.add_argument('--max-connections', type=int, default=32, help="Concurrent requests overall")
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=20)
+    args = parser.parse_args()
+
+    jobs = [job for path in args.inputs for job in read_jobs(path)]
+    with JsonlJobSink(args.output) as sink:
+        JobEnricher(args.per_host, args.max_connections, args.timeout, args.retries, sink=sink).enrich(jobs)
+    logging.info(f"Job details saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
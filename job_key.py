@@ -0,0 +1,94 @@
+import re
+import urllib.parse
+
+# Host fragments identifying each platform, checked in order
+PLATFORM_HOSTS = (
+    ('indeed.', 'indeed'),
+    ('glassdoor.', 'glassdoor'),
+    ('jobstreet.', 'jobstreet'),
+    ('hiredly.', 'hiredly')
+)
+
+# Native job id inside each platform's job links
+JOB_ID_PATTERNS = {
+    # /viewjob?jk=..., /rc/clk?jk=..., search pages with ?vjk=...
+    'indeed': re.compile(r'[?&](?:jk|vjk)=([0-9A-Za-z]+)'),
+    # /job-listing/...htm?jl=1009..., /partner/jobListing.htm?jobListingId=...
+    'glassdoor': re.compile(r'[?&](?:jl|jobListingId)=(\d+)'),
+    # /job/81234567?type=..., /en/job/ux-designer-1234567
+    'jobstreet': re.compile(r'/job/(?:[^/?#]*-)?(\d+)(?:[/?#]|$)'),
+    # /jobs/<slug>
+    'hiredly': re.compile(r'/jobs/([^/?#]+)')
+}
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
+    'ref', 'referrer', 'src', 'from', 'tk', 'gclid', 'fbclid', 'sessionid'
+}
+
+def detect_platform(url):
+    """
+    Platform key of a job link, from its host
+
+    :param url: Job URL
+    :return: One of 'indeed', 'glassdoor', 'jobstreet', 'hiredly', or None
+    """
+    # The host sits within the first few dozen characters
+    head = url[:64].lower()
+    for fragment, platform in PLATFORM_HOSTS:
+        if fragment in head:
+            return platform
+    return None
+
+def canonical_url(url):
+    """
+    Normalize a job URL so the same posting always maps to the same string
+
+    Lowercases scheme and host, drops the fragment, tracking parameters and
+    trailing slash, and sorts the remaining query parameters. Used for links
+    without a recognizable native job id.
+
+    :param url: Job URL as scraped
+    :return: Canonical URL, or None for empty values
+    """
+    if not url or url == 'N/A':
+        return None
+
+    parts = urllib.parse.urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urllib.parse.urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        path,
+        urllib.parse.urlencode(sorted(query)),
+        ''
+    ))
+
+def job_key(url, platform=None):
+    """
+    Reduce a job link to a short stable key such as 'indeed:5f3c2a1b9e8d7c6b'
+
+    The native job id is found with one regular expression search over the
+    raw string; full URL parsing only happens for links without one.
+
+    :param url: Job URL as scraped
+    :param platform: Optional platform key, detected from the host when omitted
+    :return: 'platform:id', a canonical URL as fallback, or None for missing links
+    """
+    if not url or '/' not in url:
+        # Empty, 'N/A', 'URL not found' and similar placeholders
+        return None
+
+    platform = platform or detect_platform(url)
+    pattern = JOB_ID_PATTERNS.get(platform)
+    if pattern:
+        match = pattern.search(url)
+        if match:
+            return f"{platform}:{match.group(1).lower()}"
+
+    return canonical_url(url)
@@ -0,0 +1,201 @@
+import sys
+
+from job_key import job_key as make_job_key
+
+# Maps each scraper's job dictionary keys onto JobRecord fields
+PLATFORM_FIELD_MAPPINGS = {
+    'indeed': {
+        'platform': 'platform',
+        'job_title': 'title',
+        'company_name': 'company',
+        'location': 'location',
+        'salary_range': 'salary',
+        'link': 'url',
+        'search_keywords': 'search_keyword'
+    },
+    'glassdoor': {
+        'Platform': 'platform',
+        'Job Title': 'title',
+        'Company': 'company',
+        'Location': 'location',
+        'Salary': 'salary',
+        'url': 'url',
+        'Search Keyword': 'search_keyword',
+        'Easy Apply': 'easy_apply'
+    },
+    'hiredly': {
+        'Platform': 'platform',
+        'Job Title': 'title',
+        'Company': 'company',
+        'Location': 'location',
+        'Salary Range': 'salary',
+        'Posted Date': 'posted_date',
+        'Job Type': 'job_type',
+        'Job URL': 'url',
+        'Job Title Searched': 'search_keyword'
+    },
+    'jobstreet': {
+        'Platform': 'platform',
+        'Job Title': 'title',
+        'Location': 'location',
+        'Salary': 'salary',
+        'Posted Date': 'posted_date',
+        'URL': 'url',
+        'Search Keyword': 'search_keyword'
+    }
+}
+
+def platform_key(platform_name):
+    """
+    Reduce a platform display name such as 'Indeed Malaysia' to its mapping key
+
+    :param platform_name: Platform value from a job dictionary
+    :return: One of the PLATFORM_FIELD_MAPPINGS keys, or None
+    """
+    name = (platform_name or '').lower()
+    for key in PLATFORM_FIELD_MAPPINGS:
+        if name.startswith(key):
+            return key
+    return None
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+class JobRecord:
+    """
+    Compact job posting shared by all scrapers
+
+    Values that repeat across many postings (platform, search keyword,
+    company, location, ...) are interned, so every record points at the
+    same string object instead of holding its own copy. job_key is the
+    stable platform:id key derived from the URL, used for dedup and storage.
+    """
+    __slots__ = (
+        'platform', 'search_keyword', 'title', 'company', 'location',
+        'salary', 'posted_date', 'job_type', 'easy_apply', 'url', 'job_key'
+    )
+
+    FIELDS = __slots__
+
+    def __init__(self, platform, title, url, search_keyword=None, company=None, location=None,
+                 salary=None, posted_date=None, job_type=None, easy_apply=None, job_key=None):
+        self.platform = _intern(platform)
+        self.search_keyword = _intern(search_keyword)
+        self.title = _intern(title)
+        self.company = _intern(company)
+        self.location = _intern(location)
+        self.salary = _intern(salary)
+        self.posted_date = _intern(posted_date)
+        self.job_type = _intern(job_type)
+        self.easy_apply = _intern(easy_apply)
+        self.url = url
+        self.job_key = job_key or make_job_key(url, platform_key(platform))
+
+    @classmethod
+    def from_job_dict(cls, job, platform=None):
+        """
+        Build a record from any scraper's job dictionary
+
+        :param job: Job dictionary as produced by one of the scrapers
+        :param platform: Optional mapping key, detected from the dictionary when omitted
+        :return: JobRecord
+        """
+        key = platform or platform_key(job.get('Platform') or job.get('platform'))
+        if key not in PLATFORM_FIELD_MAPPINGS:
+            raise ValueError(f"Unknown platform for job: {job}")
+
+        values = {field: None for field in cls.FIELDS}
+        for source, field in PLATFORM_FIELD_MAPPINGS[key].items():
+            if source in job:
+                values[field] = job[source]
+
+        return cls(**values)
+
+    def to_dict(self):
+        """
+        Return the record as a plain dictionary keyed by field name
+        """
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        return f"JobRecord({self.platform!r}, {self.title!r}, {self.url!r})"
+
+class JobColumns:
+    """
+    Columnar accumulator of job postings
+
+    Each field is kept in its own list, so converting to a DataFrame or an
+    Arrow table hands over whole columns instead of unpacking row objects.
+    """
+    # Low-cardinality fields stored as categories / dictionary arrays
+    CATEGORICAL_FIELDS = ('platform', 'search_keyword', 'company', 'location', 'job_type', 'easy_apply')
+
+    def __init__(self):
+        self.columns = {field: [] for field in JobRecord.FIELDS}
+
+    def __len__(self):
+        return len(self.columns['url'])
+
+    def append(self, record):
+        """
+        Add a JobRecord
+        """
+        for field in JobRecord.FIELDS:
+            self.columns[field].append(getattr(record, field))
+
+    def append_job_dict(self, job, platform=None):
+        """
+        Add a scraper job dictionary
+
+        :param job: Job dictionary as produced by one of the scrapers
+        :param platform: Optional mapping key, detected from the dictionary when omitted
+        """
+        self.append(JobRecord.from_job_dict(job, platform))
+
+    def extend(self, records):
+        """
+        Add JobRecords or scraper job dictionaries
+        """
+        for record in records:
+            if isinstance(record, JobRecord):
+                self.append(record)
+            else:
+                self.append_job_dict(record)
+
+    def merge(self, other):
+        """
+        Append all rows of another JobColumns
+        """
+        for field in JobRecord.FIELDS:
+            self.columns[field].extend(other.columns[field])
+
+    def to_dataframe(self, categorical=True):
+        """
+        Convert to a pandas DataFrame
+
+        :param categorical: Store low-cardinality fields as pandas categories
+        :return: DataFrame with one column per JobRecord field
+        """
+        import pandas as pd
+
+        df = pd.DataFrame(self.columns, columns=list(JobRecord.FIELDS))
+        if categorical:
+            for field in self.CATEGORICAL_FIELDS:
+                df[field] = df[field].astype('category')
+        return df
+
+    def to_arrow(self):
+        """
+        Convert to a pyarrow Table with dictionary-encoded low-cardinality fields
+
+        :return: pyarrow.Table
+        """
+        import pyarrow as pa
+
+        arrays = {}
+        for field in JobRecord.FIELDS:
+            array = pa.array(self.columns[field], type=pa.string())
+            if field in self.CATEGORICAL_FIELDS:
+                array = array.dictionary_encode()
+            arrays[field] = array
+        return pa.table(arrays)
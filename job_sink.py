@@ -0,0 +1,107 @@
+import os
+import gzip
+import json
+import logging
+import threading
+
+class JsonlJobSink:
+    def __init__(self, path, compress=None, fsync=False):
+        """
+        Append-only JSON Lines sink that the scrapers write to page by page
+
+        Each job is one JSON object per line. The file is flushed after every
+        page, so a crash only loses the page being extracted. With gzip, each
+        flush ends in a sync point, so everything written before a crash can
+        still be decompressed.
+
+        :param path: Output file, appended to if it already exists
+        :param compress: Write gzip; defaults to True when path ends with .gz
+        :param fsync: Also fsync after every page, for crashes of the whole machine
+        """
+        self.path = path
+        self.compress = path.endswith('.gz') if compress is None else compress
+        self.fsync = fsync
+        self.jobs_written = 0
+        self.pages_written = 0
+        # Pages may arrive from several scraper threads at once
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if self.compress:
+            self._file = gzip.open(path, 'at', encoding='utf-8')
+        else:
+            self._file = open(path, 'a', encoding='utf-8')
+
+        logging.info(f"Streaming jobs to {path}")
+
+    def write_page(self, jobs):
+        """
+        Append one page of jobs and flush it to disk
+
+        :param jobs: List of job dictionaries
+        """
+        lines = ''.join(json.dumps(job, ensure_ascii=False, default=str) + '\n' for job in jobs)
+
+        with self._lock:
+            self._file.write(lines)
+            self.flush()
+            self.jobs_written += len(jobs)
+            self.pages_written += 1
+
+    def flush(self):
+        """
+        Flush buffered jobs to the file
+        """
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """
+        Flush and close the file
+        """
+        if not self._file.closed:
+            self._file.close()
+            logging.info(f"Wrote {self.jobs_written} jobs in {self.pages_written} pages to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+def read_jobs(path):
+    """
+    Iterate over the jobs in a JSON Lines file written by JsonlJobSink
+
+    A truncated last line, e.g. from a crash mid-write, is skipped.
+
+    :param path: JSON Lines file, optionally gzip-compressed
+    :return: Generator of job dictionaries
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        try:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"Skipping unreadable line in {path}")
+        except EOFError:
+            # Compressed stream cut off by a crash; everything before the last sync point was read
+            logging.warning(f"{path} ends with an incomplete gzip block")
+
+def load_jobs(path):
+    """
+    Load all jobs from a JSON Lines file, e.g. to build the Excel exports afterwards
+
+    :param path: JSON Lines file, optionally gzip-compressed
+    :return: List of job dictionaries
+    """
+    return list(read_jobs(path))
@@ -0,0 +1,280 @@
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+from job_key import job_key as make_job_key
+from job_record import JobColumns, JobRecord, platform_key
+
+def _utc_now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class JobStore:
+    # Stored in PRAGMA user_version; 1 keyed jobs by canonical URL, 2 by job key
+    SCHEMA_VERSION = 2
+
+    # Columns copied from JobRecord, in insert order
+    RECORD_FIELDS = [field for field in JobRecord.FIELDS if field != 'job_key']
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            job_key TEXT NOT NULL UNIQUE,
+            platform TEXT,
+            search_keyword TEXT,
+            title TEXT,
+            company TEXT,
+            location TEXT,
+            salary TEXT,
+            posted_date TEXT,
+            job_type TEXT,
+            easy_apply TEXT,
+            url TEXT,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            times_seen INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_platform ON jobs (platform);
+        CREATE INDEX IF NOT EXISTS idx_jobs_search_keyword ON jobs (search_keyword);
+        CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company);
+        CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs (last_seen);
+        CREATE INDEX IF NOT EXISTS idx_jobs_first_seen ON jobs (first_seen);
+    """
+
+    def __init__(self, path='jobs.db', batch_size=500):
+        """
+        Persistent SQLite store of every job posting seen across runs
+
+        Jobs are keyed by their job key (see job_key.job_key). Seeing a posting again updates
+        its details and last_seen, while first_seen keeps the date it first
+        appeared. Writes are buffered and committed in batched transactions.
+
+        The store has the same write_page() method as JsonlJobSink, so it
+        can be passed to any scraper as its sink.
+
+        :param path: SQLite database file
+        :param batch_size: Number of buffered jobs that triggers a commit
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.jobs_written = 0
+        self._pending = []
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.migrate()
+
+        columns = ', '.join(['job_key'] + self.RECORD_FIELDS + ['first_seen', 'last_seen'])
+        placeholders = ', '.join('?' * (len(self.RECORD_FIELDS) + 3))
+        updates = ', '.join(f'{field} = COALESCE(excluded.{field}, jobs.{field})' for field in self.RECORD_FIELDS)
+        self._upsert_sql = (
+            f'INSERT INTO jobs ({columns}) VALUES ({placeholders}) '
+            f'ON CONFLICT(job_key) DO UPDATE SET {updates}, '
+            f'last_seen = excluded.last_seen, times_seen = jobs.times_seen + 1'
+        )
+
+    def migrate(self):
+        """
+        Create the schema, or bring a database written by an older version up to date
+
+        :raises RuntimeError: If the database was written by a newer version
+        """
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version > self.SCHEMA_VERSION:
+            raise RuntimeError(
+                f"{self.path} has schema version {version}, this version only reads up to {self.SCHEMA_VERSION}"
+            )
+
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(jobs)')}
+        if columns and 'job_key' not in columns:
+            self._migrate_url_keyed(columns)
+        else:
+            self.conn.executescript(self.SCHEMA)
+        self.conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+
+    def _migrate_url_keyed(self, columns):
+        """
+        Re-key a version 1 database, whose jobs are unique by canonical URL, by job key
+
+        Links that reduce to the same job key are merged: the earliest
+        first_seen and latest last_seen are kept, times_seen is summed and
+        the details come from the most recently seen row.
+        """
+        start_time = time.time()
+        raw_url = 'raw_url' if 'raw_url' in columns else 'url'
+        rows = self.conn.execute(f'SELECT *, {raw_url} AS link FROM jobs ORDER BY last_seen, id').fetchall()
+
+        merged = {}
+        for row in rows:
+            key = make_job_key(row['link'] or row['url'], platform_key(row['platform'])) or row['url']
+            values = {field: row[field] if field in columns else None for field in self.RECORD_FIELDS}
+            values['url'] = row['link'] or row['url']
+            previous = merged.get(key)
+            if previous:
+                # Rows are ordered by last_seen, so this row's details are the newest
+                for field in self.RECORD_FIELDS:
+                    if values[field] is None:
+                        values[field] = previous[field]
+                values['first_seen'] = min(previous['first_seen'], row['first_seen'])
+                values['times_seen'] = previous['times_seen'] + row['times_seen']
+            else:
+                values['first_seen'] = row['first_seen']
+                values['times_seen'] = row['times_seen']
+            values['last_seen'] = row['last_seen']
+            merged[key] = values
+
+        fields = self.RECORD_FIELDS + ['first_seen', 'last_seen', 'times_seen']
+        insert_sql = (
+            f"INSERT INTO jobs (job_key, {', '.join(fields)}) VALUES ({', '.join('?' * (len(fields) + 1))})"
+        )
+        # executescript commits first, so the swap runs in a transaction opened here
+        try:
+            self.conn.executescript('BEGIN; DROP TABLE jobs;' + self.SCHEMA)
+            self.conn.executemany(
+                insert_sql, ([key] + [values[field] for field in fields] for key, values in merged.items())
+            )
+            self.conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        logging.info(
+            f"Migrated {len(rows)} URL-keyed jobs in {self.path} to {len(merged)} job keys "
+            f"in {time.time() - start_time:.1f}s"
+        )
+
+    def add_job(self, job, platform=None, seen_at=None):
+        """
+        Buffer one job for upserting
+
+        :param job: JobRecord or scraper job dictionary
+        :param platform: Optional platform key for job dictionaries
+        :param seen_at: Optional ISO timestamp, defaults to now (UTC)
+        """
+        record = job if isinstance(job, JobRecord) else JobRecord.from_job_dict(job, platform)
+        if not record.job_key:
+            return
+
+        seen_at = seen_at or _utc_now()
+        row = [record.job_key] + [getattr(record, field) for field in self.RECORD_FIELDS] + [seen_at, seen_at]
+
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def add_jobs(self, jobs, platform=None):
+        """
+        Buffer many jobs for upserting
+
+        :param jobs: JobColumns, or an iterable of JobRecords / scraper job dictionaries
+        :param platform: Optional platform key for job dictionaries
+        """
+        seen_at = _utc_now()
+        if isinstance(jobs, JobColumns):
+            columns = jobs.columns
+            jobs = (
+                JobRecord(**{field: columns[field][i] for field in JobRecord.FIELDS})
+                for i in range(len(jobs))
+            )
+        for job in jobs:
+            self.add_job(job, platform, seen_at)
+
+    def write_page(self, jobs):
+        """
+        Sink interface used by the scrapers: buffer one page of jobs
+        """
+        self.add_jobs(jobs)
+
+    def flush(self):
+        """
+        Commit all buffered jobs in one transaction
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        with self.conn:
+            self.conn.executemany(self._upsert_sql, self._pending)
+        self.jobs_written += len(self._pending)
+        self._pending = []
+
+    def new_since(self, since=None, platform=None):
+        """
+        Jobs first seen at or after a point in time
+
+        :param since: datetime or ISO timestamp, defaults to 24 hours ago
+        :param platform: Optional platform display name, e.g. 'Indeed Malaysia'
+        :return: List of sqlite3.Row
+        """
+        return self._seen_query('first_seen', since, platform)
+
+    def seen_since(self, since=None, platform=None):
+        """
+        Jobs still listed at or after a point in time
+
+        :param since: datetime or ISO timestamp, defaults to 24 hours ago
+        :param platform: Optional platform display name
+        :return: List of sqlite3.Row
+        """
+        return self._seen_query('last_seen', since, platform)
+
+    def _seen_query(self, column, since, platform):
+        self.flush()
+        if since is None:
+            since = datetime.now(timezone.utc) - timedelta(days=1)
+        if isinstance(since, datetime):
+            if since.tzinfo is not None:
+                since = since.astimezone(timezone.utc)
+            since = since.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        sql = f'SELECT * FROM jobs WHERE {column} >= ?'
+        params = [since]
+        if platform:
+            sql += ' AND platform = ?'
+            params.append(platform)
+        return self.conn.execute(sql + f' ORDER BY {column} DESC', params).fetchall()
+
+    def known_keys(self, platform=None):
+        """
+        Job keys of all jobs in the store, for incremental scraping
+
+        :param platform: Optional platform display name, e.g. 'Glassdoor'
+        :return: Set of job keys
+        """
+        self.flush()
+        if platform:
+            rows = self.conn.execute('SELECT job_key FROM jobs WHERE platform = ?', (platform,))
+        else:
+            rows = self.conn.execute('SELECT job_key FROM jobs')
+        return {row[0] for row in rows}
+
+    def count(self):
+        """
+        Number of distinct jobs in the store
+        """
+        self.flush()
+        return self.conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def close(self):
+        """
+        Commit buffered jobs and close the database
+        """
+        if self.conn is None:
+            return
+        self.flush()
+        self.conn.close()
+        self.conn = None
+        logging.info(f"Upserted {self.jobs_written} jobs into {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
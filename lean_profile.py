@@ -0,0 +1,136 @@
+import logging
+
+class LeanProfile:
+    # URL patterns for resource types that are not needed to render job cards
+    IMAGE_PATTERNS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico']
+    FONT_PATTERNS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']
+    MEDIA_PATTERNS = ['*.mp4', '*.webm', '*.mp3', '*.m4a', '*.ogg', '*.mov']
+
+    # Third-party analytics, ads and session recording
+    TRACKER_PATTERNS = [
+        '*google-analytics.com*',
+        '*googletagmanager.com*',
+        '*googlesyndication.com*',
+        '*doubleclick.net*',
+        '*facebook.net*',
+        '*connect.facebook.com*',
+        '*hotjar.com*',
+        '*clarity.ms*',
+        '*bat.bing.com*',
+        '*snap.licdn.com*',
+        '*analytics.tiktok.com*',
+        '*newrelic.com*',
+        '*nr-data.net*',
+        '*segment.io*',
+        '*optimizely.com*'
+    ]
+
+    # Sums transfer sizes of the document and every resource it loaded
+    PAGE_BYTES_SCRIPT = """
+        var entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+        var transferred = 0;
+        var decoded = 0;
+        for (var i = 0; i < entries.length; i++) {
+            transferred += entries[i].transferSize || 0;
+            decoded += entries[i].decodedBodySize || 0;
+        }
+        return {transferred: transferred, decoded: decoded, requests: entries.length};
+    """
+
+    def __init__(self, headless=True, block_images=True, block_fonts=True, block_media=True,
+                 block_trackers=True, extra_blocked_patterns=None, window_size=(1920, 1080)):
+        """
+        Configurable low-bandwidth browser profile for the scrapers
+
+        Resource types are blocked by URL pattern through the CDP Network domain,
+        so no request interception loop is needed on the Selenium side.
+
+        :param headless: Run Chrome with the new headless mode
+        :param block_images: Block image requests and disable image decoding
+        :param block_fonts: Block web font requests
+        :param block_media: Block audio and video requests
+        :param block_trackers: Block known third-party analytics and ad hosts
+        :param extra_blocked_patterns: Optional additional CDP URL patterns to block
+        :param window_size: Viewport size used in headless mode
+        """
+        self.headless = headless
+        self.block_images = block_images
+        self.window_size = window_size
+
+        self.blocked_patterns = []
+        if block_images:
+            self.blocked_patterns += self.IMAGE_PATTERNS
+        if block_fonts:
+            self.blocked_patterns += self.FONT_PATTERNS
+        if block_media:
+            self.blocked_patterns += self.MEDIA_PATTERNS
+        if block_trackers:
+            self.blocked_patterns += self.TRACKER_PATTERNS
+        if extra_blocked_patterns:
+            self.blocked_patterns += list(extra_blocked_patterns)
+
+        # Per-page transfer statistics collected by record_page_bytes
+        self.page_stats = []
+
+    def apply_options(self, chrome_options):
+        """
+        Add the profile's launch arguments to Chrome options
+
+        :param chrome_options: uc.ChromeOptions to modify
+        :return: The same options object
+        """
+        if self.headless:
+            chrome_options.add_argument('--headless=new')
+            chrome_options.add_argument(f'--window-size={self.window_size[0]},{self.window_size[1]}')
+        if self.block_images:
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_argument('--mute-audio')
+        return chrome_options
+
+    def apply(self, driver):
+        """
+        Enable CDP request blocking on a running browser
+
+        :param driver: Selenium WebDriver instance
+        """
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_patterns})
+            logging.info(f"Lean profile blocking {len(self.blocked_patterns)} URL patterns")
+        except Exception as e:
+            logging.warning(f"Could not apply lean profile request blocking: {e}")
+
+    def page_bytes(self, driver):
+        """
+        Measure bytes transferred by the current page
+
+        Cross-origin resources without a Timing-Allow-Origin header report a
+        transfer size of 0, so the figure is a lower bound.
+
+        :param driver: Selenium WebDriver instance
+        :return: Dictionary with transferred bytes, decoded bytes and request count
+        """
+        return driver.execute_script(self.PAGE_BYTES_SCRIPT)
+
+    def record_page_bytes(self, driver, platform, label):
+        """
+        Measure, log and keep the bytes transferred by the current page
+
+        :param driver: Selenium WebDriver instance
+        :param platform: Platform name used in the log line
+        :param label: Page description, e.g. search keyword and page number
+        :return: Dictionary with transferred bytes, decoded bytes and request count
+        """
+        try:
+            stats = self.page_bytes(driver)
+        except Exception as e:
+            logging.warning(f"Could not measure page bytes for {platform} {label}: {e}")
+            return None
+
+        stats.update({'platform': platform, 'page': label})
+        self.page_stats.append(stats)
+        logging.info(
+            f"{platform} {label}: {stats['transferred'] / 1024:.1f} KB transferred "
+            f"in {stats['requests']} requests"
+        )
+        return stats
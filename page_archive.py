@@ -0,0 +1,411 @@
+import os
+import re
+import gzip
+import json
+import hashlib
+import logging
+import argparse
+import threading
+import urllib.parse
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class PageArchive:
+    def __init__(self, archive_dir='page_archive'):
+        """
+        Compressed archive of scraped results pages
+
+        Each page is stored as <archive_dir>/<platform>/<hash>-<time>.html.gz
+        and listed in <archive_dir>/<platform>/index.jsonl together with its
+        URL, search keyword, page number and fetch time. Every platform has
+        its own index, so scrapers running in separate processes never write
+        to the same file.
+
+        :param archive_dir: Root directory of the archive
+        """
+        self.archive_dir = archive_dir
+        self.pages_recorded = 0
+        self._lock = threading.Lock()
+
+    def record(self, html, url, platform, keyword=None, page=None):
+        """
+        Store one results page, logging instead of raising so a full disk never stops a scrape
+
+        :param html: Page HTML
+        :param url: URL the page was fetched from
+        :param platform: Platform key, e.g. 'jobstreet'
+        :param keyword: Search keyword the page belongs to
+        :param page: Optional page number within the search
+        :return: Index entry of the stored page, or None if it could not be stored
+        """
+        try:
+            fetched_at = datetime.now(timezone.utc)
+            platform_dir = os.path.join(self.archive_dir, platform)
+            os.makedirs(platform_dir, exist_ok=True)
+
+            url_hash = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+            filename = f"{url_hash}-{fetched_at.strftime('%Y%m%d%H%M%S%f')}.html.gz"
+            data = html.encode('utf-8')
+            with gzip.open(os.path.join(platform_dir, filename), 'wb') as f:
+                f.write(data)
+
+            entry = {
+                'url': url,
+                'platform': platform,
+                'keyword': keyword,
+                'page': page,
+                'fetched_at': fetched_at.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+                'file': filename,
+                'bytes': len(data)
+            }
+            with self._lock:
+                with open(os.path.join(platform_dir, 'index.jsonl'), 'a', encoding='utf-8') as index:
+                    index.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                self.pages_recorded += 1
+            return entry
+
+        except Exception as e:
+            logging.warning(f"Could not archive {platform} page for {keyword}: {e}")
+            return None
+
+    def record_page(self, driver, platform, keyword=None, page=None):
+        """
+        Store the page currently shown in a browser
+
+        :param driver: Selenium WebDriver instance
+        :param platform: Platform key, e.g. 'jobstreet'
+        :param keyword: Search keyword the page belongs to
+        :param page: Optional page number within the search
+        :return: Index entry of the stored page, or None if it could not be stored
+        """
+        try:
+            html, url = driver.page_source, driver.current_url
+        except Exception as e:
+            logging.warning(f"Could not read {platform} page for {keyword}: {e}")
+            return None
+        return self.record(html, url, platform, keyword, page)
+
+    def entries(self, platforms=None):
+        """
+        Iterate over the index entries of the archive
+
+        :param platforms: Optional platform keys to include
+        :return: Generator of index entry dictionaries
+        """
+        if not os.path.isdir(self.archive_dir):
+            return
+        for platform in sorted(os.listdir(self.archive_dir)):
+            if platforms and platform not in platforms:
+                continue
+            index_path = os.path.join(self.archive_dir, platform, 'index.jsonl')
+            if not os.path.exists(index_path):
+                continue
+            with open(index_path, encoding='utf-8') as index:
+                for line in index:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def read(self, entry):
+        """
+        HTML of an archived page
+
+        :param entry: Index entry from entries()
+        :return: Page HTML
+        """
+        with gzip.open(os.path.join(self.archive_dir, entry['platform'], entry['file']), 'rb') as f:
+            return f.read().decode('utf-8')
+
+class ReplayServer:
+    # Scripts would re-render archived pages and call the live sites
+    SCRIPT_PATTERN = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+
+    def __init__(self, archive, host='127.0.0.1', port=0, platforms=None, strip_scripts=True):
+        """
+        Local HTTP stand-in that serves archived pages to the unchanged scrapers
+
+        A live URL such as https://my.jobstreet.com/ux-jobs?page=2 is served at
+        http://127.0.0.1:<port>/my.jobstreet.com/ux-jobs?page=2. Browsers set
+        up with setup_driver() have driver.get() rewritten to those local URLs
+        and every other host blocked. Relative links inside archived pages,
+        such as JobStreet's next-page anchors, are matched by path and query.
+        The latest fetch of each URL is served.
+
+        :param archive: PageArchive to serve
+        :param host: Interface to listen on
+        :param port: Port to listen on, 0 picks a free one
+        :param platforms: Optional platform keys to serve
+        :param strip_scripts: Remove <script> elements so pages stay as archived
+        """
+        self.archive = archive
+        self.strip_scripts = strip_scripts
+        self.requests_served = 0
+        self.requests_missed = 0
+
+        self._by_url = {}
+        self._by_path = {}
+        hosts = set()
+        for entry in archive.entries(platforms):
+            parts = urllib.parse.urlsplit(entry['url'])
+            self._by_url[self.url_key(parts.netloc, parts.path, parts.query)] = entry
+            self._by_path[self.url_key('', parts.path, parts.query)] = entry
+            hosts.add(parts.netloc)
+        # Absolute links to archived hosts are pointed at the replay server
+        self._host_pattern = re.compile(
+            r'https?://(' + '|'.join(re.escape(host) for host in sorted(hosts, key=len, reverse=True)) + r')(?=[/"\'?#])'
+        ) if hosts else None
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, format, *args):
+                logging.debug(f"Replay server: {format % args}")
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = None
+        logging.info(f"Replay server indexed {len(self._by_url)} archived pages")
+
+    @staticmethod
+    def url_key(netloc, path, query):
+        query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(query, keep_blank_values=True)))
+        return f"{netloc.lower()}{path.rstrip('/') or '/'}?{query}"
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def local_url(self, url):
+        """
+        Local URL serving the archived copy of a live URL
+
+        :param url: Live URL as used by the scrapers
+        :return: URL on the replay server
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ('http', 'https') or url.startswith(self.base_url):
+            # about:blank, data: URLs and pages already on the replay server
+            return url
+        local = f"{self.base_url}/{parts.netloc}{parts.path or '/'}"
+        return f"{local}?{parts.query}" if parts.query else local
+
+    def lookup(self, request_path):
+        """
+        Archived entry for a request path, or None
+        """
+        parts = urllib.parse.urlsplit(request_path)
+        first, _, rest = parts.path.lstrip('/').partition('/')
+        if '.' in first:
+            entry = self._by_url.get(self.url_key(first, '/' + rest, parts.query))
+            if entry:
+                return entry
+            # Same page archived under another host name, e.g. with or without www
+            return self._by_path.get(self.url_key('', '/' + rest, parts.query))
+        return self._by_path.get(self.url_key('', parts.path, parts.query))
+
+    def handle(self, request):
+        entry = self.lookup(request.path)
+        if entry is None:
+            self.requests_missed += 1
+            request.send_error(404, "Page not in archive")
+            return
+
+        html = self.archive.read(entry)
+        if self.strip_scripts:
+            html = self.SCRIPT_PATTERN.sub('', html)
+        if self._host_pattern:
+            html = self._host_pattern.sub(lambda match: f"{self.base_url}/{match.group(1)}", html)
+        body = html.encode('utf-8')
+
+        request.send_response(200)
+        request.send_header('Content-Type', 'text/html; charset=utf-8')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+        self.requests_served += 1
+
+    def chrome_arguments(self):
+        """
+        Chrome arguments that resolve every host except the replay server to nothing
+        """
+        return [f'--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE {self.host}']
+
+    def setup_options(self, chrome_options):
+        """
+        Add the offline arguments to Chrome options
+
+        :param chrome_options: uc.ChromeOptions to modify
+        :return: The same options object
+        """
+        for argument in self.chrome_arguments():
+            chrome_options.add_argument(argument)
+        return chrome_options
+
+    def setup_driver(self, driver):
+        """
+        Route driver.get() of live URLs to the archived copies
+
+        :param driver: Selenium WebDriver instance
+        :return: The same driver
+        """
+        live_get = driver.get
+        driver.get = lambda url: live_get(self.local_url(url))
+        return driver
+
+    def start(self):
+        """
+        Serve in a background thread
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logging.info(f"Replaying archived pages at {self.base_url}")
+        return self
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        logging.info(f"Replay server served {self.requests_served} pages, {self.requests_missed} not archived")
+
+def replay(archive_dir, platforms, output, chromedriver_path=None, headless=True):
+    """
+    Re-run the scrapers against the archive without network access
+
+    :param archive_dir: Root directory of the archive
+    :param platforms: Platform keys to replay
+    :param output: JSON Lines file the replayed jobs are written to
+    :param chromedriver_path: Optional ChromeDriver executable
+    :param headless: Run Chrome headless
+    """
+    from browser_pool import BrowserPool
+    from job_sink import JsonlJobSink
+    from lean_profile import LeanProfile
+
+    archive = PageArchive(archive_dir)
+    server = ReplayServer(archive, platforms=platforms).start()
+
+    def options_factory():
+        return server.setup_options(BrowserPool.default_options())
+
+    pool = BrowserPool(
+        size=1,
+        chromedriver_path=chromedriver_path,
+        options_factory=options_factory,
+        lean_profile=LeanProfile(headless=headless, block_trackers=False),
+        driver_setup=server.setup_driver
+    )
+    sink = JsonlJobSink(output)
+
+    try:
+        for platform in platforms:
+            logging.info(f"Replaying {platform}")
+            if platform == 'indeed':
+                from indeed_malaysia import IndeedScraper
+                scraper = IndeedScraper(browser_pool=pool, sink=sink)
+
+                # Archived pages need no human verification, so skip straight to extraction.
+                # The HTTP path archives every results page under its own start= URL, which
+                # differs from the search URL, so load the archived URLs themselves.
+                def run(scraper=scraper):
+                    seen_urls = set()
+                    for entry in archive.entries(['indeed']):
+                        if entry['url'] in seen_urls:
+                            continue
+                        seen_urls.add(entry['url'])
+                        scraper.driver.get(entry['url'])
+                        scraper.collect_jobs([], scraper.extract_job_details(entry.get('keyword') or ''))
+            elif platform == 'glassdoor':
+                from GlassDoor_malaysia import GlassdoorScraper
+                scraper = GlassdoorScraper(browser_pool=pool, sink=sink)
+                run = scraper.scrape_jobs
+            elif platform == 'hiredly':
+                from hiredly_malaysia import HireldyScraper
+                scraper = HireldyScraper(browser_pool=pool, sink=sink)
+                run = scraper.scrape_jobs
+            else:
+                from JobStreet_malaysia import JobStreetScraper
+                scraper = JobStreetScraper(browser_pool=pool, sink=sink)
+                run = scraper.scrape_jobs
+
+            try:
+                run()
+            except Exception as e:
+                logging.error(f"Replay of {platform} failed: {e}")
+            finally:
+                scraper.close()
+    finally:
+        sink.close()
+        pool.close()
+        server.close()
+
+def compare(old_path, new_path):
+    """
+    Compare the jobs of two runs, e.g. replays of the same archive with two code versions
+
+    :param old_path: JSON Lines file of the first run
+    :param new_path: JSON Lines file of the second run
+    :return: Dictionary with counts of added, removed and changed jobs
+    """
+    from job_record import JobRecord
+    from job_sink import read_jobs
+
+    def by_key(path):
+        jobs = {}
+        for job in read_jobs(path):
+            record = JobRecord.from_job_dict(job)
+            jobs[record.job_key or record.url] = record.to_dict()
+        return jobs
+
+    old_jobs, new_jobs = by_key(old_path), by_key(new_path)
+    changed = {}
+    for key in old_jobs.keys() & new_jobs.keys():
+        for field, value in old_jobs[key].items():
+            if new_jobs[key][field] != value:
+                changed[field] = changed.get(field, 0) + 1
+
+    return {
+        'old_jobs': len(old_jobs),
+        'new_jobs': len(new_jobs),
+        'added': len(new_jobs.keys() - old_jobs.keys()),
+        'removed': len(old_jobs.keys() - new_jobs.keys()),
+        'changed_fields': changed
+    }
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
+
+    parser = argparse.ArgumentParser(description="Replay archived results pages through the scrapers")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    replay_parser = subparsers.add_parser('replay', help="Run the scrapers against the archive")
+    replay_parser.add_argument('--archive', default='page_archive', help="Archive directory")
+    replay_parser.add_argument('--platforms', nargs='+', default=['indeed', 'glassdoor', 'hiredly', 'jobstreet'],
+                               choices=['indeed', 'glassdoor', 'hiredly', 'jobstreet'])
+    replay_parser.add_argument('--output', default=f"replay_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz")
+    replay_parser.add_argument('--chromedriver', default=None, help="Path to ChromeDriver executable")
+    replay_parser.add_argument('--headed', action='store_true', help="Show the browser window")
+
+    serve_parser = subparsers.add_parser('serve', help="Only serve the archive")
+    serve_parser.add_argument('--archive', default='page_archive', help="Archive directory")
+    serve_parser.add_argument('--port', type=int, default=8765)
+
+    compare_parser = subparsers.add_parser('compare', help="Compare the jobs of two runs")
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+
+    args = parser.parse_args()
+
+    if args.command == 'replay':
+        replay(args.archive, args.platforms, args.output, args.chromedriver, headless=not args.headed)
+    elif args.command == 'serve':
+        server = ReplayServer(PageArchive(args.archive), port=args.port)
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            server.close()
+    else:
+        print(json.dumps(compare(args.old, args.new), indent=2))
+
+if __name__ == "__main__":
+    main()
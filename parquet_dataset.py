@@ -0,0 +1,152 @@
+import uuid
+import logging
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+from job_record import JobColumns, JobRecord, platform_key
+from posted_date_normalizer import normalize_posted_dates
+
+# Hive-style directory levels: <base_dir>/platform=<key>/scrape_date=<YYYY-MM-DD>/
+PARTITION_FIELDS = ('platform', 'scrape_date')
+
+PARTITION_SCHEMA = pa.schema([
+    ('platform', pa.string()),
+    ('scrape_date', pa.string())
+])
+
+def _file_schema():
+    """
+    Column schema of every data file, shared by all four scrapers
+    """
+    fields = []
+    for field in JobRecord.FIELDS:
+        if field in PARTITION_FIELDS:
+            continue
+        if field in JobColumns.CATEGORICAL_FIELDS:
+            fields.append(pa.field(field, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(field, pa.string()))
+    fields.append(pa.field('scraped_at', pa.timestamp('us', tz='UTC')))
+    # Absolute posting time derived from the relative posted_date text
+    fields.append(pa.field('posted_at', pa.timestamp('us', tz='UTC')))
+    fields.append(pa.field('posted_open_ended', pa.bool_()))
+    return pa.schema(fields)
+
+FILE_SCHEMA = _file_schema()
+
+# Full schema as seen by readers, partition columns included
+DATASET_SCHEMA = pa.unify_schemas([FILE_SCHEMA, PARTITION_SCHEMA])
+
+def _as_columns(jobs):
+    if isinstance(jobs, JobColumns):
+        return jobs
+    columns = JobColumns()
+    columns.extend(jobs)
+    return columns
+
+def write_jobs_parquet(jobs, base_dir='parquet_output', platform=None, scraped_at=None):
+    """
+    Append jobs to the Parquet dataset, partitioned by platform and scrape date
+
+    Each call adds new files to the matching partition directories, so
+    repeated runs on the same day never overwrite each other.
+
+    :param jobs: JobColumns, or an iterable of JobRecords / scraper job dictionaries
+    :param base_dir: Root directory of the dataset
+    :param platform: Optional platform key; detected per job from its platform value when omitted
+    :param scraped_at: Optional scrape time, defaults to now (UTC)
+    :return: Number of rows written
+    """
+    columns = _as_columns(jobs)
+    rows = len(columns)
+    if not rows:
+        logging.info("No jobs to write to the Parquet dataset")
+        return 0
+
+    scraped_at = scraped_at or datetime.now(timezone.utc)
+    if scraped_at.tzinfo is None:
+        scraped_at = scraped_at.replace(tzinfo=timezone.utc)
+    scraped_at = scraped_at.astimezone(timezone.utc)
+
+    posted = normalize_posted_dates(columns.columns['posted_date'], scraped_at)
+
+    data = {}
+    for field in FILE_SCHEMA.names:
+        if field == 'scraped_at':
+            data[field] = pa.array([scraped_at] * rows, type=FILE_SCHEMA.field(field).type)
+        elif field in posted:
+            data[field] = pa.Array.from_pandas(posted[field], type=FILE_SCHEMA.field(field).type)
+        else:
+            array = pa.array(columns.columns[field], type=pa.string())
+            if field in JobColumns.CATEGORICAL_FIELDS:
+                array = array.dictionary_encode()
+            data[field] = array
+
+    # Partition on the short platform key rather than the display name
+    platform_keys = [platform or platform_key(value) or 'unknown' for value in columns.columns['platform']]
+    data['platform'] = pa.array(platform_keys, type=pa.string())
+    data['scrape_date'] = pa.array([scraped_at.strftime('%Y-%m-%d')] * rows, type=pa.string())
+
+    table = pa.table(data, schema=pa.schema(list(FILE_SCHEMA) + list(PARTITION_SCHEMA)))
+
+    pq.write_to_dataset(
+        table,
+        base_dir,
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+        basename_template=f"{scraped_at.strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore'
+    )
+
+    logging.info(f"Wrote {rows} jobs to Parquet dataset {base_dir}")
+    return rows
+
+def open_jobs_dataset(base_dir='parquet_output'):
+    """
+    Open the Parquet dataset with memory-mapped file access
+
+    :param base_dir: Root directory of the dataset
+    :return: pyarrow.dataset.Dataset
+    """
+    return ds.dataset(
+        base_dir,
+        schema=DATASET_SCHEMA,
+        format='parquet',
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+        filesystem=fs.LocalFileSystem(use_mmap=True)
+    )
+
+def read_jobs_parquet(base_dir='parquet_output', platforms=None, since=None, until=None,
+                      columns=None, filter=None):
+    """
+    Read jobs from the Parquet dataset, skipping partitions outside the filters
+
+    Platform and date filters are evaluated against the directory names, so
+    files of other platforms and days are never opened.
+
+    :param base_dir: Root directory of the dataset
+    :param platforms: Optional platform keys to read, e.g. ['indeed', 'hiredly']
+    :param since: Optional first scrape date, as a date or 'YYYY-MM-DD'
+    :param until: Optional last scrape date (inclusive), as a date or 'YYYY-MM-DD'
+    :param columns: Optional column names to read
+    :param filter: Optional additional pyarrow.dataset expression
+    :return: pyarrow.Table
+    """
+    expression = None
+
+    def combine(condition):
+        return condition if expression is None else expression & condition
+
+    if platforms:
+        expression = combine(ds.field('platform').isin([platform_key(p) or p for p in platforms]))
+    if since:
+        expression = combine(ds.field('scrape_date') >= str(since)[:10])
+    if until:
+        expression = combine(ds.field('scrape_date') <= str(until)[:10])
+    if filter is not None:
+        expression = combine(filter)
+
+    return open_jobs_dataset(base_dir).to_table(columns=columns, filter=expression)
@@ -0,0 +1,226 @@
+import os
+import json
+import math
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Phases every scraper reports, in crawl order
+DRIVER_START = 'driver_start'
+NAVIGATION = 'navigation'
+WAIT_SCROLL = 'wait_scroll'
+POPUPS = 'popups'
+EXTRACTION = 'extraction'
+EXPORT = 'export'
+PHASES = (DRIVER_START, NAVIGATION, WAIT_SCROLL, POPUPS, EXTRACTION, EXPORT)
+
+def percentile(samples, fraction):
+    """
+    Nearest-rank percentile of a list of numbers
+
+    :param samples: Numbers to rank
+    :param fraction: Percentile as a fraction, e.g. 0.95
+    :return: The percentile, or None for no samples
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class PhaseTimer:
+    def __init__(self, enabled=True):
+        """
+        Collect timed spans of the crawl phases, tagged by platform, search and page
+
+        A disabled timer records nothing, so scrapers can always time their
+        phases without checking whether metrics were requested.
+
+        :param enabled: Record spans; False makes every span a no-op
+        """
+        self.enabled = enabled
+        self.spans = []
+        self.started_at = datetime.now(timezone.utc)
+        self._start_time = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, phase, platform, search=None, page=None):
+        """
+        Time the enclosed block as one span
+
+        :param phase: One of PHASES
+        :param platform: Platform key, e.g. 'jobstreet'
+        :param search: Optional search keyword
+        :param page: Optional page number within the search
+        """
+        if not self.enabled:
+            yield
+            return
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, platform, time.perf_counter() - start_time, search, page)
+
+    def add(self, phase, platform, seconds, search=None, page=None):
+        """
+        Record a span measured elsewhere
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.spans.append({
+                'phase': phase,
+                'platform': platform,
+                'search': search,
+                'page': page,
+                'seconds': round(seconds, 6)
+            })
+
+    def extend(self, spans):
+        """
+        Merge spans collected by another timer, e.g. in a worker process
+
+        :param spans: List of span dictionaries from PhaseTimer.spans
+        """
+        with self._lock:
+            self.spans.extend(spans)
+
+    def summary(self):
+        """
+        Aggregate the spans per platform and phase, and per search
+
+        :return: Dictionary ready to be written as JSON
+        """
+        with self._lock:
+            spans = list(self.spans)
+
+        by_phase = {}
+        by_search = {}
+        for span in spans:
+            by_phase.setdefault((span['platform'], span['phase']), []).append(span['seconds'])
+            if span['search'] is not None:
+                totals = by_search.setdefault((span['platform'], span['search']), {})
+                totals[span['phase']] = totals.get(span['phase'], 0.0) + span['seconds']
+
+        def phase_order(key):
+            platform, phase = key
+            return (platform, PHASES.index(phase) if phase in PHASES else len(PHASES), phase)
+
+        phases = []
+        for platform, phase in sorted(by_phase, key=phase_order):
+            samples = by_phase[(platform, phase)]
+            phases.append({
+                'platform': platform,
+                'phase': phase,
+                'count': len(samples),
+                'total_seconds': round(sum(samples), 3),
+                'mean_seconds': round(sum(samples) / len(samples), 4),
+                'p50_seconds': round(percentile(samples, 0.5), 4),
+                'p95_seconds': round(percentile(samples, 0.95), 4),
+                'max_seconds': round(max(samples), 4)
+            })
+
+        searches = [
+            {
+                'platform': platform,
+                'search': search,
+                'phase_seconds': {phase: round(seconds, 3) for phase, seconds in totals.items()}
+            }
+            for (platform, search), totals in sorted(by_search.items(), key=lambda item: (item[0][0], str(item[0][1])))
+        ]
+
+        return {
+            'run_started_at': self.started_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'wall_seconds': round(time.perf_counter() - self._start_time, 3),
+            'span_count': len(spans),
+            'phases': phases,
+            'searches': searches
+        }
+
+    def prometheus_text(self, summary=None, name='scraper'):
+        """
+        Render the per-phase aggregates in the Prometheus text exposition format
+
+        Every series carries a run label with the file name prefix, since a
+        textfile collector merges all *.prom files in the directory and the
+        combined run repeats the per-platform phases. Search and page stay
+        out of the labels to keep series counts small; they are in the JSON
+        summary.
+
+        :param summary: Optional result of summary() to render
+        :param name: Value of the run label, e.g. the platform key
+        :return: Text for a node_exporter textfile collector or a push gateway
+        """
+        summary = summary or self.summary()
+        run = f'run="{_label_value(name)}"'
+        lines = [
+            '# HELP scraper_phase_seconds Time spent per crawl phase.',
+            '# TYPE scraper_phase_seconds summary'
+        ]
+        for row in summary['phases']:
+            labels = f'{run},platform="{_label_value(row["platform"])}",phase="{_label_value(row["phase"])}"'
+            lines.append(f'scraper_phase_seconds{{{labels},quantile="0.5"}} {row["p50_seconds"]}')
+            lines.append(f'scraper_phase_seconds{{{labels},quantile="0.95"}} {row["p95_seconds"]}')
+            lines.append(f'scraper_phase_seconds_sum{{{labels}}} {row["total_seconds"]}')
+            lines.append(f'scraper_phase_seconds_count{{{labels}}} {row["count"]}')
+
+        lines += [
+            '# HELP scraper_phase_max_seconds Longest single span per crawl phase.',
+            '# TYPE scraper_phase_max_seconds gauge'
+        ]
+        for row in summary['phases']:
+            labels = f'{run},platform="{_label_value(row["platform"])}",phase="{_label_value(row["phase"])}"'
+            lines.append(f'scraper_phase_max_seconds{{{labels}}} {row["max_seconds"]}')
+
+        lines += [
+            '# HELP scraper_run_wall_seconds Wall time of the run.',
+            '# TYPE scraper_run_wall_seconds gauge',
+            f'scraper_run_wall_seconds{{{run}}} {summary["wall_seconds"]}',
+            '# HELP scraper_run_timestamp_seconds Unix time the run started.',
+            '# TYPE scraper_run_timestamp_seconds gauge',
+            f'scraper_run_timestamp_seconds{{{run}}} {int(self.started_at.timestamp())}'
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def write(self, output_dir='metrics_output', name='scraper'):
+        """
+        Write the JSON summary and the Prometheus text file of the run
+
+        The JSON summary is kept per run. The Prometheus file has a stable
+        name that every run overwrites: a textfile collector reads every
+        *.prom file in the directory, and one file per run would expose the
+        same series several times.
+
+        :param output_dir: Directory for both files
+        :param name: File name prefix, e.g. the platform key
+        :return: Tuple of (JSON path, Prometheus path), or None when disabled
+        """
+        if not self.enabled:
+            return None
+
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = self.started_at.strftime('%Y%m%d_%H%M%S')
+        json_path = os.path.join(output_dir, f'{name}_metrics_{timestamp}.json')
+        prom_path = os.path.join(output_dir, f'{name}_metrics.prom')
+
+        summary = self.summary()
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        # Write then rename so a textfile collector never reads a partial file
+        with open(prom_path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text(summary, name))
+        os.replace(prom_path + '.tmp', prom_path)
+
+        for row in summary['phases']:
+            logging.info(
+                f"{row['platform']} {row['phase']}: {row['total_seconds']}s over {row['count']} spans "
+                f"(p95 {row['p95_seconds']}s)"
+            )
+        logging.info(f"Run metrics saved to {json_path} and {prom_path}")
+        return json_path, prom_path
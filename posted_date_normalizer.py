@@ -0,0 +1,140 @@
+import logging
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from text_columns import contains, extract_groups, parse_distinct, to_arrow
+
+# '3d ago', '30d+ ago', '5h ago', 'Posted 2 weeks ago', 'a month ago', '30+ days ago'
+# The amount must start a word and 'a'/'an'/'one' must be whole words, so the 'ay' of
+# 'May' or 'Friday' is not '1 y'; every unit must end a word, so '2 Dec' is not '2 d'
+RELATIVE_PATTERN = (
+    r'\b(?P<amount>\d+|(?:an?|one)\b)\s*(?P<plus_before>\+)?\s*'
+    r'(?P<unit>months?\b|mos?\b|minutes?\b|mins?\b|m\b|hours?\b|hrs?\b|h\b|days?\b|d\b|weeks?\b|wks?\b|w\b'
+    r'|years?\b|yrs?\b|y\b)'
+    r'(?P<plus_after>\+)?'
+)
+TODAY_PATTERN = r'\b(?:today|just posted|just now|new)\b'
+YESTERDAY_PATTERN = r'\byesterday\b'
+
+# Absolute dates: 'Posted on 12 Jan 2025' loses its label, '2024-05-01' is year first
+POSTED_PREFIX_PATTERN = r'(?i)^\s*(?:posted|listed|updated)(?:\s+on)?\s*:?\s*'
+ISO_DATE_PATTERN = r'\s*\d{4}-\d{1,2}-\d{1,2}'
+
+UNIT_SECONDS = {
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400,
+    'week': 7 * 86400,
+    'month': 30 * 86400,
+    'year': 365 * 86400
+}
+UNIT_NAMES = {
+    'month': 'month', 'months': 'month', 'mo': 'month', 'mos': 'month',
+    'minute': 'minute', 'minutes': 'minute', 'min': 'minute', 'mins': 'minute', 'm': 'minute',
+    'hour': 'hour', 'hours': 'hour', 'hr': 'hour', 'hrs': 'hour', 'h': 'hour',
+    'day': 'day', 'days': 'day', 'd': 'day',
+    'week': 'week', 'weeks': 'week', 'wk': 'week', 'wks': 'week', 'w': 'week',
+    'year': 'year', 'years': 'year', 'yr': 'year', 'yrs': 'year', 'y': 'year'
+}
+
+POSTED_COLUMNS = ['posted_age_seconds', 'posted_open_ended']
+
+def _parse_unique(text):
+    """
+    Age in seconds and open-ended flag of distinct posted-date strings
+
+    :param text: Series of distinct lowercased posted-date strings
+    :return: DataFrame with POSTED_COLUMNS, aligned with text
+    """
+    arrow = to_arrow(text)
+
+    relative = extract_groups(text, RELATIVE_PATTERN, arrow)
+    amount = relative['amount'].replace({'a': '1', 'an': '1', 'one': '1'}).astype(float)
+    unit_seconds = relative['unit'].map(UNIT_NAMES).map(UNIT_SECONDS).astype(float)
+    age = amount * unit_seconds
+
+    age = age.where(~contains(text, TODAY_PATTERN, arrow), 0.0)
+    age = age.where(~contains(text, YESTERDAY_PATTERN, arrow), float(UNIT_SECONDS['day']))
+
+    open_ended = (relative['plus_before'].notna() | relative['plus_after'].notna()) & age.notna()
+
+    return pd.DataFrame({
+        'posted_age_seconds': age,
+        'posted_open_ended': open_ended
+    })
+
+def _absolute_dates(values, missing):
+    """
+    Fallback for postings that show an absolute date instead of an age
+
+    ISO dates ('2024-05-01') are read year-month-day; only other formats
+    such as '01/05/2024' or '01.05.2024' are read day first.
+    """
+    dates = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns, UTC]')
+    candidates = values[missing & values.notna()].astype(str).str.replace(POSTED_PREFIX_PATTERN, '', regex=True)
+    if len(candidates):
+        iso = candidates.str.match(ISO_DATE_PATTERN)
+        for subset, dayfirst in ((candidates[iso], False), (candidates[~iso], True)):
+            if len(subset):
+                parsed = pd.to_datetime(subset, errors='coerce', utc=True, format='mixed', dayfirst=dayfirst)
+                dates.loc[parsed.index] = parsed
+    return dates
+
+def normalize_posted_dates(posted_dates, scraped_at=None):
+    """
+    Convert relative posted dates into absolute UTC timestamps
+
+    Each distinct string is parsed once with vectorized column-wide regex
+    operations. The ages are then subtracted from the scrape time of every
+    row. Open-ended values such as '30+ days ago' or '30d+ ago' give the
+    latest possible posting time and set posted_open_ended, meaning the
+    posting is at least that old.
+
+    :param posted_dates: Iterable or Series of raw posted-date text
+    :param scraped_at: Scrape time as a datetime, or one per row; defaults to now
+    :return: DataFrame with posted_at (UTC) and posted_open_ended, one row per input
+    """
+    start_time = time.time()
+    raw = posted_dates if isinstance(posted_dates, pd.Series) else pd.Series(list(posted_dates), dtype=object)
+    parsed, distinct = parse_distinct(raw, _parse_unique, POSTED_COLUMNS)
+
+    if scraped_at is None:
+        scraped_at = datetime.now(timezone.utc)
+    if isinstance(scraped_at, datetime):
+        reference = pd.Series(pd.Timestamp(scraped_at), index=raw.index)
+    else:
+        reference = pd.Series(list(scraped_at), index=raw.index)
+    reference = pd.to_datetime(reference, utc=True)
+
+    age = pd.to_timedelta(parsed['posted_age_seconds'].astype(float), unit='s')
+    posted_at = reference - age
+
+    missing = posted_at.isna()
+    if missing.any():
+        posted_at = posted_at.where(~missing, _absolute_dates(raw, missing))
+
+    open_ended = parsed['posted_open_ended'].fillna(False).astype(bool)
+
+    logging.info(
+        f"Normalized {len(raw)} posted dates ({distinct} distinct) in {time.time() - start_time:.2f}s"
+    )
+    return pd.DataFrame({'posted_at': posted_at, 'posted_open_ended': open_ended}, index=raw.index)
+
+def add_posted_date_columns(df, column='posted_date', scraped_at=None):
+    """
+    Add posted_at and posted_open_ended columns next to the raw posted-date text
+
+    :param df: pandas DataFrame of postings
+    :param column: Column holding the raw posted-date text, kept unchanged
+    :param scraped_at: Scrape time as a datetime, or a column name / sequence with one per row
+    :return: The same DataFrame
+    """
+    if isinstance(scraped_at, str):
+        scraped_at = df[scraped_at]
+    parsed = normalize_posted_dates(df[column], scraped_at)
+    # Assign by index so the UTC timezone is kept
+    df['posted_at'] = parsed['posted_at']
+    df['posted_open_ended'] = parsed['posted_open_ended']
+    return df
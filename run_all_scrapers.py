@@ -0,0 +1,425 @@
+import os
+import time
+import logging
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from job_record import JobColumns
+from job_dedup import add_cluster_ids
+from salary_normalizer import add_salary_columns
+from posted_date_normalizer import add_posted_date_columns
+from job_sink import JsonlJobSink, read_jobs
+from phase_timer import PhaseTimer, EXPORT
+from webdriver_profiler import WebDriverProfiler
+
+DEFAULT_CHROMEDRIVER_PATH = r'C:\Users\numan\Downloads\chromedriver-win64\chromedriver-win64\chromedriver.exe'
+
+# Column headers of the combined output, keyed by JobRecord field
+COMBINED_COLUMN_NAMES = {
+    'platform': 'Platform',
+    'title': 'Job Title',
+    'company': 'Company',
+    'location': 'Location',
+    'salary': 'Salary',
+    'salary_min': 'Salary Min',
+    'salary_max': 'Salary Max',
+    'currency': 'Currency',
+    'period': 'Salary Period',
+    'posted_date': 'Posted Date',
+    'posted_at': 'Posted At (UTC)',
+    'posted_open_ended': 'Posted Open Ended',
+    'job_type': 'Job Type',
+    'easy_apply': 'Easy Apply',
+    'url': 'URL',
+    'search_keyword': 'Search Keyword',
+    'job_key': 'Job Key',
+    'cluster_id': 'Cluster ID'
+}
+
+def configure_logging():
+    """
+    Log to the console and run_all_scrapers.log
+
+    Called by main() and in every worker process rather than at import, so
+    importing this module (e.g. for combine_jobs) does not create the log file.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s: %(message)s',
+        handlers=[
+            logging.FileHandler('run_all_scrapers.log'),
+            logging.StreamHandler()
+        ]
+    )
+
+def make_lean_profile(config):
+    """
+    Build the lean browser profile requested on the command line, if any
+
+    :param config: Orchestrator settings
+    :return: LeanProfile or None
+    """
+    if not config.get('lean'):
+        return None
+
+    from lean_profile import LeanProfile
+    return LeanProfile(headless=config.get('headless', True))
+
+def make_page_archive(config):
+    """
+    Open the results page archive requested on the command line, if any
+
+    :param config: Orchestrator settings
+    :return: PageArchive or None
+    """
+    if not config.get('archive_dir'):
+        return None
+
+    from page_archive import PageArchive
+    return PageArchive(config['archive_dir'])
+
+def make_sink(platform, config):
+    """
+    Open the JSON Lines file a platform streams its jobs to, if requested
+
+    :param platform: Platform name, a key of PLATFORM_RUNNERS
+    :param config: Orchestrator settings
+    :return: JsonlJobSink or None
+    """
+    if not config.get('jsonl_dir'):
+        return None
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return JsonlJobSink(os.path.join(config['jsonl_dir'], f'{platform}_jobs_{timestamp}.jsonl.gz'))
+
+def run_indeed(config, sink=None, timer=None, profiler=None):
+    """
+    Run the Indeed scraper in the current process
+
+    :param config: Orchestrator settings
+    :param sink: Optional JsonlJobSink the scraper streams to
+    :param timer: Optional PhaseTimer the scraper records its phase spans in
+    :param profiler: Optional WebDriverProfiler attached to the scraper's browser
+    :return: List of job dictionaries (empty when streaming to a sink)
+    """
+    from indeed_malaysia import IndeedScraper
+
+    scraper = IndeedScraper(
+        existing_browser_port=config.get('indeed_port'),
+        use_http=True,
+        lean_profile=make_lean_profile(config),
+        sink=sink,
+        page_archive=make_page_archive(config),
+        timer=timer,
+        profiler=profiler
+    )
+    try:
+        return scraper.scrape_job_listings()
+    finally:
+        scraper.close()
+
+def run_glassdoor(config, sink=None, timer=None, profiler=None):
+    """
+    Run the Glassdoor scraper in the current process
+
+    :param config: Orchestrator settings
+    :param sink: Optional JsonlJobSink the scraper streams to
+    :param timer: Optional PhaseTimer the scraper records its phase spans in
+    :param profiler: Optional WebDriverProfiler attached to the scraper's browser
+    :return: List of job dictionaries (empty when streaming to a sink)
+    """
+    from GlassDoor_malaysia import GlassdoorScraper
+
+    known_job_keys = None
+    if config.get('db') and config.get('stop_after_known'):
+        from job_store import JobStore
+        with JobStore(config['db']) as store:
+            known_job_keys = store.known_keys('Glassdoor')
+
+    scraper = GlassdoorScraper(
+        config['chromedriver_path'],
+        lean_profile=make_lean_profile(config),
+        sink=sink,
+        known_job_keys=known_job_keys,
+        stop_after_known=config.get('stop_after_known') or 10,
+        page_archive=make_page_archive(config),
+        timer=timer,
+        profiler=profiler
+    )
+    try:
+        return scraper.scrape_jobs()
+    finally:
+        scraper.close()
+
+def run_hiredly(config, sink=None, timer=None, profiler=None):
+    """
+    Run the Hiredly scraper in the current process
+
+    :param config: Orchestrator settings
+    :param sink: Optional JsonlJobSink the scraper streams to
+    :param timer: Optional PhaseTimer the scraper records its phase spans in
+    :param profiler: Optional WebDriverProfiler attached to the scraper's browser
+    :return: List of job dictionaries (empty when streaming to a sink)
+    """
+    from hiredly_malaysia import HireldyScraper
+
+    scraper = HireldyScraper(
+        config['chromedriver_path'],
+        lean_profile=make_lean_profile(config),
+        sink=sink,
+        page_archive=make_page_archive(config),
+        timer=timer,
+        profiler=profiler
+    )
+    try:
+        return scraper.scrape_jobs()
+    finally:
+        scraper.close()
+
+def run_jobstreet(config, sink=None, timer=None, profiler=None):
+    """
+    Run the JobStreet scraper in the current process
+
+    :param config: Orchestrator settings
+    :param sink: Optional JsonlJobSink the scraper streams to
+    :param timer: Optional PhaseTimer the scraper records its phase spans in
+    :param profiler: Optional WebDriverProfiler attached to the scraper's browser
+    :return: List of job dictionaries (empty when streaming to a sink)
+    """
+    from JobStreet_malaysia import JobStreetScraper
+
+    scraper = JobStreetScraper(
+        config['chromedriver_path'],
+        lean_profile=make_lean_profile(config),
+        sink=sink,
+        page_archive=make_page_archive(config),
+        timer=timer,
+        profiler=profiler
+    )
+    try:
+        return scraper.scrape_jobs()
+    finally:
+        scraper.close()
+
+PLATFORM_RUNNERS = {
+    'indeed': run_indeed,
+    'glassdoor': run_glassdoor,
+    'hiredly': run_hiredly,
+    'jobstreet': run_jobstreet
+}
+
+def run_platform(platform, config):
+    """
+    Run one platform scraper and time it, never raising
+
+    :param platform: Platform name, a key of PLATFORM_RUNNERS
+    :param config: Orchestrator settings
+    :return: Dictionary with the platform, its jobs as JobColumns, start time, wall time, phase spans and any error
+    """
+    start_time = time.time()
+    started_at = datetime.now(timezone.utc)
+    jobs = JobColumns()
+    timer = PhaseTimer()
+    profiler = WebDriverProfiler() if config.get('profile_webdriver') else None
+    sink = None
+    try:
+        sink = make_sink(platform, config)
+        scraped = PLATFORM_RUNNERS[platform](config, sink=sink, timer=timer, profiler=profiler)
+        if sink:
+            sink.close()
+            scraped = read_jobs(sink.path)
+
+        # Convert to columns in the worker so only compact columns cross the process boundary
+        for job in scraped or []:
+            jobs.append_job_dict(job, platform=platform)
+        error = None
+    except Exception as e:
+        logging.error(f"{platform} scraper failed: {e}")
+        logging.error(traceback.format_exc())
+        error = str(e)
+        # Keep whatever was streamed before the failure
+        if sink:
+            sink.close()
+            for job in read_jobs(sink.path):
+                jobs.append_job_dict(job, platform=platform)
+
+    if profiler:
+        profiler.log_report(label=f"{platform} WebDriver")
+        timestamp = started_at.strftime('%Y%m%d_%H%M%S')
+        profiler.write(os.path.join(config.get('metrics_dir') or 'metrics_output',
+                                    f'{platform}_webdriver_profile_{timestamp}.json'))
+
+    return {
+        'platform': platform,
+        'jobs': jobs,
+        'started_at': started_at,
+        'seconds': time.time() - start_time,
+        'spans': timer.spans,
+        'error': error
+    }
+
+def combine_jobs(results):
+    """
+    Merge per-platform job columns into one DataFrame with the combined columns
+
+    Rows that look like the same vacancy on different platforms share a
+    Cluster ID, the raw salary text is parsed into numeric columns and
+    relative posted dates become UTC timestamps based on each platform's
+    start time.
+
+    :param results: List of run_platform results
+    :return: Combined DataFrame
+    """
+    columns = JobColumns()
+    scraped_at = []
+    for result in results:
+        columns.merge(result['jobs'])
+        scraped_at += [result.get('started_at') or datetime.now(timezone.utc)] * len(result['jobs'])
+
+    df = columns.to_dataframe(categorical=False)
+    add_cluster_ids(df)
+    add_salary_columns(df)
+    add_posted_date_columns(df, scraped_at=scraped_at)
+    return df[list(COMBINED_COLUMN_NAMES)].rename(columns=COMBINED_COLUMN_NAMES)
+
+def save_combined_excel(combined, results, output_dir='combined_output'):
+    """
+    Save the combined jobs and a per-platform run summary to Excel
+
+    :param combined: Combined jobs DataFrame
+    :param results: List of run_platform results
+    :param output_dir: Directory to write the workbook to
+    :return: Path to the Excel file
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = os.path.join(output_dir, f'all_jobs_{timestamp}.xlsx')
+
+    summary = pd.DataFrame([
+        {
+            'Platform': result['platform'],
+            'Jobs': len(result['jobs']),
+            'Wall Time (s)': round(result['seconds'], 1),
+            'Error': result['error'] or ''
+        }
+        for result in results
+    ])
+
+    # Excel has no time zones; timestamps are written as naive UTC
+    combined = combined.copy()
+    for column in combined.select_dtypes(include=['datetimetz']).columns:
+        combined[column] = combined[column].dt.tz_localize(None)
+
+    with pd.ExcelWriter(output_file) as writer:
+        combined.to_excel(writer, sheet_name='Job Listings', index=False)
+        summary.to_excel(writer, sheet_name='Run Summary', index=False)
+
+    logging.info(f"Combined results saved to {output_file}")
+    return output_file
+
+def run_all(platforms, config, workers=None):
+    """
+    Run the selected platform scrapers concurrently, one process each
+
+    :param platforms: Platform names to run
+    :param config: Orchestrator settings passed to every runner
+    :param workers: Optional process pool size, defaults to one per platform
+    :return: List of run_platform results, in the order of platforms
+    """
+    start_time = time.time()
+
+    with ProcessPoolExecutor(max_workers=workers or len(platforms), initializer=configure_logging) as executor:
+        futures = [executor.submit(run_platform, platform, config) for platform in platforms]
+
+        results = []
+        for platform, future in zip(platforms, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # The worker process itself died
+                logging.error(f"{platform} worker crashed: {e}")
+                results.append({'platform': platform, 'jobs': JobColumns(), 'started_at': None,
+                                'seconds': time.time() - start_time, 'spans': [], 'error': str(e)})
+
+    for result in results:
+        status = f"failed: {result['error']}" if result['error'] else "ok"
+        logging.info(f"{result['platform']}: {len(result['jobs'])} jobs in {result['seconds']:.1f}s ({status})")
+    logging.info(f"All platforms finished in {time.time() - start_time:.1f}s")
+
+    return results
+
+def main():
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Run the job scrapers concurrently and combine their results")
+    parser.add_argument('--platforms', nargs='+', choices=sorted(PLATFORM_RUNNERS), default=sorted(PLATFORM_RUNNERS),
+                        help="Platforms to scrape (default: all)")
+    parser.add_argument('--chromedriver', default=DEFAULT_CHROMEDRIVER_PATH, help="Path to ChromeDriver executable")
+    parser.add_argument('--indeed-port', type=int, default=None,
+                        help="Port of an existing Chrome debugging session for the Indeed browser fallback")
+    parser.add_argument('--lean', action='store_true',
+                        help="Block images, fonts, media and trackers and report bytes per page")
+    parser.add_argument('--headed', action='store_true', help="Keep a visible browser window in lean mode")
+    parser.add_argument('--workers', type=int, default=None, help="Process pool size (default: one per platform)")
+    parser.add_argument('--jsonl-dir', default=None,
+                        help="Stream each platform's jobs page by page to a gzipped JSON Lines file in this directory")
+    parser.add_argument('--parquet-dir', default=None,
+                        help="Also append the jobs to a Parquet dataset partitioned by platform and scrape date")
+    parser.add_argument('--no-excel', action='store_true', help="Skip the combined Excel workbook")
+    parser.add_argument('--db', default=None,
+                        help="Upsert the jobs into this SQLite job store, tracking first and last seen times")
+    parser.add_argument('--stop-after-known', type=int, default=None,
+                        help="Glassdoor: stop a search after this many consecutive jobs already in --db")
+    parser.add_argument('--archive-dir', default=None,
+                        help="Archive every results page here for offline replay with page_archive.py")
+    parser.add_argument('--metrics-dir', default='metrics_output',
+                        help="Directory for the per-phase timing summary (JSON) and Prometheus text file")
+    parser.add_argument('--profile-webdriver', action='store_true',
+                        help="Count and time every WebDriver command and rank the call sites by total latency")
+    args = parser.parse_args()
+
+    config = {
+        'chromedriver_path': args.chromedriver,
+        'indeed_port': args.indeed_port,
+        'lean': args.lean,
+        'headless': not args.headed,
+        'jsonl_dir': args.jsonl_dir,
+        'db': args.db,
+        'stop_after_known': args.stop_after_known,
+        'archive_dir': args.archive_dir,
+        'metrics_dir': args.metrics_dir,
+        'profile_webdriver': args.profile_webdriver
+    }
+
+    timer = PhaseTimer()
+    results = run_all(args.platforms, config, workers=args.workers)
+    for result in results:
+        timer.extend(result['spans'])
+
+    if args.parquet_dir:
+        from parquet_dataset import write_jobs_parquet
+        for result in results:
+            with timer.span(EXPORT, result['platform']):
+                write_jobs_parquet(result['jobs'], args.parquet_dir, platform=result['platform'],
+                                   scraped_at=result['started_at'])
+
+    if args.db:
+        from job_store import JobStore
+        with timer.span(EXPORT, 'combined'), JobStore(args.db) as store:
+            for result in results:
+                store.add_jobs(result['jobs'])
+            logging.info(f"{len(store.new_since())} jobs new in the last 24 hours, {store.count()} in the store")
+
+    if not args.no_excel:
+        with timer.span(EXPORT, 'combined'):
+            combined = combine_jobs(results)
+            save_combined_excel(combined, results)
+
+    timer.write(args.metrics_dir, name='run_all')
+
+if __name__ == "__main__":
+    main()
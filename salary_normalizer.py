@@ -0,0 +1,110 @@
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from text_columns import contains, extract_groups, parse_distinct, to_arrow
+
+NUMBER = r'\d[\d,]*(?:\.\d+)?'
+CURRENCY = r'(?:rm|myr|usd|sgd|s\$|\$)'
+
+# First amount, then an optional second amount after a range separator
+AMOUNT_PATTERN = (
+    rf'(?P<low>{NUMBER})\s*(?P<low_k>k\b)?'
+    rf'(?:\s*(?:-|–|—|to)\s*{CURRENCY}?\s*(?P<high>{NUMBER})\s*(?P<high_k>k\b)?)?'
+)
+CURRENCY_PATTERN = r'(?P<currency>rm|myr|usd|sgd|s\$|\$)'
+PERIOD_PATTERN = r'\b(?P<period>hour|hr\b|day|daily|week|month|mth\b|mo\b|year|annum|annual|yr\b)'
+
+CURRENCY_CODES = {'rm': 'MYR', 'myr': 'MYR', 'usd': 'USD', '$': 'USD', 'sgd': 'SGD', 's$': 'SGD'}
+PERIOD_NAMES = {
+    'hour': 'hourly', 'hr': 'hourly',
+    'day': 'daily', 'daily': 'daily',
+    'week': 'weekly',
+    'month': 'monthly', 'mth': 'monthly', 'mo': 'monthly',
+    'year': 'yearly', 'annum': 'yearly', 'annual': 'yearly', 'yr': 'yearly'
+}
+
+# Amounts from this size up are taken as yearly when the text names no period
+YEARLY_FROM = 30000
+
+SALARY_COLUMNS = ['salary_min', 'salary_max', 'currency', 'period']
+
+def _parse_unique(text):
+    """
+    Parse distinct salary strings with vectorized string operations
+
+    :param text: Series of distinct lowercased salary strings
+    :return: DataFrame with SALARY_COLUMNS, aligned with text
+    """
+    arrow = to_arrow(text)
+
+    amounts = extract_groups(text, AMOUNT_PATTERN, arrow)
+    # The groups only ever capture digits, commas and one decimal point
+    low = amounts['low'].str.replace(',', '', regex=False).astype(float)
+    high = amounts['high'].str.replace(',', '', regex=False).astype(float)
+
+    low_k = amounts['low_k'].notna()
+    high_k = amounts['high_k'].notna()
+    # 'MYR 4K - 6K' and 'RM 5 - 8k': a K on either side applies to a bare small number
+    low = low.where(~(low_k | (high_k & (low < 1000))), low * 1000)
+    high = high.where(~high_k, high * 1000)
+
+    # 'Up to RM 8,000' only gives a maximum, 'From RM 3,500' only a minimum
+    up_to = contains(text, r'\bup to\b', arrow) & high.isna()
+    from_only = contains(text, r'\b(?:from|starting)\b', arrow) & high.isna()
+
+    salary_min = low.where(~up_to, np.nan)
+    salary_max = high.fillna(low).where(~from_only, np.nan)
+
+    currency = extract_groups(text, CURRENCY_PATTERN, arrow)['currency'].map(CURRENCY_CODES)
+    currency = currency.where(currency.notna() | low.isna(), 'MYR')
+
+    period = extract_groups(text, PERIOD_PATTERN, arrow)['period'].map(PERIOD_NAMES)
+    largest = salary_max.fillna(salary_min)
+    guessed = pd.Series(np.where(largest >= YEARLY_FROM, 'yearly', 'monthly'), index=text.index)
+    period = period.where(period.notna() | largest.isna(), guessed)
+
+    return pd.DataFrame({
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        'currency': currency,
+        'period': period
+    })
+
+def normalize_salaries(salaries):
+    """
+    Parse free-text salaries into numeric ranges
+
+    Each distinct string is parsed once with vectorized column-wide regex
+    operations, and the results are broadcast back to all rows.
+
+    Handles ranges ('RM 4,000 - RM 6,000 a month', 'MYR 5K - 8K'), single
+    amounts, 'Up to' / 'From' bounds and hourly, daily, weekly, monthly and
+    yearly periods. Texts without a period are taken as yearly from
+    YEARLY_FROM and monthly below it.
+
+    :param salaries: Iterable or Series of raw salary text
+    :return: DataFrame with salary_min, salary_max, currency and period, one row per input
+    """
+    start_time = time.time()
+    result, distinct = parse_distinct(salaries, _parse_unique, SALARY_COLUMNS)
+
+    logging.info(
+        f"Normalized {len(result)} salaries ({distinct} distinct) in {time.time() - start_time:.2f}s"
+    )
+    return result
+
+def add_salary_columns(df, column='salary'):
+    """
+    Add salary_min, salary_max, currency and period columns next to the raw salary text
+
+    :param df: pandas DataFrame of postings
+    :param column: Column holding the raw salary text, kept unchanged
+    :return: The same DataFrame
+    """
+    parsed = normalize_salaries(df[column])
+    for name in SALARY_COLUMNS:
+        df[name] = parsed[name].values
+    return df
@@ -0,0 +1,39 @@
+import pytest
+
+from benchmark_scrapers import compare_to_baseline
+
+BASE = {
+    'pages': 4, 'cards': 100, 'pages_per_sec': 2.0, 'cards_per_sec': 50.0,
+    'webdriver_calls_per_card': 1.0, 'p50_page_seconds': 0.5, 'p95_page_seconds': 0.8
+}
+
+def report(targets, results, errors=None):
+    return {'targets': targets, 'results': results, 'errors': errors or {}}
+
+@pytest.mark.parametrize('current, expected', [
+    (dict(BASE), []),
+    # Within the tolerance
+    (dict(BASE, pages_per_sec=1.8, p95_page_seconds=0.9), []),
+    # Throughput drop and latency rise beyond the tolerance
+    (dict(BASE, pages_per_sec=1.0), ['jobstreet: pages_per_sec']),
+    (dict(BASE, p50_page_seconds=1.0), ['jobstreet: p50_page_seconds']),
+    (dict(BASE, webdriver_calls_per_card=3.0), ['jobstreet: webdriver_calls_per_card']),
+    # Same pages, fewer cards: extraction broke
+    (dict(BASE, cards=90, cards_per_sec=45.0), ['jobstreet: extracted 90 cards']),
+])
+def test_compare_to_baseline(current, expected):
+    regressions = compare_to_baseline(report(['jobstreet'], {'jobstreet': current}), {'results': {'jobstreet': BASE}})
+    assert len(regressions) == len(expected)
+    for regression, prefix in zip(regressions, expected):
+        assert regression.startswith(prefix)
+
+def test_failed_target_is_a_regression():
+    current = report(['jobstreet', 'glassdoor'], {'glassdoor': dict(BASE)}, {'jobstreet': 'selector not found'})
+    baseline = {'results': {'jobstreet': BASE, 'glassdoor': BASE}}
+    regressions = compare_to_baseline(current, baseline)
+    assert len(regressions) == 1
+    assert regressions[0].startswith('jobstreet: in the baseline but missing')
+
+def test_unselected_target_is_not_compared():
+    current = report(['glassdoor'], {'glassdoor': dict(BASE)})
+    assert compare_to_baseline(current, {'results': {'jobstreet': BASE, 'glassdoor': BASE}}) == []
@@ -0,0 +1,49 @@
+import pytest
+
+from job_dedup import cluster_ids, normalize_text
+
+@pytest.mark.parametrize('titles, companies, expected', [
+    # Seniority and internship variants are different vacancies
+    (['Software Engineer', 'Senior Software Engineer', 'Software Engineer Intern'], ['Shopee'] * 3, [0, 1, 2]),
+    (['UX Designer', 'Senior UX Designer', 'Junior UX Designer', 'UX Design Lead'], ['Grab'] * 4, [0, 1, 2, 3]),
+    # The same posting spelled differently across platforms
+    (['Product Designer (UI/UX)', 'Product Designer - UI/UX', 'product designer ui ux'],
+     ['Acme Sdn. Bhd.', 'ACME', 'Acme Berhad'], [0, 0, 0]),
+    (['UX Designer', 'UX Designer'], ['Grab Sdn Bhd', 'GRAB Malaysia'], [0, 0]),
+    # Same title at different employers
+    (['UX Designer', 'UX Designer'], ['Grab', 'Shopee'], [0, 1]),
+    # No company: never merged
+    (['UX Designer', 'UX Designer'], ['Not specified', None], [0, 1]),
+    (['UX Designer', 'UX Designer', 'UX Designer'], ['', '', ''], [0, 1, 2]),
+    # Repeated scrapes of the same postings, numbered in order of first appearance
+    (['Data Analyst', 'UX Designer', 'Data Analyst', 'UX Designer'], ['Grab', 'Shopee', 'Grab', 'Shopee'],
+     [0, 1, 0, 1]),
+])
+def test_cluster_ids(titles, companies, expected):
+    assert cluster_ids(titles, companies).tolist() == expected
+
+def test_cluster_ids_do_not_chain():
+    # Each neighbour is close to the next, but the ends are different titles
+    titles = ['Senior UX Designer', 'Senior UX Designers', 'UX Designers', 'UX Designer Intern']
+    ids = cluster_ids(titles, ['Grab'] * len(titles)).tolist()
+    assert ids[0] == ids[1]
+    assert ids[0] != ids[3]
+
+def test_cluster_ids_related_titles_at_one_company():
+    # Thousands of overlapping titles at one employer stay quick and never merge unrelated ends
+    titles = [f'UX Designer Level {level}' for level in range(3000)]
+    ids = cluster_ids(titles, ['Grab'] * len(titles)).tolist()
+    assert ids[0] == ids[1]
+    assert ids[0] != ids[-1]
+
+def test_cluster_ids_empty():
+    assert cluster_ids([], []).tolist() == []
+
+@pytest.mark.parametrize('value, company, expected', [
+    ('  Senior UX/UI Designer ', False, 'senior ux ui designer'),
+    ('Grab Malaysia Sdn. Bhd.', True, 'grab'),
+    ('N/A', False, ''),
+    (None, True, ''),
+])
+def test_normalize_text(value, company, expected):
+    assert normalize_text(value, company) == expected
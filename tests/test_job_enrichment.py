@@ -0,0 +1,135 @@
+import json
+import asyncio
+
+import pytest
+
+web = pytest.importorskip('aiohttp.web')
+
+from job_enrichment import JobEnricher, extract_requirements, parse_job_detail
+
+POSTING = {
+    '@context': 'https://schema.org',
+    '@type': 'JobPosting',
+    'title': 'UX Designer',
+    'description': '<p>About the role</p><p><strong>Requirements:</strong></p>'
+                   '<ul><li>5 years of UX</li><li>Figma &amp; Sketch</li></ul><p>Benefits</p><ul><li>Lunch</li></ul>',
+    'hiringOrganization': {'@type': 'Organization', 'name': 'Acme'},
+    'employmentType': ['FULL_TIME', 'CONTRACTOR'],
+    'datePosted': '2024-05-01',
+    'jobLocation': {'@type': 'Place', 'address': {
+        'addressLocality': 'Kuala Lumpur', 'addressCountry': {'@type': 'Country', 'name': 'MY'}
+    }},
+    'baseSalary': {'@type': 'MonetaryAmount', 'currency': 'MYR', 'value': {
+        '@type': 'QuantitativeValue', 'minValue': 5000, 'maxValue': 8000, 'unitText': 'MONTH'
+    }}
+}
+
+def page(*blocks):
+    scripts = ''.join(f'<script type="application/ld+json">{json.dumps(block)}</script>' for block in blocks)
+    return f'<html><head>{scripts}</head><body></body></html>'
+
+@pytest.mark.parametrize('html, expected', [
+    (page(POSTING), {
+        'company': 'Acme',
+        'description': 'About the role\nRequirements:\n- 5 years of UX\n- Figma & Sketch\nBenefits\n- Lunch',
+        'requirements': '- 5 years of UX\n- Figma & Sketch',
+        'employment_type': 'FULL_TIME, CONTRACTOR',
+        'date_posted': '2024-05-01',
+        'address': 'Kuala Lumpur, MY',
+        'salary_min': 5000, 'salary_max': 8000, 'salary_currency': 'MYR', 'salary_period': 'monthly'
+    }),
+    # JobPosting inside an @graph, next to unrelated blocks
+    (page({'@type': 'WebSite', 'name': 'x'}, {'@graph': [{'@type': 'BreadcrumbList'}, dict(POSTING)]}),
+     {'company': 'Acme', 'salary_max': 8000}),
+    # A single salary value
+    (page(dict(POSTING, baseSalary={'currency': 'MYR', 'value': {'value': 6000, 'unitText': 'YEAR'}})),
+     {'salary_min': 6000, 'salary_max': 6000, 'salary_period': 'yearly'}),
+    # No JSON-LD: meta description only
+    ('<html><head><meta name="description" content="Design our app &amp; more"></head></html>',
+     {'description': 'Design our app & more', 'requirements': None}),
+    ('<html><head><script type="application/ld+json">{broken</script></head></html>',
+     {'description': None}),
+])
+def test_parse_job_detail(html, expected):
+    detail = parse_job_detail(html)
+    for field, value in expected.items():
+        assert detail.get(field) == value, field
+
+@pytest.mark.parametrize('description, expected', [
+    ('Intro\nRequirements\n- A\n- B\nBenefits\n- C', '- A\n- B'),
+    ('Intro\nWhat you need:\nFigma\nSketch', 'Figma\nSketch'),
+    ('No headings here', None),
+    (None, None),
+])
+def test_extract_requirements(description, expected):
+    assert extract_requirements(description) == expected
+
+@pytest.mark.parametrize('jobs, expected', [
+    ([{'Platform': 'JobStreet', 'URL': 'https://my.jobstreet.com/job/1?type=a'},
+      {'Platform': 'JobStreet', 'URL': 'https://my.jobstreet.com/job/1?type=b'},
+      {'Platform': 'JobStreet', 'URL': 'N/A'}],
+     [('jobstreet:1', 'https://my.jobstreet.com/job/1?type=a')]),
+    ([{'Platform': 'Hiredly', 'Job URL': 'URL not found'}], []),
+])
+def test_unique_urls(jobs, expected):
+    assert JobEnricher.unique_urls(jobs) == expected
+
+async def serve(handler):
+    app = web.Application()
+    app.router.add_get('/job/{name}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f'http://{host}:{port}'
+
+def jobs_for(base_url, names):
+    return [{'Platform': 'JobStreet', 'URL': f'{base_url}/job/{name}'} for name in names]
+
+def test_queued_requests_do_not_time_out():
+    # 60 slow pages at 4 per host take ~7.5s, far beyond the 3s per-request timeout
+    async def run():
+        async def slow(request):
+            await asyncio.sleep(0.5)
+            return web.Response(text=page(POSTING), content_type='text/html')
+
+        runner, base_url = await serve(slow)
+        try:
+            enricher = JobEnricher(per_host=4, timeout=3, retries=0)
+            details = await enricher.enrich_async(jobs_for(base_url, range(60)))
+        finally:
+            await runner.cleanup()
+        return enricher, details
+
+    enricher, details = asyncio.run(run())
+    assert enricher.stats == {'fetched': 60, 'failed': 0, 'retries': 0}
+    assert all(detail['company'] == 'Acme' for detail in details)
+
+def test_retries_and_errors():
+    hits = {}
+
+    async def run():
+        async def flaky(request):
+            name = request.match_info['name']
+            hits[name] = hits.get(name, 0) + 1
+            if name == 'missing':
+                return web.Response(status=404)
+            if name == 'busy' and hits[name] < 3:
+                return web.Response(status=503)
+            return web.Response(text=page(POSTING), content_type='text/html')
+
+        runner, base_url = await serve(flaky)
+        try:
+            enricher = JobEnricher(retries=3, backoff=0.01)
+            details = await enricher.enrich_async(jobs_for(base_url, ['ok', 'busy', 'missing']))
+        finally:
+            await runner.cleanup()
+        return enricher, {detail['url'].rsplit('/', 1)[1]: detail for detail in details}
+
+    enricher, details = asyncio.run(run())
+    assert details['busy']['status'] == 200 and details['busy']['company'] == 'Acme'
+    assert details['missing']['error'] == 'HTTP 404'
+    # 404 is not retried
+    assert hits == {'ok': 1, 'busy': 3, 'missing': 1}
+    assert enricher.stats == {'fetched': 2, 'failed': 1, 'retries': 2}
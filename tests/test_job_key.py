@@ -0,0 +1,39 @@
+import pytest
+
+from job_key import canonical_url, detect_platform, job_key
+
+@pytest.mark.parametrize('url, platform, expected', [
+    ('https://malaysia.indeed.com/viewjob?jk=5F3C2A1B9E8D7C6B&from=serp', None, 'indeed:5f3c2a1b9e8d7c6b'),
+    ('https://malaysia.indeed.com/rc/clk?jk=5f3c2a1b9e8d7c6b&bb=xyz', None, 'indeed:5f3c2a1b9e8d7c6b'),
+    ('https://malaysia.indeed.com/jobs?q=ux&vjk=abc123', None, 'indeed:abc123'),
+    ('https://www.glassdoor.com/job-listing/ux-designer-acme-JV_IC.htm?jl=1009123456789&src=GD', None,
+     'glassdoor:1009123456789'),
+    ('https://www.glassdoor.com/partner/jobListing.htm?jobListingId=1009123', None, 'glassdoor:1009123'),
+    ('https://my.jobstreet.com/job/81234567?type=standout&ref=search', None, 'jobstreet:81234567'),
+    ('https://my.jobstreet.com/en/job/ux-designer-1234567', None, 'jobstreet:1234567'),
+    ('https://my.hiredly.com/jobs/ux-designer-acme?utm_source=x', None, 'hiredly:ux-designer-acme'),
+    # Platform given explicitly
+    ('https://example.com/viewjob?jk=abc', 'indeed', 'indeed:abc'),
+    # No native id: canonical URL
+    ('HTTPS://Example.com/careers/ux/?utm_source=x&b=2&a=1#apply', None, 'https://example.com/careers/ux?a=1&b=2'),
+    # Placeholders
+    ('N/A', None, None),
+    ('URL not found', None, None),
+    ('', None, None),
+    (None, None, None),
+])
+def test_job_key(url, platform, expected):
+    assert job_key(url, platform) == expected
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://malaysia.indeed.com/viewjob?jk=1', 'indeed'),
+    ('https://www.glassdoor.com/job-listing/x', 'glassdoor'),
+    ('https://my.jobstreet.com/job/1', 'jobstreet'),
+    ('https://my.hiredly.com/jobs/x', 'hiredly'),
+    ('https://example.com/jobs/x', None),
+])
+def test_detect_platform(url, expected):
+    assert detect_platform(url) == expected
+
+def test_canonical_url_missing():
+    assert canonical_url('N/A') is None
@@ -0,0 +1,73 @@
+import sqlite3
+
+import pytest
+
+from job_store import JobStore
+
+# Schema of the first, URL-keyed version of the store
+URL_KEYED_SCHEMA = """
+    CREATE TABLE jobs (
+        id INTEGER PRIMARY KEY,
+        url TEXT NOT NULL UNIQUE,
+        raw_url TEXT,
+        platform TEXT,
+        search_keyword TEXT,
+        title TEXT,
+        company TEXT,
+        location TEXT,
+        salary TEXT,
+        posted_date TEXT,
+        job_type TEXT,
+        easy_apply TEXT,
+        first_seen TEXT NOT NULL,
+        last_seen TEXT NOT NULL,
+        times_seen INTEGER NOT NULL DEFAULT 1
+    );
+    CREATE INDEX idx_jobs_platform ON jobs (platform);
+"""
+
+@pytest.fixture
+def url_keyed_db(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    conn = sqlite3.connect(path)
+    conn.executescript(URL_KEYED_SCHEMA)
+    conn.executemany(
+        'INSERT INTO jobs (url, raw_url, platform, title, salary, first_seen, last_seen, times_seen) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        [
+            ('https://malaysia.indeed.com/viewjob?jk=abc123', 'https://malaysia.indeed.com/viewjob?jk=abc123&from=serp',
+             'Indeed Malaysia', 'UX Designer', None, '2024-01-01T00:00:00Z', '2024-01-02T00:00:00Z', 2),
+            ('https://malaysia.indeed.com/rc/clk?jk=abc123', 'https://malaysia.indeed.com/rc/clk?jk=abc123',
+             'Indeed Malaysia', 'UX Designer II', 'RM 5,000', '2023-12-30T00:00:00Z', '2024-01-05T00:00:00Z', 1),
+            ('https://my.jobstreet.com/job/81234567', 'https://my.jobstreet.com/job/81234567?type=standout',
+             'JobStreet', 'Design Lead', None, '2024-01-03T00:00:00Z', '2024-01-03T00:00:00Z', 1),
+        ]
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+def test_migrates_url_keyed_store(url_keyed_db):
+    with JobStore(url_keyed_db) as store:
+        rows = {row['job_key']: row for row in store.conn.execute('SELECT * FROM jobs')}
+        assert set(rows) == {'indeed:abc123', 'jobstreet:81234567'}
+
+        indeed = rows['indeed:abc123']
+        assert indeed['title'] == 'UX Designer II'
+        assert indeed['salary'] == 'RM 5,000'
+        assert indeed['first_seen'] == '2023-12-30T00:00:00Z'
+        assert indeed['last_seen'] == '2024-01-05T00:00:00Z'
+        assert indeed['times_seen'] == 3
+
+        # Upserts work on the migrated table
+        store.add_job({'Job Title': 'Design Lead', 'URL': 'https://my.jobstreet.com/job/81234567'}, 'jobstreet')
+        assert store.count() == 2
+        assert store.conn.execute('PRAGMA user_version').fetchone()[0] == JobStore.SCHEMA_VERSION
+
+def test_refuses_newer_schema(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    conn = sqlite3.connect(path)
+    conn.execute(f'PRAGMA user_version = {JobStore.SCHEMA_VERSION + 1}')
+    conn.close()
+    with pytest.raises(RuntimeError):
+        JobStore(path)
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from phase_timer import EXTRACTION, NAVIGATION, PhaseTimer, percentile
+
+@pytest.mark.parametrize('samples, fraction, expected', [
+    ([], 0.5, None),
+    ([3.0], 0.95, 3.0),
+    ([1, 2, 3, 4], 0.5, 2),
+    ([5, 1, 4, 2, 3], 0.95, 5),
+    (list(range(1, 101)), 0.95, 95),
+])
+def test_percentile(samples, fraction, expected):
+    assert percentile(samples, fraction) == expected
+
+def test_summary_and_prometheus_text():
+    timer = PhaseTimer()
+    timer.add(NAVIGATION, 'jobstreet', 2.0, 'ux designer', 1)
+    timer.add(EXTRACTION, 'jobstreet', 0.5, 'ux designer', 1)
+    timer.add(EXTRACTION, 'jobstreet', 1.5, 'ux designer', 2)
+
+    summary = timer.summary()
+    extraction = next(row for row in summary['phases'] if row['phase'] == EXTRACTION)
+    assert extraction['count'] == 2
+    assert extraction['total_seconds'] == 2.0
+    assert summary['searches'][0]['phase_seconds'] == {NAVIGATION: 2.0, EXTRACTION: 2.0}
+
+    text = timer.prometheus_text(summary, name='jobstreet')
+    assert 'scraper_phase_seconds_count{run="jobstreet",platform="jobstreet",phase="extraction"} 2' in text
+    # Every sample is labelled with its run, so several .prom files never repeat a series
+    samples = [line for line in text.splitlines() if not line.startswith('#')]
+    assert all('{run="jobstreet"' in line for line in samples)
+
+def test_disabled_timer_records_nothing(tmp_path):
+    timer = PhaseTimer(enabled=False)
+    with timer.span(NAVIGATION, 'jobstreet'):
+        pass
+    assert timer.spans == []
+    assert timer.write(str(tmp_path)) is None
+
+def test_write_replaces_the_prometheus_file(tmp_path):
+    for seconds in (1.0, 2.0):
+        timer = PhaseTimer()
+        timer.add(NAVIGATION, 'glassdoor', seconds)
+        json_path, prom_path = timer.write(str(tmp_path), name='glassdoor')
+
+    assert os.path.basename(prom_path) == 'glassdoor_metrics.prom'
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.prom')] == ['glassdoor_metrics.prom']
+    with open(prom_path, encoding='utf-8') as f:
+        text = f.read()
+    assert 'scraper_phase_seconds_sum{run="glassdoor",platform="glassdoor",phase="navigation"} 2.0' in text
+    assert 'scraper_run_wall_seconds{run="glassdoor"}' in text
@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from posted_date_normalizer import normalize_posted_dates
+
+SCRAPED_AT = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+@pytest.mark.parametrize('text, posted_at, open_ended', [
+    ('3d ago', '2025-02-26T12:00:00Z', False),
+    ('Posted 2 weeks ago', '2025-02-15T12:00:00Z', False),
+    ('5h ago', '2025-03-01T07:00:00Z', False),
+    ('a month ago', '2025-01-30T12:00:00Z', False),
+    ('30+ days ago', '2025-01-30T12:00:00Z', True),
+    ('30d+ ago', '2025-01-30T12:00:00Z', True),
+    ('Just posted', '2025-03-01T12:00:00Z', False),
+    ('Yesterday', '2025-02-28T12:00:00Z', False),
+    # ISO dates are year-month-day, never day first
+    ('2024-05-01', '2024-05-01T00:00:00Z', False),
+    ('2024-05-01T10:30:00Z', '2024-05-01T10:30:00Z', False),
+    # Other numeric dates are Malaysian day first
+    ('01/05/2024', '2024-05-01T00:00:00Z', False),
+    ('01.05.2024', '2024-05-01T00:00:00Z', False),
+    ('Posted on 12 Jan 2025', '2025-01-12T00:00:00Z', False),
+    ('Posted: 3 Feb 2025', '2025-02-03T00:00:00Z', False),
+    # Month and weekday names are not ages: the 'ay' of 'May' is not 'a year'
+    ('Posted on 20 May 2025', '2025-05-20T00:00:00Z', False),
+    ('1 May 2025', '2025-05-01T00:00:00Z', False),
+    ('2 Dec 2024', '2024-12-02T00:00:00Z', False),
+    ('Posted on Friday, 2 May 2025', '2025-05-02T00:00:00Z', False),
+    ('Friday', None, False),
+    ('Posted Monday', None, False),
+    ('not a date', None, False),
+    (None, None, False),
+])
+def test_normalize_posted_dates(text, posted_at, open_ended):
+    row = normalize_posted_dates([text], SCRAPED_AT).iloc[0]
+    if posted_at is None:
+        assert pd.isna(row['posted_at'])
+    else:
+        assert row['posted_at'] == pd.Timestamp(posted_at)
+    assert row['posted_open_ended'] == open_ended
+
+def test_normalize_posted_dates_per_row_scrape_time():
+    scraped_at = [datetime(2025, 1, 10, tzinfo=timezone.utc), datetime(2025, 2, 10, tzinfo=timezone.utc)]
+    result = normalize_posted_dates(['1d ago', '1d ago'], scraped_at)
+    assert result['posted_at'].tolist() == [pd.Timestamp('2025-01-09T00:00:00Z'), pd.Timestamp('2025-02-09T00:00:00Z')]
@@ -0,0 +1,30 @@
+import math
+
+import pytest
+
+from salary_normalizer import normalize_salaries
+
+NAN = float('nan')
+
+@pytest.mark.parametrize('text, salary_min, salary_max, currency, period', [
+    ('RM 4,000 - RM 6,000 a month', 4000, 6000, 'MYR', 'monthly'),
+    ('MYR 5K - 8K', 5000, 8000, 'MYR', 'monthly'),
+    ('RM 5 - 8k per month', 5000, 8000, 'MYR', 'monthly'),
+    ('Up to RM 8,000', NAN, 8000, 'MYR', 'monthly'),
+    ('From RM 3,500 per month', 3500, NAN, 'MYR', 'monthly'),
+    ('RM 60,000 - 80,000', 60000, 80000, 'MYR', 'yearly'),
+    ('USD 25 per hour', 25, 25, 'USD', 'hourly'),
+    ('SGD 6,000 to 7,500 monthly', 6000, 7500, 'SGD', 'monthly'),
+    ('Not specified', NAN, NAN, None, None),
+    (None, NAN, NAN, None, None),
+])
+def test_normalize_salaries(text, salary_min, salary_max, currency, period):
+    row = normalize_salaries([text]).iloc[0]
+    for value, expected in ((row['salary_min'], salary_min), (row['salary_max'], salary_max)):
+        assert (math.isnan(value) and math.isnan(expected)) or value == expected
+    assert (row['currency'] if isinstance(row['currency'], str) else None) == currency
+    assert (row['period'] if isinstance(row['period'], str) else None) == period
+
+def test_normalize_salaries_keeps_row_order():
+    texts = ['RM 3,000', 'RM 5,000', 'RM 3,000', None, 'RM 5,000']
+    assert normalize_salaries(texts)['salary_min'].fillna(0).tolist() == [3000, 5000, 3000, 0, 5000]
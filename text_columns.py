@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+def to_arrow(text):
+    """
+    Arrow string array of a text Series, or None when pyarrow is not installed
+    """
+    if pa is None:
+        return None
+    return pa.array(text.tolist(), type=pa.string())
+
+def extract_groups(text, pattern, arrow=None):
+    """
+    Named groups of the first match per row, NaN where a group did not match
+
+    Uses pyarrow's RE2 kernels when an Arrow copy of the column is given,
+    which run the pattern over the whole column in native code; otherwise
+    pandas str.extract.
+
+    :param text: Series of strings
+    :param pattern: Regular expression with named groups
+    :param arrow: Optional Arrow copy of text from to_arrow()
+    :return: DataFrame with one column per group
+    """
+    if arrow is None:
+        return text.str.extract(pattern)
+
+    matches = pc.extract_regex(arrow, pattern)
+    columns = {}
+    for field in matches.type:
+        values = pc.struct_field(matches, field.name).to_pandas()
+        # Optional groups that did not take part in the match come back empty
+        columns[field.name] = values.where(values.notna() & (values != ''), np.nan)
+    return pd.DataFrame(columns, index=text.index)
+
+def contains(text, pattern, arrow=None):
+    """
+    Boolean mask of rows matching a regular expression
+
+    :param text: Series of strings
+    :param pattern: Regular expression
+    :param arrow: Optional Arrow copy of text from to_arrow()
+    :return: Boolean Series
+    """
+    if arrow is None:
+        return text.str.contains(pattern, regex=True, na=False)
+    mask = pc.match_substring_regex(arrow, pattern).to_pandas()
+    return pd.Series(mask.fillna(False).astype(bool).values, index=text.index)
+
+def parse_distinct(values, parse, columns):
+    """
+    Run a column parser once per distinct value and broadcast the result to every row
+
+    Scraped text columns repeat heavily, so a million rows cost little more
+    than their distinct values.
+
+    :param values: Iterable or Series of raw text
+    :param parse: Callable taking a Series of distinct lowercased strings and returning a DataFrame
+    :param columns: Names of the columns parse returns
+    :return: Tuple of (DataFrame aligned with values, number of distinct values)
+    """
+    raw = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+
+    codes, uniques = pd.factorize(raw.astype(object).where(raw.notna(), None))
+    parsed = parse(pd.Series(uniques, dtype=object).astype(str).str.lower())
+
+    # Missing values have code -1; a trailing empty row gives them NaN
+    empty = pd.DataFrame({column: [np.nan] for column in columns})
+    parsed = pd.concat([parsed[columns], empty], ignore_index=True)
+    result = parsed.iloc[np.where(codes < 0, len(parsed) - 1, codes)].reset_index(drop=True)
+    result.index = raw.index
+    return result, len(uniques)
@@ -0,0 +1,163 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+
+# Frames from these modules are skipped when looking for the scraper line that issued a command
+LIBRARY_MODULES = ('selenium', 'undetected_chromedriver', __name__)
+
+class WebDriverProfiler:
+    def __init__(self):
+        """
+        Count and time every WebDriver command a scraper sends
+
+        Driver calls and WebElement calls (find_element, get_attribute,
+        .text, is_enabled, ...) all go through driver.execute, so wrapping
+        it on the driver instance sees every round trip. Each command is
+        charged to the first stack frame outside Selenium, so the report
+        ranks the scraper lines that spend the most time in the browser.
+        """
+        self.stats = {}
+        self._originals = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def call_site():
+        """
+        First caller outside Selenium and this module, as 'file.py:line function'
+        """
+        frame = sys._getframe(2)
+        while frame is not None:
+            module = frame.f_globals.get('__name__', '')
+            if not module.startswith(LIBRARY_MODULES):
+                code = frame.f_code
+                return f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}"
+            frame = frame.f_back
+        return 'unknown'
+
+    def attach(self, driver):
+        """
+        Start profiling a driver
+
+        :param driver: Selenium WebDriver instance
+        :return: The same driver
+        """
+        if id(driver) in self._originals:
+            return driver
+        execute = driver.execute
+        # Remember an execute already set on the instance, e.g. by another profiler, for detach
+        self._originals[id(driver)] = (driver, driver.__dict__.get('execute'))
+
+        def profiled_execute(driver_command, params=None):
+            site = self.call_site()
+            start_time = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.record(site, driver_command, time.perf_counter() - start_time)
+
+        driver.execute = profiled_execute
+        return driver
+
+    def detach(self, driver=None):
+        """
+        Stop profiling a driver, or every attached driver
+        """
+        for key, (attached, execute) in list(self._originals.items()):
+            if driver is None or attached is driver:
+                if execute is None:
+                    del attached.execute
+                else:
+                    attached.execute = execute
+                del self._originals[key]
+
+    def record(self, site, command, seconds):
+        with self._lock:
+            entry = self.stats.get((site, command))
+            if entry is None:
+                entry = self.stats[(site, command)] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+    @property
+    def calls(self):
+        """
+        Number of commands sent so far
+        """
+        with self._lock:
+            return sum(entry[0] for entry in self.stats.values())
+
+    def report(self, top=20):
+        """
+        Summarize the commands by type and rank the call sites by total latency
+
+        :param top: Number of call sites to include
+        :return: Dictionary ready to be written as JSON
+        """
+        with self._lock:
+            stats = {key: list(entry) for key, entry in self.stats.items()}
+
+        by_command = {}
+        for (site, command), (count, seconds, _) in stats.items():
+            totals = by_command.setdefault(command, [0, 0.0])
+            totals[0] += count
+            totals[1] += seconds
+
+        call_sites = sorted(stats.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        return {
+            'total_calls': sum(entry[0] for entry in stats.values()),
+            'total_seconds': round(sum(entry[1] for entry in stats.values()), 3),
+            'by_command': [
+                {
+                    'command': command,
+                    'calls': count,
+                    'total_seconds': round(seconds, 3),
+                    'mean_ms': round(seconds / count * 1000, 2)
+                }
+                for command, (count, seconds) in sorted(by_command.items(), key=lambda item: item[1][1], reverse=True)
+            ],
+            'call_sites': [
+                {
+                    'call_site': site,
+                    'command': command,
+                    'calls': count,
+                    'total_seconds': round(seconds, 3),
+                    'mean_ms': round(seconds / count * 1000, 2),
+                    'max_ms': round(longest * 1000, 2)
+                }
+                for (site, command), (count, seconds, longest) in call_sites
+            ]
+        }
+
+    def log_report(self, top=15, label='WebDriver'):
+        """
+        Log the call sites with the highest total latency
+        """
+        report = self.report(top)
+        logging.info(f"{label}: {report['total_calls']} commands, {report['total_seconds']}s in the browser")
+        for rank, row in enumerate(report['call_sites'], 1):
+            logging.info(
+                f"{rank:>2}. {row['call_site']} {row['command']}: {row['calls']} calls, "
+                f"{row['total_seconds']}s total, {row['mean_ms']}ms mean"
+            )
+        return report
+
+    def write(self, path, top=50):
+        """
+        Save the report as JSON
+
+        :param path: Output file
+        :param top: Number of call sites to include
+        :return: The path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(top), f, indent=2)
+        logging.info(f"WebDriver profile saved to {path}")
+        return path